@@ -0,0 +1,76 @@
+"""Benchmark per-call overhead of the middleware chain against middleware depth.
+
+Run with ``python benchmarks/middleware_overhead.py``. A local action is called
+through ``ServiceBroker.call`` with 0 to 20 pass-through middlewares, once with
+the compiled chain cached on the endpoint and once with the chain rebuilt on
+every call (the behaviour before chains were cached).
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pylecular.broker import ServiceBroker
+from pylecular.decorators import action
+from pylecular.middleware import Middleware
+from pylecular.service import Service
+from pylecular.settings import Settings
+
+DEPTHS = [0, 1, 5, 10, 20]
+CALLS = 20_000
+
+
+class PassThroughMiddleware(Middleware):
+    """Middleware wrapping local actions without doing any work."""
+
+    async def local_action(self, next_handler, action):
+        async def handler(ctx):
+            return await next_handler(ctx)
+
+        return handler
+
+
+class EchoService(Service):
+    """Service with a trivial action."""
+
+    def __init__(self) -> None:
+        super().__init__("echo")
+
+    @action()
+    async def ping(self, ctx):
+        return ctx.params
+
+
+async def measure(broker: ServiceBroker, rebuild: bool) -> float:
+    """Return the mean time of one call in microseconds."""
+    params = {"value": 1}
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        if rebuild:
+            broker.middleware_handler.version += 1
+        await broker.call("echo.ping", params)
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main() -> None:
+    """Print per-call time for each middleware depth."""
+    print(f"{'depth':>6} {'cached':>12} {'rebuilt':>12}")
+    for depth in DEPTHS:
+        middlewares = [PassThroughMiddleware() for _ in range(depth)]
+        broker = ServiceBroker(
+            f"bench-{depth}", settings=Settings(log_level="ERROR"), middlewares=middlewares
+        )
+        await broker.register(EchoService())
+
+        cached = await measure(broker, rebuild=False)
+        rebuilt = await measure(broker, rebuild=True)
+        print(f"{depth:>6} {cached:>9.2f} us {rebuilt:>9.2f} us")
+
+        await broker.discoverer.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
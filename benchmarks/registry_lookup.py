@@ -0,0 +1,55 @@
+"""Benchmark registry lookups as the number of known endpoints grows.
+
+Run with ``python benchmarks/registry_lookup.py``. For every cluster size the
+registry is filled with remote actions and events spread over many nodes, then
+``get_action``, ``get_event`` and ``get_all_events`` are timed for a name in the
+middle of the index. With hash indexes the per-lookup time should stay flat
+from 100 to 100k endpoints.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pylecular.registry import Action, Event, Registry
+
+SIZES = [100, 1_000, 10_000, 100_000]
+ENDPOINTS_PER_NODE = 50
+LOOKUPS = 100_000
+
+
+def build_registry(size: int) -> Registry:
+    """Create a registry holding ``size`` actions and ``size`` events."""
+    registry = Registry(node_id="bench")
+    for i in range(size):
+        node_id = f"node-{i // ENDPOINTS_PER_NODE}"
+        registry.add_action(Action(f"svc{i}.action", node_id, is_local=False))
+        registry.add_event_obj(Event(f"svc{i}.event", node_id, is_local=False))
+    return registry
+
+
+def main() -> None:
+    """Print the mean lookup time for each registry size."""
+    print(f"{'endpoints':>10} {'get_action':>14} {'get_event':>14} {'get_all_events':>16}")
+    for size in SIZES:
+        registry = build_registry(size)
+        target = size // 2
+        action_name = f"svc{target}.action"
+        event_name = f"svc{target}.event"
+
+        results = []
+        for lookup, name in (
+            (registry.get_action, action_name),
+            (registry.get_event, event_name),
+            (registry.get_all_events, event_name),
+        ):
+            elapsed = min(timeit.repeat(lambda f=lookup, n=name: f(n), number=LOOKUPS, repeat=3))
+            results.append(elapsed / LOOKUPS * 1e9)
+
+        print(f"{size:>10} {results[0]:>11.1f} ns {results[1]:>11.1f} ns {results[2]:>13.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
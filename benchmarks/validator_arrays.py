@@ -0,0 +1,50 @@
+"""Benchmark validation of large numeric array params.
+
+Run with ``python benchmarks/validator_arrays.py``. A feature vector rule with
+numeric ``items`` bounds is validated item by item and with the bulk checks.
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pylecular import validator
+from pylecular.validator import compile_schema
+
+SIZES = [100, 1_000, 10_000, 100_000]
+SCHEMA = {
+    "features": {
+        "type": "array",
+        "required": True,
+        "items": {"type": "number", "gte": -1.0, "lte": 1.0},
+    }
+}
+
+
+def time_per_call(params: dict, size: int) -> float:
+    """Return the mean time in µs of a compiled validator call."""
+    validate = compile_schema(SCHEMA)
+    number = max(1, 200_000 // size)
+    return timeit.timeit(lambda: validate(params), number=number) / number * 1e6
+
+
+def main() -> None:
+    """Print the per-call time of each items validation path."""
+    bulk_min_items = validator.BULK_MIN_ITEMS
+    print(f"{'items':>8} {'per item':>14} {'bulk':>14}")
+    for size in SIZES:
+        params = {"features": [random.uniform(-1.0, 1.0) for _ in range(size)]}
+
+        validator.BULK_MIN_ITEMS = size + 1
+        per_item = time_per_call(params, size)
+        validator.BULK_MIN_ITEMS = bulk_min_items
+
+        bulk = time_per_call(params, size)
+        print(f"{size:>8} {per_item:>11.1f} µs {bulk:>11.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark interpreted against compiled parameter validation.
+
+Run with ``python benchmarks/validator_compile.py``. Each schema is validated
+with ``validate_params``, which walks the schema dict on every call, and with
+the function returned by ``compile_schema``, which is what registered actions
+use. Both must accept the same params; the table reports the time per call.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pylecular.validator import compile_schema, validate_params
+
+CALLS = 50_000
+
+SCHEMAS = {
+    "short": (
+        {"name": "string", "age": "number", "active": "boolean"},
+        {"name": "John", "age": 30, "active": True},
+    ),
+    "user.create": (
+        {
+            "username": {"type": "string", "required": True, "minLength": 3, "maxLength": 32},
+            "email": {"type": "string", "required": True, "pattern": r"^[^@\s]+@[^@\s]+\.\w+$"},
+            "age": {"type": "number", "min": 13, "max": 130},
+            "role": {"type": "string", "enum": ["admin", "editor", "viewer"]},
+            "tags": {"type": "array", "maxItems": 10, "items": {"type": "string"}},
+            "newsletter": "boolean",
+        },
+        {
+            "username": "john_doe",
+            "email": "john@example.com",
+            "age": 34,
+            "role": "editor",
+            "tags": ["beta", "eu", "mobile"],
+            "newsletter": False,
+        },
+    ),
+    "metrics.push": (
+        {
+            "series": {"type": "string", "required": True, "pattern": r"^[a-z_.]+$"},
+            "values": {"type": "array", "minItems": 1, "items": {"type": "number", "gte": 0}},
+        },
+        {"series": "http.latency_ms", "values": [float(i) for i in range(50)]},
+    ),
+}
+
+
+def main() -> None:
+    """Print the per-call time of interpreted and compiled validation."""
+    print(f"{'schema':>14} {'interpreted':>14} {'compiled':>14} {'speed-up':>10}")
+    for name, (schema, params) in SCHEMAS.items():
+        compiled = compile_schema(schema)
+        assert validate_params(params, schema) and compiled(params)
+
+        interpreted_s = timeit.timeit(
+            lambda s=schema, p=params: validate_params(p, s), number=CALLS
+        )
+        compiled_s = timeit.timeit(lambda v=compiled, p=params: v(p), number=CALLS)
+        print(
+            f"{name:>14} {interpreted_s / CALLS * 1e6:>11.2f} µs {compiled_s / CALLS * 1e6:>11.2f} µs"
+            f" {interpreted_s / compiled_s:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import os
 import sys
+from typing import List
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # import pylecular
 import numpy as np
@@ -21,11 +22,15 @@ class MLService(Service):
         self.model = LinearRegression()
         self.model.fit(X, y)
 
-    @action(params=["x"])
-    async def predict(self, ctx: Context):
-        x = float(ctx.params.get("x"))
-        prediction = self.model.predict([[x]])
-        return float(prediction[0])
+    @action(
+        params=["x"],
+        bulkhead={"concurrency": 4, "max_queue_size": 100},
+        batch={"max_size": 32, "max_wait": 0.005},
+        executor="process",
+    )
+    def predict(self, contexts: List[Context]):
+        X = np.array([[float(ctx.params.get("x"))] for ctx in contexts])
+        return [float(prediction) for prediction in self.model.predict(X)]
 
 
 # Example usage
@@ -48,4 +53,5 @@ async def main():
     broker.logger.info(f"ml predicted {res}")
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""Micro-batching of local action calls in the Pylecular framework.
+
+An action declared with ``@action(batch=...)`` receives the contexts of
+several calls at once, such as an ML model predicting a whole batch of
+inputs in one pass. Calls are collected until ``max_size`` of them are
+waiting or the oldest has waited ``max_wait`` seconds, then the handler is
+called with their contexts and returns one result per context.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+BatchOptions = Dict[str, Any]
+
+
+class Batcher:
+    """Collects the calls of one action into batches.
+
+    The handler returns a list with one result per context, in the same
+    order. An exception instance in the list fails the matching call only,
+    while an exception raised by the handler fails the whole batch. A call
+    that times out or is cancelled while waiting is left out of its batch.
+    """
+
+    def __init__(self, name: str, max_size: int = 32, max_wait: float = 0.005) -> None:
+        """Initialize the batcher.
+
+        Args:
+            name: Name of the action, used in errors
+            max_size: Number of calls that makes a batch run straight away
+            max_wait: Seconds the first call of a batch waits for others
+        """
+        if max_size < 1:
+            raise ValueError("Batch max_size must be at least 1")
+
+        self.name = name
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.calls = 0
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Batches being handled, referenced until they complete
+        self._running: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_options(
+        cls, name: str, options: Optional[Union[bool, BatchOptions]]
+    ) -> Optional["Batcher"]:
+        """Build the batcher of an action.
+
+        Args:
+            name: Name of the action
+            options: ``max_size`` and ``max_wait``, True for the defaults, or None
+
+        Returns:
+            The batcher, or None when the action is not batched
+        """
+        if options is True:
+            return cls(name)
+        if not isinstance(options, dict):
+            return None
+        return cls(name, **options)
+
+    @property
+    def pending(self) -> int:
+        """Number of calls waiting for their batch to run."""
+        return len(self._pending)
+
+    def wrap(
+        self, handler: Callable[[List[Any]], Awaitable[List[Any]]]
+    ) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap a batch handler into a handler of single calls.
+
+        Args:
+            handler: Handler taking a list of contexts and returning their results
+
+        Returns:
+            Handler taking one context and returning its result
+        """
+
+        async def batch_handler(ctx: Any) -> Any:
+            future = asyncio.get_running_loop().create_future()
+            self._pending.append((ctx, future))
+            if len(self._pending) >= self.max_size:
+                self._flush(handler)
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.max_wait, self._flush, handler
+                )
+            return await future
+
+        return batch_handler
+
+    def _flush(self, handler: Callable[[List[Any]], Awaitable[List[Any]]]) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        # Calls whose caller gave up while waiting are left out
+        batch = [(ctx, future) for ctx, future in self._pending if not future.done()]
+        self._pending = []
+        if batch:
+            self.batches += 1
+            self.calls += len(batch)
+            task = asyncio.ensure_future(self._run(handler, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        batch: List[Tuple[Any, asyncio.Future]],
+    ) -> None:
+        try:
+            results = await handler([ctx for ctx, _ in batch])
+            if not isinstance(results, list) or len(results) != len(batch):
+                raise ValueError(f"Batch handler of {self.name} must return one result per context")
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,298 @@
+"""Circuit breakers for remote action endpoints in the Pylecular framework.
+
+Each remote endpoint, an action hosted by one node, gets its own breaker
+counting failed calls over a rolling window. When too many calls fail the
+circuit opens and the registry stops selecting the endpoint. After a
+cool-down one trial call is let through: the circuit closes again if it
+succeeds, and opens for another cool-down if it fails.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Deque, Dict, List, Optional, Union
+
+from .retry import RetryCheck, is_retryable
+
+if TYPE_CHECKING:
+    from .context import Context
+    from .metrics import MetricRegistry
+    from .registry import Action, Registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Local events broadcast on state changes, by new state
+TRANSITION_EVENTS = {
+    OPEN: "$circuit-breaker.opened",
+    HALF_OPEN: "$circuit-breaker.half-opened",
+    CLOSED: "$circuit-breaker.closed",
+}
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when every endpoint of an action has an open circuit."""
+
+    def __init__(self, action: str) -> None:
+        super().__init__(f"Action {action} is unavailable, every endpoint has an open circuit")
+        self.action = action
+
+
+class CircuitBreakerOptions:
+    """When circuits open and how long they stay open.
+
+    A circuit opens when at least ``min_request_count`` calls were made in
+    the last ``window`` seconds and the fraction of them that failed reaches
+    ``threshold``.
+    """
+
+    # Number of buckets the rolling window is divided into
+    BUCKETS = 10
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        min_request_count: int = 20,
+        window: float = 60.0,
+        half_open_time: float = 10.0,
+        check: Optional[RetryCheck] = None,
+    ) -> None:
+        """Initialize the options.
+
+        Args:
+            threshold: Fraction of failed calls that opens the circuit, between 0 and 1
+            min_request_count: Calls needed in the window before the circuit can open
+            window: Seconds of calls the failure rate is computed over
+            half_open_time: Seconds an open circuit waits before letting a trial call through
+            check: Predicate telling whether an error counts as a failure of the
+                endpoint. Defaults to errors marked ``retryable``, such as timeouts
+                and rejected requests
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("Circuit breaker threshold must be between 0 and 1")
+        if window <= 0:
+            raise ValueError("Circuit breaker window must be positive")
+
+        self.threshold = threshold
+        self.min_request_count = min_request_count
+        self.window = window
+        self.half_open_time = half_open_time
+        self.check = check or is_retryable
+
+    @classmethod
+    def from_options(
+        cls, options: Optional[Union["CircuitBreakerOptions", Dict[str, Any]]]
+    ) -> Optional["CircuitBreakerOptions"]:
+        """Build options from the value given to ``Settings``.
+
+        Args:
+            options: Options, keyword arguments of the constructor, or None
+
+        Returns:
+            The options, or None when circuit breakers are disabled
+        """
+        if options is None or isinstance(options, CircuitBreakerOptions):
+            return options
+        return cls(**options)
+
+
+class CircuitBreaker:
+    """State of the circuit of one endpoint.
+
+    ``acquire`` is called before each call and ``record`` with its outcome;
+    both return the new state when the call changed it.
+    """
+
+    def __init__(self, options: CircuitBreakerOptions) -> None:
+        """Initialize a closed circuit.
+
+        Args:
+            options: Thresholds and timings of the circuit
+        """
+        self.options = options
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.requests = 0
+        self.failures = 0
+        self._probing = False
+        self._bucket_size = options.window / options.BUCKETS
+        # [start time, requests, failures] per bucket, oldest first
+        self._buckets: Deque[List[float]] = deque()
+
+    @property
+    def available(self) -> bool:
+        """Whether the endpoint may be selected for a call."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return time.monotonic() >= self.opened_at + self.options.half_open_time
+        return not self._probing
+
+    def acquire(self) -> Optional[str]:
+        """Account for a call about to be sent to the endpoint.
+
+        Returns:
+            HALF_OPEN if the call is the trial call of a cooled down circuit
+        """
+        if self.state == CLOSED:
+            return None
+        if self.state == OPEN and self.available:
+            self.state = HALF_OPEN
+            self._probing = True
+            return HALF_OPEN
+        self._probing = True
+        return None
+
+    def release(self) -> None:
+        """Account for a call that ended without an outcome, such as a cancelled one."""
+        self._probing = False
+
+    def record(self, failed: bool) -> Optional[str]:
+        """Account for the outcome of a call.
+
+        Args:
+            failed: Whether the call failed
+
+        Returns:
+            The new state if the outcome opened or closed the circuit
+        """
+        if self.state == HALF_OPEN:
+            self._probing = False
+            return self._open() if failed else self._close()
+        if self.state == OPEN:
+            # Outcome of a call sent before the circuit opened
+            return None
+
+        now = time.monotonic()
+        self._expire(now)
+        if not self._buckets or now - self._buckets[-1][0] >= self._bucket_size:
+            self._buckets.append([now, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        self.requests += 1
+        if failed:
+            bucket[2] += 1
+            self.failures += 1
+
+        if (
+            failed
+            and self.requests >= self.options.min_request_count
+            and self.failures >= self.options.threshold * self.requests
+        ):
+            return self._open()
+        return None
+
+    def _expire(self, now: float) -> None:
+        start = now - self.options.window
+        while self._buckets and self._buckets[0][0] <= start:
+            _, requests, failures = self._buckets.popleft()
+            self.requests -= int(requests)
+            self.failures -= int(failures)
+
+    def _reset(self) -> None:
+        self._buckets.clear()
+        self.requests = 0
+        self.failures = 0
+
+    def _open(self) -> str:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._reset()
+        return OPEN
+
+    def _close(self) -> str:
+        self.state = CLOSED
+        self._reset()
+        return CLOSED
+
+
+class CircuitBreakers:
+    """Circuit breakers of the remote endpoints called by a broker.
+
+    Endpoints whose circuit is not closed are listed in the registry's
+    ``open_circuits`` so that endpoint selection can skip them.
+    """
+
+    def __init__(
+        self,
+        options: CircuitBreakerOptions,
+        registry: "Registry",
+        metrics: "MetricRegistry",
+        emit: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+        logger: Any = None,
+    ) -> None:
+        """Initialize the breakers.
+
+        Args:
+            options: Thresholds and timings shared by every circuit
+            registry: Registry selecting the endpoints
+            metrics: Metric registry counting state transitions
+            emit: Coroutine function broadcasting a local event
+            logger: Logger instance
+        """
+        self.options = options
+        self.registry = registry
+        self.metrics = metrics
+        self.emit = emit
+        self.logger = logger
+
+    def get(self, endpoint: "Action") -> CircuitBreaker:
+        """Get the breaker of an endpoint, creating it on first use.
+
+        Args:
+            endpoint: Remote action endpoint
+
+        Returns:
+            The endpoint's breaker
+        """
+        breaker = endpoint.breaker
+        if breaker is None:
+            breaker = endpoint.breaker = CircuitBreaker(self.options)
+        return breaker
+
+    async def call(
+        self,
+        endpoint: "Action",
+        handler: Callable[["Context"], Awaitable[Any]],
+        context: "Context",
+    ) -> Any:
+        """Call a remote endpoint, recording the outcome on its circuit.
+
+        Args:
+            endpoint: Remote action endpoint
+            handler: Handler sending the request
+            context: Context of the call
+
+        Returns:
+            Result from the action
+        """
+        breaker = self.get(endpoint)
+        await self._transition(endpoint, breaker.acquire())
+        try:
+            result = await handler(context)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except Exception as error:
+            await self._transition(endpoint, breaker.record(self.options.check(error)))
+            raise
+        await self._transition(endpoint, breaker.record(False))
+        return result
+
+    async def _transition(self, endpoint: "Action", state: Optional[str]) -> None:
+        if state is None:
+            return
+
+        if state == CLOSED:
+            self.registry.open_circuits.discard(endpoint)
+        else:
+            self.registry.open_circuits.add(endpoint)
+
+        labels = {"action": endpoint.name, "node": endpoint.node_id, "state": state}
+        self.metrics.increment("circuit_breaker.transitions", labels=labels)
+        if self.logger:
+            self.logger.warning(f"Circuit of {endpoint.name} on node {endpoint.node_id} is {state}")
+        await self.emit(
+            TRANSITION_EVENTS[state], {"action": endpoint.name, "node_id": endpoint.node_id}
+        )
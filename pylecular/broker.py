@@ -12,15 +12,25 @@ from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 if TYPE_CHECKING:
     from .context import Context
     from .middleware import Middleware
+    from .registry import Action
     from .service import Service
 
+from .breaker import CircuitBreakers, CircuitOpenError
+from .cacher import MISS, CacherService, make_key
+from .coalesce import SingleFlight
 from .discoverer import Discoverer
+from .executor import PROCESS, THREAD, ActionExecutor
+from .hedge import Hedger
 from .lifecycle import Lifecycle
 from .logger import get_logger
+from .metrics import MetricRegistry
+from .middleware import MiddlewareHandler
 from .node import NodeCatalog
+from .rate_limit import RateLimitExceededError
 from .registry import Registry
+from .retry import RetryPolicy
 from .settings import Settings
-from .transit import Transit
+from .transit import RequestSkippedError, Transit, run_until_deadline
 
 
 # For backwards compatibility, alias ServiceBroker as Broker
@@ -68,7 +78,7 @@ class ServiceBroker:
         self.namespace = namespace
 
         # Initialize middleware system
-        self.middlewares = self._initialize_middlewares(middlewares)
+        self.middleware_handler = MiddlewareHandler(self._initialize_middlewares(middlewares))
 
         # Initialize logger
         self.logger = get_logger(self.settings.log_level, self.settings.log_format).bind(
@@ -76,8 +86,29 @@ class ServiceBroker:
         )
 
         # Initialize core components
+        self.metrics = MetricRegistry()
+        self.executors = {
+            THREAD: ActionExecutor(THREAD, self.settings.thread_pool_size, self.metrics),
+            PROCESS: ActionExecutor(PROCESS, self.settings.process_pool_size, self.metrics),
+        }
+        for kind, executor in self.executors.items():
+            labels = {"executor": kind}
+            self.metrics.register_gauge(
+                "executor.in_flight", lambda e=executor: e.in_flight, labels
+            )
+            self.metrics.register_gauge("executor.queued", lambda e=executor: e.queued, labels)
         self.lifecycle = lifecycle or Lifecycle(broker=self)
-        self.registry = registry or Registry(node_id=self.id, logger=self.logger)
+        self.registry = registry or Registry(
+            node_id=self.id,
+            logger=self.logger,
+            strategy=self.settings.strategy,
+            strategy_options=self.settings.strategy_options,
+            prefer_local=self.settings.prefer_local,
+            broker=self,
+            bulkhead=self.settings.bulkhead,
+            rate_limit=self.settings.rate_limit,
+            executors=self.executors,
+        )
         self.node_catalog = node_catalog or NodeCatalog(
             logger=self.logger, node_id=self.id, registry=self.registry
         )
@@ -88,8 +119,31 @@ class ServiceBroker:
             node_catalog=self.node_catalog,
             lifecycle=self.lifecycle,
             logger=self.logger,
+            middleware_handler=self.middleware_handler,
+            metrics=self.metrics,
+        )
+        self.circuit_breakers = (
+            CircuitBreakers(
+                self.settings.circuit_breaker,
+                registry=self.registry,
+                metrics=self.metrics,
+                emit=self.broadcast_local,
+                logger=self.logger,
+            )
+            if self.settings.circuit_breaker is not None
+            else None
+        )
+        self.cacher = self.settings.cacher
+        if self.cacher is not None:
+            self.cacher.init(self.logger)
+        self.single_flight = SingleFlight(self.metrics)
+        self.hedger = Hedger(self.metrics)
+        self.discoverer = discoverer or Discoverer(
+            broker=self,
+            heartbeat_interval=self.settings.heartbeat_interval,
+            heartbeat_timeout=self.settings.heartbeat_timeout,
+            heartbeat_jitter=self.settings.heartbeat_jitter,
         )
-        self.discoverer = discoverer or Discoverer(broker=self)
 
         # Call middleware broker_created hooks
         self._call_middleware_hooks("broker_created", self, is_async=False)
@@ -112,6 +166,25 @@ class ServiceBroker:
         else:
             return []
 
+    @property
+    def middlewares(self) -> List["Middleware"]:
+        """Middlewares applied by this broker, the first one being the outermost wrapper."""
+        return self.middleware_handler.middlewares
+
+    @middlewares.setter
+    def middlewares(self, middlewares: List["Middleware"]) -> None:
+        self.middleware_handler.middlewares = middlewares
+
+    def use(self, middleware: "Middleware") -> None:
+        """Add a middleware after the broker was created.
+
+        Compiled handler chains are invalidated and rebuilt on the next call.
+
+        Args:
+            middleware: Middleware instance to add
+        """
+        self.middleware_handler.add(middleware)
+
     def _call_middleware_hooks(
         self, hook_name: str, *args: Any, is_async: bool = True
     ) -> Optional[List[Any]]:
@@ -149,6 +222,10 @@ class ServiceBroker:
         self.logger.info(f"Node ID: {self.id}")
         self.logger.info(f"Transporter: {self.transit.transporter.name}")
 
+        # Listen to cache.clean events before the node's services are announced
+        if self.cacher is not None:
+            await self.register(CacherService(self.cacher))
+
         # Connect to the cluster
         await self.transit.connect()
 
@@ -171,6 +248,10 @@ class ServiceBroker:
         # Disconnect from the cluster
         await self.transit.disconnect()
 
+        # Workers finish the calls already submitted in the background
+        for executor in self.executors.values():
+            executor.shutdown(wait=False)
+
         # Call async middleware hooks
         coroutines = self._call_middleware_hooks("broker_stopped", self)
         if coroutines:
@@ -190,6 +271,8 @@ class ServiceBroker:
         # Register signal handlers
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, signal_handler)
+        # Signals received while starting are kept pending in cluster workers
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT, signal.SIGTERM})
 
         await shutdown_event.wait()
         await self.stop()
@@ -245,6 +328,7 @@ class ServiceBroker:
         # Register with registry and update local node
         self.registry.register(service)
         self.node_catalog.ensure_local_node()
+        self._register_action_gauges(service)
 
         # Call middleware hooks for service lifecycle
         coroutines = self._call_middleware_hooks("service_created", service)
@@ -257,50 +341,81 @@ class ServiceBroker:
 
         self.logger.info(f"Service {service.name} registered successfully")
 
-    async def _apply_middlewares(
-        self, handler: Callable, hook_name: str, metadata: Any
-    ) -> Callable:
-        """Apply middleware transformations to a handler.
+    def _register_action_gauges(self, service: "Service") -> None:
+        """Expose the state of a service's bulkheads and batchers.
 
         Args:
-            handler: Original handler function
-            hook_name: Middleware hook name to apply
-            metadata: Metadata to pass to middleware hooks
+            service: Registered service
+        """
+        for endpoint in self.registry.get_service_actions(service.name):
+            if not endpoint.is_local:
+                continue
+            labels = {"action": endpoint.name}
+            bulkhead = endpoint.bulkhead
+            if bulkhead is not None:
+                self.metrics.register_gauge(
+                    "action.bulkhead.in_flight", lambda b=bulkhead: b.in_flight, labels
+                )
+                self.metrics.register_gauge(
+                    "action.bulkhead.queued", lambda b=bulkhead: b.queued, labels
+                )
+            batcher = endpoint.batcher
+            if batcher is not None:
+                self.metrics.register_gauge(
+                    "action.batch.pending", lambda b=batcher: b.pending, labels
+                )
+                self.metrics.register_gauge(
+                    "action.batch.size",
+                    lambda b=batcher: b.calls / b.batches if b.batches else 0.0,
+                    labels,
+                )
+
+    def _remote_action_handler(self, endpoint: "Action") -> Callable:
+        """Create the innermost handler of a remote action's middleware chain.
+
+        Args:
+            endpoint: Remote action endpoint
 
         Returns:
-            Transformed handler function
+            Handler sending the request through the transit
         """
-        current_handler = handler
 
-        # Apply middlewares in reverse order for proper wrapping
-        for middleware in reversed(self.middlewares):
-            hook = getattr(middleware, hook_name, None)
-            if hook and callable(hook):
-                result = hook(current_handler, metadata)
-                if asyncio.iscoroutine(result):
-                    current_handler = await result
-                else:
-                    current_handler = result
+        async def remote_request_handler(ctx: "Context") -> Any:
+            return await self.transit.request(endpoint, ctx)
 
-        return current_handler
+        return remote_request_handler
 
     async def call(
         self,
         action_name: str,
         params: Optional[Dict[str, Any]] = None,
         meta: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        parent_ctx: Optional["Context"] = None,
     ) -> Any:
         """Call a service action.
 
+        The call times out after ``timeout`` seconds, falling back to the
+        action's own timeout and then to ``settings.request_timeout``. A call
+        made from another action's context never outlives that context's deadline.
+        Calls to actions declared with ``cache`` are answered from the broker's
+        cacher when it holds their result. Calls to actions declared with
+        ``coalesce`` share the execution of an identical call in flight.
+
         Args:
             action_name: Fully qualified action name (service.action)
             params: Parameters to pass to the action
             meta: Metadata for the call
+            timeout: Seconds the call may take. 0 disables the default timeouts
+            parent_ctx: Context of the action making this call
 
         Returns:
             Result from the action
 
         Raises:
+            RequestSkippedError: If the parent context's deadline has already passed
+            RateLimitExceededError: If a local action is over its rate limit
+            RequestTimeoutError: If the call does not complete in time
             Exception: If action is not found or execution fails
         """
         if params is None:
@@ -308,47 +423,182 @@ class ServiceBroker:
         if meta is None:
             meta = {}
 
-        endpoint = self.registry.get_action(action_name)
+        context = self.lifecycle.create_context(
+            action=action_name, params=params, meta=meta, parent=parent_ctx
+        )
+
+        endpoint = self.registry.get_action(action_name, context)
         if not endpoint:
+            if self.circuit_breakers is not None and self.registry.get_all_actions(action_name):
+                raise CircuitOpenError(action_name)
             raise Exception(f"Action {action_name} not found.")
 
-        context = self.lifecycle.create_context(action=action_name, params=params, meta=meta)
+        cache = endpoint.cache if self.cacher is not None else None
+        cache_key = None
+        ttl = None
+        if cache:
+            options = cache if isinstance(cache, dict) else {}
+            ttl = options.get("ttl")
+            cache_key = self.cacher.get_cache_key(action_name, params, meta, options.get("keys"))
+            cached = await self.cacher.get_async(cache_key)
+            if cached is not MISS:
+                self.metrics.increment("cache.hits", labels={"action": action_name})
+                return cached
+            self.metrics.increment("cache.misses", labels={"action": action_name})
+
+        if timeout is None:
+            timeout = endpoint.timeout or self.settings.request_timeout
+        context.set_timeout(timeout)
+        if context.expired:
+            raise RequestSkippedError(action_name)
+
+        coalesce = endpoint.coalesce
+        if coalesce:
+            keys = coalesce.get("keys") if isinstance(coalesce, dict) else None
+            return await self.single_flight.run(
+                make_key(action_name, params, meta, keys),
+                action_name,
+                context,
+                lambda: self._dispatch(endpoint, context, cache_key, ttl),
+            )
+        return await self._dispatch(endpoint, context, cache_key, ttl)
+
+    async def _dispatch(
+        self,
+        endpoint: "Action",
+        context: "Context",
+        cache_key: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Call an endpoint, hedging and retrying failed calls, and cache the result.
+
+        Args:
+            endpoint: Selected action endpoint
+            context: Context of the call
+            cache_key: Key the result is cached under, or None to not cache it
+            ttl: Seconds the result is cached, defaulting to the cacher's ttl
+
+        Returns:
+            Result from the action
+        """
+        try:
+            if not endpoint.is_local and endpoint.hedge:
+                result = await self.hedger.call(
+                    endpoint,
+                    context,
+                    self._call_endpoint,
+                    lambda first: self.registry.get_action(
+                        first.name, context, exclude={first.node_id}
+                    ),
+                )
+            else:
+                result = await self._call_endpoint(endpoint, context)
+        except Exception as error:
+            policy = endpoint.retry_policy or self.settings.retry_policy
+            if policy is None or not policy.should_retry(error, 0):
+                raise
+            result = await self._retry_call(policy, endpoint, context, error)
+
+        if cache_key is not None:
+            await self.cacher.set_async(cache_key, result, ttl)
+        return result
 
+    async def _call_endpoint(self, endpoint: "Action", context: "Context") -> Any:
+        """Run a call on a local endpoint or send it to a remote one.
+
+        Args:
+            endpoint: Selected action endpoint
+            context: Context of the call
+
+        Returns:
+            Result from the action
+        """
+        action_name = endpoint.name
         if endpoint.is_local:
+            limiter = endpoint.rate_limiter
+            if limiter is not None and not limiter.allow(action_name, context):
+                self.metrics.increment("action.rate_limit.rejected", labels={"action": action_name})
+                raise RateLimitExceededError(action_name)
+
             # Handle local action call
-            handler = await self._apply_middlewares(endpoint.handler, "local_action", endpoint)
+            handler = self.middleware_handler.cached(endpoint)
+            if handler is None:
+                handler = await self.middleware_handler.compile(
+                    endpoint, "local_action", endpoint.handler
+                )
 
             try:
                 # Validate parameters if schema is defined
                 if endpoint.params_schema:
-                    from .validator import ValidationError, validate_params
-
-                    try:
-                        validate_params(context.params, endpoint.params_schema)
-                    except ValidationError:
-                        raise  # Re-raise validation errors
+                    endpoint.validate(context.params)
 
                 if handler is None:
                     raise Exception(
                         f"Handler for action {action_name} is None after applying middlewares"
                     )
 
-                return await handler(context)
+                return await run_until_deadline(handler, context, action_name)
 
             except Exception as e:
                 self.logger.error(f"Error in local action {action_name}: {e}")
                 raise
         else:
             # Handle remote action call
-            async def remote_request_handler(ctx: "Context") -> Any:
-                return await self.transit.request(endpoint, ctx)
+            handler = self.middleware_handler.cached(endpoint)
+            if handler is None:
+                handler = await self.middleware_handler.compile(
+                    endpoint, "remote_action", self._remote_action_handler(endpoint)
+                )
+
+            if self.circuit_breakers is not None:
+                return await self.circuit_breakers.call(endpoint, handler, context)
+            return await handler(context)
+
+    async def _retry_call(
+        self, policy: RetryPolicy, endpoint: "Action", context: "Context", error: Exception
+    ) -> Any:
+        """Retry a failed call, on another node than the ones that failed when possible.
+
+        Args:
+            policy: Retry policy of the call
+            endpoint: Endpoint the first attempt was sent to
+            context: Context of the call
+            error: Error raised by the first attempt
+
+        Returns:
+            Result from the first successful retry
 
-            # Apply middlewares to remote call handler
-            wrapped_handler = await self._apply_middlewares(
-                remote_request_handler, "remote_action", endpoint
+        Raises:
+            Exception: The last error when the retries run out, the error is not
+                retryable or the deadline leaves no time for another attempt
+        """
+        action_name = endpoint.name
+        failed_nodes = {endpoint.node_id}
+        attempt = 0
+        while True:
+            delay = policy.backoff(attempt)
+            remaining = context.remaining()
+            if remaining is not None and delay >= remaining:
+                raise error
+
+            attempt += 1
+            self.metrics.increment("broker.call.retries", labels={"action": action_name})
+            self.logger.warning(
+                f"Retrying call to {action_name} ({attempt}/{policy.retries}) after error: {error}"
             )
+            await asyncio.sleep(delay)
 
-            return await wrapped_handler(context)
+            endpoint = self.registry.get_action(action_name, context, exclude=failed_nodes)
+            if endpoint is None:
+                raise error
+
+            try:
+                return await self._call_endpoint(endpoint, context)
+            except Exception as e:
+                if not policy.should_retry(e, attempt):
+                    raise
+                error = e
+                failed_nodes.add(endpoint.node_id)
 
     async def emit(
         self,
@@ -382,7 +632,11 @@ class ServiceBroker:
 
         if endpoint.is_local and endpoint.handler:
             # Handle local event
-            handler = await self._apply_middlewares(endpoint.handler, "local_event", endpoint)
+            handler = self.middleware_handler.cached(endpoint)
+            if handler is None:
+                handler = await self.middleware_handler.compile(
+                    endpoint, "local_event", endpoint.handler
+                )
             return await handler(context)
         else:
             # Handle remote event
@@ -420,7 +674,11 @@ class ServiceBroker:
         for endpoint in endpoints:
             if endpoint.is_local and endpoint.handler:
                 # Handle local event
-                handler = await self._apply_middlewares(endpoint.handler, "local_event", endpoint)
+                handler = self.middleware_handler.cached(endpoint)
+                if handler is None:
+                    handler = await self.middleware_handler.compile(
+                        endpoint, "local_event", endpoint.handler
+                    )
                 tasks.append(handler(context))
             else:
                 # Handle remote event
@@ -432,6 +690,43 @@ class ServiceBroker:
 
         return []
 
+    async def broadcast_local(
+        self,
+        event_name: str,
+        params: Optional[Dict[str, Any]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> List[Any]:
+        """Broadcast an event to the handlers registered on this node only.
+
+        Args:
+            event_name: Name of the event to broadcast
+            params: Parameters to pass with the event
+            meta: Metadata for the event
+
+        Returns:
+            List of results from the local event handlers
+        """
+        endpoints = [
+            endpoint
+            for endpoint in self.registry.get_all_events(event_name)
+            if endpoint.is_local and endpoint.handler
+        ]
+        if not endpoints:
+            return []
+
+        context = self.lifecycle.create_context(event=event_name, params=params, meta=meta)
+
+        tasks = []
+        for endpoint in endpoints:
+            handler = self.middleware_handler.cached(endpoint)
+            if handler is None:
+                handler = await self.middleware_handler.compile(
+                    endpoint, "local_event", endpoint.handler
+                )
+            tasks.append(handler(context))
+
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
 
 # Backwards compatibility alias
 Broker = ServiceBroker
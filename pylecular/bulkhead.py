@@ -0,0 +1,130 @@
+"""Bulkheads limiting concurrent calls of local actions in the Pylecular framework.
+
+A bulkhead lets a fixed number of calls of an action run at the same time and
+queues the calls over that number. Calls arriving while the queue is full
+fail straight away, so a burst on one expensive action cannot take over the
+event loop.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Union
+
+BulkheadOptions = Dict[str, int]
+
+
+class QueueIsFullError(Exception):
+    """Exception raised when an action's bulkhead queue is full.
+
+    The call may be retried on another node.
+    """
+
+    retryable = True
+
+    def __init__(self, action: str) -> None:
+        super().__init__(f"Queue of {action} is full")
+        self.action = action
+
+
+class Bulkhead:
+    """Concurrency limit and wait queue of one action.
+
+    Queued calls are started in arrival order as running calls complete.
+    """
+
+    def __init__(self, name: str, concurrency: int = 10, max_queue_size: int = 100) -> None:
+        """Initialize the bulkhead.
+
+        Args:
+            name: Name of the action, used in errors
+            concurrency: Number of calls running at the same time
+            max_queue_size: Number of calls waiting for a slot before new calls are rejected
+        """
+        if concurrency < 1:
+            raise ValueError("Bulkhead concurrency must be at least 1")
+
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue_size = max_queue_size
+        self.in_flight = 0
+        self._queue: Deque[asyncio.Future] = deque()
+
+    @classmethod
+    def from_options(
+        cls, name: str, options: Optional[Union[bool, BulkheadOptions]]
+    ) -> Optional["Bulkhead"]:
+        """Build the bulkhead of an action.
+
+        Args:
+            name: Name of the action
+            options: ``concurrency`` and ``max_queue_size``, or None or False for no bulkhead
+
+        Returns:
+            The bulkhead, or None when the action has none
+        """
+        if not isinstance(options, dict):
+            return None
+        return cls(name, **options)
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting for a slot."""
+        return len(self._queue)
+
+    async def run(self, handler: Callable[[Any], Awaitable[Any]], ctx: Any) -> Any:
+        """Run a call once a slot is free.
+
+        Args:
+            handler: Action handler
+            ctx: Context of the call
+
+        Returns:
+            Result of the handler
+
+        Raises:
+            QueueIsFullError: If every slot is taken and the queue is full
+        """
+        if self.in_flight < self.concurrency:
+            self.in_flight += 1
+        else:
+            if len(self._queue) >= self.max_queue_size:
+                raise QueueIsFullError(self.name)
+            waiter = asyncio.get_running_loop().create_future()
+            self._queue.append(waiter)
+            try:
+                # The slot is handed over by the completing call, in_flight stays counted
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._release()
+                elif waiter in self._queue:
+                    self._queue.remove(waiter)
+                raise
+
+        try:
+            return await handler(ctx)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        while self._queue:
+            waiter = self._queue.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def wrap(self, handler: Callable[[Any], Awaitable[Any]]) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap an action handler so that its calls go through the bulkhead.
+
+        Args:
+            handler: Action handler
+
+        Returns:
+            Handler running the original one within the bulkhead
+        """
+
+        async def bulkhead_handler(ctx: Any) -> Any:
+            return await self.run(handler, ctx)
+
+        return bulkhead_handler
@@ -0,0 +1,754 @@
+"""Caching of action results in the Pylecular framework.
+
+Actions declared with ``@action(cache=...)`` have their results stored by the
+calling broker, keyed by the action name and selected params and meta. Later
+calls with the same key are answered from the cache without reaching a local
+handler or another node.
+
+Entries are removed on every node by broadcasting a ``cache.clean`` event
+whose ``pattern`` param is a glob matched against cache keys.
+
+Worker processes running on the same host can share results through a
+SQLite database, kept as a second tier behind each process's memory cache.
+The broker reaches the cache through ``get_async`` and ``set_async``, which
+run the database queries on a thread of their own instead of the event loop.
+"""
+
+import asyncio
+import fnmatch
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .decorators import event
+from .service import Service
+
+# Event cleaning the cache of every node
+CLEAN_EVENT = "cache.clean"
+
+# Returned by ``get`` when a key is not cached, as None is a valid result
+MISS = object()
+
+CacheOptions = Union[bool, Dict[str, Any]]
+
+
+def _key_part(value: Any) -> str:
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return str(value)
+
+
+def _lookup(source: Dict[str, Any], path: str) -> Any:
+    value: Any = source
+    for name in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+def make_key(
+    action: str, params: Dict[str, Any], meta: Dict[str, Any], keys: Optional[List[str]] = None
+) -> str:
+    """Build the key of a call from selected params and meta.
+
+    Args:
+        action: Name of the called action
+        params: Params of the call
+        meta: Meta of the call
+        keys: Params the result depends on, or meta entries prefixed with ``#``.
+            Dotted names select nested values. Every param is used when None
+
+    Returns:
+        ``action:`` followed by the selected values separated by ``|``
+    """
+    if keys is None:
+        return f"{action}:{_key_part(params)}"
+    parts = [
+        _key_part(_lookup(meta, key[1:]) if key.startswith("#") else _lookup(params, key))
+        for key in keys
+    ]
+    return f"{action}:{'|'.join(parts)}"
+
+
+def _sizeof(value: Any) -> int:
+    """Estimate the bytes held by a value and the containers nested in it."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(key) + _sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(item) for item in value)
+    return size
+
+
+class Cacher:
+    """Base class of action result caches.
+
+    Subclasses store the entries; this class builds their keys.
+    """
+
+    def __init__(self, ttl: Optional[float] = None) -> None:
+        """Initialize the cacher.
+
+        Args:
+            ttl: Default seconds entries are kept, or None to keep them until evicted
+        """
+        self.ttl = ttl
+        self.logger: Any = None
+
+    def init(self, logger: Any) -> None:
+        """Attach the cacher to the broker using it.
+
+        Args:
+            logger: Logger of the broker, reporting errors of background work
+        """
+        self.logger = logger
+
+    @classmethod
+    def from_options(cls, options: Optional[Union["Cacher", CacheOptions]]) -> Optional["Cacher"]:
+        """Build a cacher from the value given to ``Settings``.
+
+        Args:
+            options: A cacher, True for a memory cacher with default options,
+                MemoryCacher keyword arguments, or None or False for no cache. A
+                ``shared`` option, a database path or SQLiteCacher keyword
+                arguments, adds a shared second tier behind the memory cache
+
+        Returns:
+            The cacher, or None when caching is disabled
+        """
+        if isinstance(options, Cacher):
+            return options
+        if options is True:
+            return MemoryCacher()
+        if not isinstance(options, dict):
+            return None
+
+        options = dict(options)
+        shared = options.pop("shared", None)
+        memory = MemoryCacher(**options)
+        if shared is None:
+            return memory
+        if isinstance(shared, str):
+            shared = {"path": shared}
+        return TieredCacher(memory, SQLiteCacher(**shared))
+
+    def get_cache_key(
+        self,
+        action: str,
+        params: Dict[str, Any],
+        meta: Dict[str, Any],
+        keys: Optional[List[str]] = None,
+    ) -> str:
+        """Build the cache key of a call.
+
+        Args:
+            action: Name of the called action
+            params: Params of the call
+            meta: Meta of the call
+            keys: Params the result depends on, or meta entries prefixed with ``#``.
+                Dotted names select nested values. Every param is used when None
+
+        Returns:
+            The key built by :func:`make_key`
+        """
+        return make_key(action, params, meta, keys)
+
+    def get(self, key: str) -> Any:
+        """Get a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result, or ``MISS`` if the key is not cached
+        """
+        raise NotImplementedError
+
+    def get_entry(self, key: str) -> Tuple[Any, Optional[float]]:
+        """Get a cached result and the seconds it has left.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result or ``MISS``, and the seconds left or None if it does not expire
+        """
+        return self.get(key), None
+
+    async def get_async(self, key: str) -> Any:
+        """Get a cached result without blocking the event loop.
+
+        Caches held in memory are read in place; slower ones override this.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result, or ``MISS`` if the key is not cached
+        """
+        return self.get(key)
+
+    async def get_entry_async(self, key: str) -> Tuple[Any, Optional[float]]:
+        """Get a cached result and the seconds it has left without blocking the event loop.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result or ``MISS``, and the seconds left or None if it does not expire
+        """
+        return self.get_entry(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            ttl: Seconds the entry is kept. Defaults to the cacher's ttl
+        """
+        raise NotImplementedError
+
+    async def set_async(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result without blocking the event loop.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            ttl: Seconds the entry is kept. Defaults to the cacher's ttl
+        """
+        self.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove a cached result.
+
+        Args:
+            key: Cache key
+        """
+        raise NotImplementedError
+
+    def clean(self, pattern: str = "*") -> int:
+        """Remove the cached results whose key matches a pattern.
+
+        Args:
+            pattern: Glob pattern, such as ``users.*``
+
+        Returns:
+            Number of removed entries
+        """
+        raise NotImplementedError
+
+    async def clean_async(self, pattern: str = "*") -> int:
+        """Remove the cached results whose key matches a pattern, off the event loop.
+
+        Args:
+            pattern: Glob pattern, such as ``users.*``
+
+        Returns:
+            Number of removed entries
+        """
+        return self.clean(pattern)
+
+
+class MemoryCacher(Cacher):
+    """In-process cache evicting the least recently used entries.
+
+    Entries are evicted once there are more than ``max_size`` of them, or once
+    their estimated size adds up to more than ``max_memory`` bytes. Expired
+    entries are removed when they are read.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        max_memory: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_size: Maximum number of entries
+            max_memory: Maximum estimated bytes of cached results, or None for no limit
+            ttl: Default seconds entries are kept, or None to keep them until evicted
+        """
+        super().__init__(ttl=ttl)
+        if max_size < 1:
+            raise ValueError("Cache max_size must be at least 1")
+
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.memory = 0
+        # Key -> (value, expiry time or None, estimated size), least recently used first
+        self._entries: OrderedDict[str, Tuple[Any, Optional[float], int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        """Get a cached result, marking it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result, or ``MISS`` if the key is not cached or has expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISS
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.delete(key)
+            return MISS
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result, evicting the least recently used entries over the limits.
+
+        Results larger than ``max_memory`` on their own are not cached.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            ttl: Seconds the entry is kept. Defaults to the cacher's ttl
+        """
+        self.delete(key)
+        size = _sizeof(value) if self.max_memory is not None else 0
+        if self.max_memory is not None and size > self.max_memory:
+            return
+
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (value, expires_at, size)
+        self.memory += size
+
+        while len(self._entries) > self.max_size or (
+            self.max_memory is not None and self.memory > self.max_memory
+        ):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.memory -= evicted_size
+
+    def delete(self, key: str) -> None:
+        """Remove a cached result.
+
+        Args:
+            key: Cache key
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.memory -= entry[2]
+
+    def clean(self, pattern: str = "*") -> int:
+        """Remove the cached results whose key matches a pattern.
+
+        Args:
+            pattern: Glob pattern, such as ``users.*``
+
+        Returns:
+            Number of removed entries
+        """
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
+
+
+class SQLiteCacher(Cacher):
+    """Cache stored in a SQLite database shared by the processes of a host.
+
+    The database runs in WAL mode, so processes read while another one writes.
+    Results are stored as JSON, like the results sent to other nodes. Every
+    ``EVICT_INTERVAL`` writes, a process removes the expired entries and the
+    oldest ones over ``max_size``. Database errors, such as a lock held for
+    longer than ``busy_timeout``, are treated as misses and never fail a call.
+
+    The async methods run the queries on a single thread per process, so lock
+    waits and eviction never stall the event loop. Writes are queued on that
+    thread without the caller waiting for them, and their errors are logged.
+    """
+
+    # Writes between two eviction passes of a process
+    EVICT_INTERVAL = 100
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 100000,
+        ttl: Optional[float] = None,
+        busy_timeout: float = 0.05,
+    ) -> None:
+        """Initialize the cache, creating the database on first use.
+
+        Args:
+            path: Path of the database file
+            max_size: Maximum number of entries, exceeded by at most ``EVICT_INTERVAL``
+            ttl: Default seconds entries are kept, or None to keep them until evicted
+            busy_timeout: Seconds to wait for a lock held by another process
+        """
+        super().__init__(ttl=ttl)
+        if max_size < 1:
+            raise ValueError("Cache max_size must be at least 1")
+
+        self.path = path
+        self.max_size = max_size
+        self.busy_timeout = busy_timeout
+        self._writes = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        # The connection is shared by the cache thread and direct callers
+        self._lock = threading.RLock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid = 0
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection of the current process, opened again in forked children."""
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, stored_at REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _run_in_thread(self, function: Any, *args: Any) -> "asyncio.Future[Any]":
+        # One thread per process, started again in forked children
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="pylecular-cache")
+            self._executor_pid = os.getpid()
+        return asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def close(self) -> None:
+        """Wait for the queued writes, then close the connection of the current process."""
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=True)
+        self._executor = None
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones not evicted yet."""
+        try:
+            with self._lock:
+                return self.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def get(self, key: str) -> Any:
+        """Get a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result, or ``MISS`` if the key is not cached or has expired
+        """
+        return self.get_entry(key)[0]
+
+    async def get_async(self, key: str) -> Any:
+        """Get a cached result, querying the database on the cache thread.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result, or ``MISS`` if the key is not cached or has expired
+        """
+        return (await self.get_entry_async(key))[0]
+
+    async def get_entry_async(self, key: str) -> Tuple[Any, Optional[float]]:
+        """Get a cached result and the seconds it has left, on the cache thread.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result or ``MISS``, and the seconds left or None if it does not expire
+        """
+        return await self._run_in_thread(self.get_entry, key)
+
+    def get_entry(self, key: str) -> Tuple[Any, Optional[float]]:
+        """Get a cached result and the seconds it has left.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result or ``MISS``, and the seconds left or None if it does not expire
+        """
+        try:
+            with self._lock:
+                row = self.connection.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return MISS, None
+        if row is None:
+            return MISS, None
+
+        value, expires_at = row
+        if expires_at is None:
+            return json.loads(value), None
+        left = expires_at - time.time()
+        if left <= 0:
+            return MISS, None
+        return json.loads(value), left
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result. Results that cannot be stored as JSON are not cached.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            ttl: Seconds the entry is kept. Defaults to the cacher's ttl
+        """
+        try:
+            self._store(key, value, ttl)
+        except sqlite3.Error:
+            pass
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        # Like set, but database errors are raised
+        try:
+            data = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttl
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, stored_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, data, now + ttl if ttl else None, now),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_INTERVAL == 0:
+                self.evict()
+
+    async def set_async(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Queue a result to be cached by the cache thread, without waiting for it.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            ttl: Seconds the entry is kept. Defaults to the cacher's ttl
+        """
+        self._run_in_thread(self._store, key, value, ttl).add_done_callback(self._log_failure)
+
+    def _log_failure(self, future: "asyncio.Future[Any]") -> None:
+        # Retrieving the exception also keeps asyncio from reporting it as never retrieved
+        if future.cancelled() or future.exception() is None:
+            return
+        if self.logger is not None:
+            self.logger.error(f"Error writing to the shared cache: {future.exception()}")
+
+    def evict(self) -> None:
+        """Remove the expired entries, then the oldest ones over ``max_size``."""
+        with self._lock:
+            connection = self.connection
+            connection.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+            connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY stored_at "
+                "LIMIT max(0, (SELECT COUNT(*) FROM entries) - ?))",
+                (self.max_size,),
+            )
+
+    def delete(self, key: str) -> None:
+        """Remove a cached result.
+
+        Args:
+            key: Cache key
+        """
+        try:
+            with self._lock:
+                self.connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+
+    def clean(self, pattern: str = "*") -> int:
+        """Remove the cached results whose key matches a pattern.
+
+        Args:
+            pattern: Glob pattern, such as ``users.*``
+
+        Returns:
+            Number of removed entries
+        """
+        try:
+            with self._lock:
+                return self.connection.execute(
+                    "DELETE FROM entries WHERE key GLOB ?", (pattern,)
+                ).rowcount
+        except sqlite3.Error:
+            return 0
+
+    async def clean_async(self, pattern: str = "*") -> int:
+        """Remove the cached results whose key matches a pattern, on the cache thread.
+
+        Args:
+            pattern: Glob pattern, such as ``users.*``
+
+        Returns:
+            Number of removed entries
+        """
+        return await self._run_in_thread(self.clean, pattern)
+
+
+class TieredCacher(Cacher):
+    """Memory cache in front of a cache shared with other processes.
+
+    Results found in the second tier are copied into the first one for the
+    time they have left, so hot keys are served from memory.
+    """
+
+    def __init__(self, first: Cacher, second: Cacher) -> None:
+        """Initialize the tiers.
+
+        Args:
+            first: Cache looked up first, usually a MemoryCacher
+            second: Cache looked up on misses of the first one
+        """
+        super().__init__(ttl=first.ttl)
+        self.first = first
+        self.second = second
+
+    def init(self, logger: Any) -> None:
+        """Attach both tiers to the broker using them.
+
+        Args:
+            logger: Logger of the broker, reporting errors of background work
+        """
+        super().init(logger)
+        self.first.init(logger)
+        self.second.init(logger)
+
+    def get(self, key: str) -> Any:
+        """Get a cached result from the first tier holding it.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result, or ``MISS`` if neither tier holds it
+        """
+        value = self.first.get(key)
+        if value is not MISS:
+            return value
+        value, left = self.second.get_entry(key)
+        if value is not MISS:
+            self.first.set(key, value, left)
+        return value
+
+    async def get_async(self, key: str) -> Any:
+        """Get a cached result, reaching the second tier without blocking the event loop.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The result, or ``MISS`` if neither tier holds it
+        """
+        value = self.first.get(key)
+        if value is not MISS:
+            return value
+        value, left = await self.second.get_entry_async(key)
+        if value is not MISS:
+            self.first.set(key, value, left)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result in both tiers.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            ttl: Seconds the entry is kept. Defaults to each tier's ttl
+        """
+        self.first.set(key, value, ttl)
+        self.second.set(key, value, ttl)
+
+    async def set_async(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a result in both tiers without blocking the event loop.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+            ttl: Seconds the entry is kept. Defaults to each tier's ttl
+        """
+        self.first.set(key, value, ttl)
+        await self.second.set_async(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        """Remove a cached result from both tiers.
+
+        Args:
+            key: Cache key
+        """
+        self.first.delete(key)
+        self.second.delete(key)
+
+    def clean(self, pattern: str = "*") -> int:
+        """Remove the cached results whose key matches a pattern from both tiers.
+
+        Args:
+            pattern: Glob pattern, such as ``users.*``
+
+        Returns:
+            Number of entries removed from the second tier
+        """
+        self.first.clean(pattern)
+        return self.second.clean(pattern)
+
+    async def clean_async(self, pattern: str = "*") -> int:
+        """Remove the cached results matching a pattern from both tiers, off the event loop.
+
+        Args:
+            pattern: Glob pattern, such as ``users.*``
+
+        Returns:
+            Number of entries removed from the second tier
+        """
+        self.first.clean(pattern)
+        return await self.second.clean_async(pattern)
+
+
+class CacherService(Service):
+    """Internal service cleaning the broker's cache on ``cache.clean`` events."""
+
+    def __init__(self, cacher: Cacher) -> None:
+        """Initialize the service.
+
+        Args:
+            cacher: Cache cleaned by the events
+        """
+        super().__init__("$cacher")
+        self.cacher = cacher
+
+    @event(name=CLEAN_EVENT)
+    async def clean(self, ctx: Any) -> None:
+        """Remove the entries matching the event's ``pattern`` param, every entry by default."""
+        await self.cacher.clean_async((ctx.params or {}).get("pattern", "*"))
@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import List, Optional
 
 from .broker import ServiceBroker
+from .cluster import Supervisor, resolve_instances, worker_id
 from .service import Service
 from .settings import Settings
 
@@ -106,6 +107,7 @@ async def run_broker(
     log_level: str,
     log_format: str = "PLAIN",
     namespace: str = "default",
+    services: Optional[List[Service]] = None,
 ) -> None:
     """Create a broker, register services from directory, and run until termination.
 
@@ -116,6 +118,8 @@ async def run_broker(
         log_level: Logging level
         log_format: Log output format (PLAIN or JSON)
         namespace: Service namespace for isolation
+        services: Services already imported from the directory, which is then
+            not imported again
 
     Raises:
         ServiceImportError: If service loading fails
@@ -125,7 +129,8 @@ async def run_broker(
     settings = Settings(transporter=transporter, log_level=log_level, log_format=log_format)
 
     print(f"Starting Pylecular broker '{broker_id}' with transporter: {transporter}")
-    print(f"Loading services from directory: {service_dir}")
+    if services is None:
+        print(f"Loading services from directory: {service_dir}")
 
     broker: Optional[ServiceBroker] = None
     try:
@@ -133,7 +138,8 @@ async def run_broker(
         broker = ServiceBroker(broker_id, settings=settings, namespace=namespace)
 
         # Import and register all services
-        services = import_services_from_directory(service_dir)
+        if services is None:
+            services = import_services_from_directory(service_dir)
 
         if not services:
             print(f"Warning: No services found in directory {service_dir}")
@@ -168,6 +174,63 @@ async def run_broker(
         raise
 
 
+def run_cluster(
+    service_dir: str,
+    instances: int,
+    broker_id: str,
+    transporter: str,
+    log_level: str,
+    log_format: str = "PLAIN",
+    namespace: str = "default",
+) -> int:
+    """Run one broker per instance in forked worker processes until termination.
+
+    Services are imported once, before the workers are forked, so that the
+    workers share them copy on write. Each worker's node id is the broker id
+    followed by the worker's index.
+
+    Args:
+        service_dir: Directory containing service modules
+        instances: Number of worker processes
+        broker_id: Broker identifier the node ids of the workers are derived from
+        transporter: Transporter connection string
+        log_level: Logging level
+        log_format: Log output format (PLAIN or JSON)
+        namespace: Service namespace for isolation
+
+    Returns:
+        Exit code of the cluster
+
+    Raises:
+        ServiceImportError: If service loading fails
+    """
+    print(f"Loading services from directory: {service_dir}")
+    services = import_services_from_directory(service_dir)
+
+    def run_worker(index: int) -> int:
+        try:
+            asyncio.run(
+                run_broker(
+                    service_dir=service_dir,
+                    broker_id=worker_id(broker_id, index),
+                    transporter=transporter,
+                    log_level=log_level,
+                    log_format=log_format,
+                    namespace=namespace,
+                    services=services,
+                )
+            )
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print(f"Error: {e}")
+            return 1
+        return 0
+
+    print(f"Starting {instances} Pylecular worker(s)")
+    return Supervisor(instances, run_worker).run()
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure the CLI argument parser.
 
@@ -220,6 +283,14 @@ def create_argument_parser() -> argparse.ArgumentParser:
         default="default",
         help="Service namespace for logical isolation",
     )
+    parser.add_argument(
+        "--instances",
+        "-i",
+        type=resolve_instances,
+        default=None,
+        help="Number of broker processes to run, or 'auto' for one per CPU. "
+        "Runs a single broker in this process when omitted",
+    )
 
     return parser
 
@@ -235,6 +306,19 @@ def main() -> None:
         service_dir = os.path.abspath(service_dir)
 
     try:
+        if args.instances is not None:
+            sys.exit(
+                run_cluster(
+                    service_dir=service_dir,
+                    instances=args.instances,
+                    broker_id=args.broker_id,
+                    transporter=args.transporter,
+                    log_level=args.log_level,
+                    log_format=args.log_format,
+                    namespace=args.namespace,
+                )
+            )
+
         # Run the broker
         asyncio.run(
             run_broker(
@@ -0,0 +1,222 @@
+"""Multi-process cluster mode of the Pylecular CLI.
+
+A supervisor process forks one worker per instance, each running its own
+service broker. Service modules are imported by the supervisor before the
+workers are forked, so their code and data are shared by the workers copy
+on write instead of being loaded again by each of them.
+
+Workers that crash are started again with the same index, and therefore
+the same node id, after a delay doubling with each consecutive crash. On
+SIGTERM or SIGINT the supervisor asks every worker to stop and waits for
+them, killing those still running after a timeout. Workers start with both
+signals blocked, so that a stop requested while a broker is starting waits
+for ``ServiceBroker.wait_for_shutdown`` to install its handlers and unblock
+them. Forking makes cluster mode available on POSIX systems only.
+"""
+
+import os
+import signal
+import sys
+import time
+import traceback
+from typing import Any, Callable, Dict, Optional
+
+
+def resolve_instances(value: str) -> int:
+    """Parse the number of instances given on the command line.
+
+    Args:
+        value: A positive number, or ``"auto"`` for one instance per CPU
+
+    Returns:
+        Number of workers to run
+
+    Raises:
+        ValueError: If the value is neither ``"auto"`` nor a positive number
+    """
+    if value == "auto":
+        return os.cpu_count() or 1
+    instances = int(value)
+    if instances < 1:
+        raise ValueError("Number of instances must be at least 1")
+    return instances
+
+
+def worker_id(broker_id: str, index: int) -> str:
+    """Node id of a worker, derived from the broker id given on the command line.
+
+    Args:
+        broker_id: Broker id of the cluster
+        index: Index of the worker, from 0
+
+    Returns:
+        Node id of the worker's broker
+    """
+    return f"{broker_id}-{index}"
+
+
+class Supervisor:
+    """Forks the workers of a cluster and keeps them running."""
+
+    # Seconds between two checks of the workers and of shutdown signals
+    POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        instances: int,
+        run_worker: Callable[[int], int],
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 60.0,
+        shutdown_timeout: float = 30.0,
+        logger: Optional[Any] = None,
+    ) -> None:
+        """Initialize the supervisor.
+
+        Args:
+            instances: Number of workers
+            run_worker: Function run in a forked worker with its index, returning
+                the exit code of the worker. SIGTERM and SIGINT are blocked until
+                it unblocks them, once its own handlers are installed
+            restart_delay: Seconds before a crashed worker is first started again,
+                doubled after each crash following a short run
+            max_restart_delay: Upper bound of the restart delay. A worker crashing
+                after running for this long is restarted after ``restart_delay``
+            shutdown_timeout: Seconds workers are given to stop before being killed
+            logger: Logger of worker starts and exits. Defaults to printing
+        """
+        if instances < 1:
+            raise ValueError("Number of instances must be at least 1")
+
+        self.instances = instances
+        self.run_worker = run_worker
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.logger = logger
+        self.stopping = False
+        # Running workers: pid -> index
+        self.workers: Dict[int, int] = {}
+        # time.monotonic() of each running worker's start, by pid
+        self._started: Dict[int, float] = {}
+        # Consecutive crashes of each worker, by index
+        self._crashes: Dict[int, int] = {}
+
+    def _log(self, message: str) -> None:
+        if self.logger is not None:
+            self.logger.info(message)
+        else:
+            print(message)
+
+    def run(self) -> int:
+        """Start the workers and supervise them until they all exit.
+
+        Returns:
+            Exit code of the cluster, 0 unless a worker failed to stop cleanly
+        """
+        handlers = {
+            sig: signal.signal(sig, self._handle_signal) for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for index in range(self.instances):
+                self._spawn(index)
+
+            # Crashed workers waiting to be started again: index -> time.monotonic() of the restart
+            restarts: Dict[int, float] = {}
+            while (self.workers or restarts) and not self.stopping:
+                self._reap(restarts)
+                now = time.monotonic()
+                for index, restart_at in list(restarts.items()):
+                    if restart_at <= now:
+                        del restarts[index]
+                        self._spawn(index)
+                time.sleep(self.POLL_INTERVAL)
+
+            return self._stop_workers()
+        finally:
+            for sig, handler in handlers.items():
+                signal.signal(sig, handler)
+
+    def _spawn(self, index: int) -> None:
+        # Output buffered before the fork would otherwise be written by both processes
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            # The worker's broker handles signals itself. Until it does, they are
+            # kept pending rather than killing a broker still starting
+            signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM, signal.SIGINT})
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            code = 1
+            try:
+                code = self.run_worker(index)
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                # Never return into the supervisor's loop
+                os._exit(code)
+
+        self.workers[pid] = index
+        self._started[pid] = time.monotonic()
+        self._log(f"Started worker {index} (pid {pid})")
+
+    def _reap(self, restarts: Dict[int, float]) -> None:
+        while self.workers:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                return
+            index = self.workers.pop(pid, None)
+            if index is None:
+                continue
+            uptime = time.monotonic() - self._started.pop(pid)
+            code = os.waitstatus_to_exitcode(status)
+            self._log(f"Worker {index} (pid {pid}) exited with code {code}")
+            if code != 0:
+                delay = self._restart_delay(index, uptime)
+                self._log(f"Restarting worker {index} in {delay:g}s")
+                restarts[index] = time.monotonic() + delay
+
+    def _restart_delay(self, index: int, uptime: float) -> float:
+        # A worker that ran for a while crashed on its own rather than failing to start
+        if uptime >= self.max_restart_delay:
+            self._crashes[index] = 0
+        crashes = self._crashes.get(index, 0)
+        self._crashes[index] = crashes + 1
+        return min(self.restart_delay * 2**crashes, self.max_restart_delay)
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        self.stopping = True
+
+    def _stop_workers(self) -> int:
+        # Ask the workers to stop, and kill those still running after the timeout
+        if self.workers:
+            self._log(f"Stopping {len(self.workers)} worker(s)...")
+        for pid in self.workers:
+            self._kill(pid, signal.SIGTERM)
+
+        exit_code = 0
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self.workers:
+            for pid in list(self.workers):
+                done, status = os.waitpid(pid, os.WNOHANG)
+                if done:
+                    del self.workers[pid]
+                    self._started.pop(pid, None)
+                    if os.waitstatus_to_exitcode(status) != 0:
+                        exit_code = 1
+            if self.workers and time.monotonic() >= deadline:
+                for pid, index in self.workers.items():
+                    self._log(f"Killing worker {index} (pid {pid})")
+                    self._kill(pid, signal.SIGKILL)
+                deadline = float("inf")
+            time.sleep(self.POLL_INTERVAL)
+        return exit_code
+
+    @staticmethod
+    def _kill(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,93 @@
+"""Coalescing of identical in-flight calls in the Pylecular framework.
+
+Calls to actions declared with ``@action(coalesce=...)`` are keyed by the
+action name and selected params and meta. While a call is in flight, later
+calls with the same key do not start their own: they wait for the first one
+and receive its result or exception. This keeps a burst of identical calls,
+such as the ones following the expiry of a hot cache entry, from reaching
+the handler more than once.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict
+
+from .metrics import MetricRegistry
+from .transit import run_until_deadline
+
+if TYPE_CHECKING:
+    from .context import Context
+
+
+class _Flight:
+    """Shared execution of a key and the number of calls waiting for it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Executions in flight, by call key.
+
+    Each call waits for the shared execution within its own deadline. The
+    execution keeps running when some of its callers give up, and is
+    cancelled once none is left waiting.
+    """
+
+    def __init__(self, metrics: MetricRegistry) -> None:
+        """Initialize with no execution in flight.
+
+        Args:
+            metrics: Metric registry counting coalesced calls
+        """
+        self.metrics = metrics
+        self._flights: Dict[str, _Flight] = {}
+
+    def __len__(self) -> int:
+        """Number of executions in flight."""
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: str,
+        action: str,
+        context: "Context",
+        execute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Run a call, joining the execution in flight for its key if there is one.
+
+        Args:
+            key: Key of the call
+            action: Name of the called action
+            context: Context of the call, whose deadline bounds the wait
+            execute: Coroutine function executing the call when none is in flight
+
+        Returns:
+            Result of the shared execution
+
+        Raises:
+            RequestTimeoutError: If the call's deadline passes before the execution ends
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(execute()))
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+        else:
+            self.metrics.increment("broker.call.coalesced", labels={"action": action})
+
+        flight.waiters += 1
+        try:
+            return await run_until_deadline(lambda _: asyncio.shield(flight.task), context, action)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _finish(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Retrieve the exception so that it is not reported as never retrieved
+        if not flight.task.cancelled():
+            flight.task.exception()
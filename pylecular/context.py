@@ -4,6 +4,8 @@ The Context class provides the execution context for service actions and events,
 including metadata handling and broker communication capabilities.
 """
 
+import math
+import time
 from typing import TYPE_CHECKING, Any, Dict, Optional
 
 if TYPE_CHECKING:
@@ -16,6 +18,10 @@ class Context:
     The Context contains all relevant information about a request including
     parameters, metadata, tracing information, and provides methods to
     call other services or emit events.
+
+    A context may carry a deadline, a ``time.monotonic()`` timestamp after which
+    the caller no longer waits for the result. Nested calls inherit it, so the
+    time left only shrinks along a call chain.
     """
 
     def __init__(
@@ -28,6 +34,7 @@ class Context:
         meta: Optional[Dict[str, Any]] = None,
         stream: bool = False,
         broker: Optional["ServiceBroker"] = None,
+        deadline: Optional[float] = None,
     ) -> None:
         """Initialize a new Context instance.
 
@@ -40,6 +47,7 @@ class Context:
             meta: Metadata associated with the request
             stream: Whether this is a streaming context
             broker: Reference to the service broker
+            deadline: ``time.monotonic()`` time after which the call times out
         """
         self.id = id
         self.action = action
@@ -49,6 +57,7 @@ class Context:
         self.parent_id = parent_id
         self.stream = stream
         self._broker = broker
+        self.deadline = deadline
 
     @property
     def broker(self) -> Optional["ServiceBroker"]:
@@ -59,19 +68,52 @@ class Context:
         """
         return self._broker
 
+    def set_timeout(self, timeout: Optional[float]) -> None:
+        """Bring the deadline forward to at most ``timeout`` seconds from now.
+
+        A deadline that is already closer is kept.
+
+        Args:
+            timeout: Seconds the call may take. None or 0 leaves the deadline as is
+        """
+        if not timeout:
+            return
+        deadline = time.monotonic() + timeout
+        if self.deadline is None or deadline < self.deadline:
+            self.deadline = deadline
+
+    def remaining(self) -> Optional[float]:
+        """Get the time left before the deadline.
+
+        Returns:
+            Seconds left, 0 once the deadline passed, or None without a deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed."""
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
     def unmarshall(self) -> Dict[str, Any]:
         """Convert context to dictionary format for serialization.
 
         Returns:
             Dictionary representation of the context
         """
+        # The remaining budget travels in milliseconds, 0 meaning no timeout
+        remaining = self.remaining()
+        timeout = 0 if remaining is None else max(1, math.ceil(remaining * 1000))
+
         return {
             "id": self.id,
             "action": self.action,
             "event": self.event,
             "params": self.params,
             "meta": self.meta,
-            "timeout": 0,
+            "timeout": timeout,
             "level": 1,
             "tracing": None,
             "parentID": self.parent_id,
@@ -106,13 +148,17 @@ class Context:
         service_name: str,
         params: Optional[Dict[str, Any]] = None,
         meta: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
     ) -> Any:
         """Call another service action.
 
+        The call inherits this context's deadline.
+
         Args:
             service_name: Name of the service action to call
             params: Parameters to pass to the service
             meta: Additional metadata for the call
+            timeout: Seconds the call may take, capped by the time left on this context
 
         Returns:
             Result from the service call
@@ -127,7 +173,9 @@ class Context:
             params = {}
 
         merged_meta = await self._prepare_meta(meta)
-        return await self._broker.call(service_name, params, merged_meta)
+        return await self._broker.call(
+            service_name, params, merged_meta, timeout=timeout, parent_ctx=self
+        )
 
     async def emit(
         self,
@@ -1,14 +1,51 @@
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    from .retry import RetryPolicy
 
 
 def action(
-    name: Optional[str] = None, params: Optional[Dict[str, Any]] = None
+    name: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    strategy: Optional[str] = None,
+    strategy_options: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    retry: Optional[Union["RetryPolicy", Dict[str, Any]]] = None,
+    bulkhead: Optional[Union[bool, Dict[str, int]]] = None,
+    rate_limit: Optional[Union[bool, Dict[str, Any]]] = None,
+    cache: Optional[Union[bool, Dict[str, Any]]] = None,
+    coalesce: Optional[Union[bool, Dict[str, Any]]] = None,
+    hedge: Optional[Union[bool, Dict[str, Any]]] = None,
+    batch: Optional[Union[bool, Dict[str, Any]]] = None,
+    executor: Optional[str] = None,
 ) -> Callable[[Callable], Callable]:
     """Decorator to mark a method as a service action.
 
     Args:
         name: Optional custom name for the action. Defaults to function name.
         params: Optional parameter schema for validation.
+        strategy: Optional load balancing strategy overriding the broker default.
+        strategy_options: Optional options for the load balancing strategy.
+        timeout: Optional default timeout of calls to the action, in seconds.
+        retry: Optional retry policy, or RetryPolicy keyword arguments, overriding
+            the broker's retry policy.
+        bulkhead: Optional ``concurrency`` and ``max_queue_size`` of the action's
+            bulkhead, overriding the broker default. False disables the default.
+        rate_limit: Optional ``rate``, ``burst``, ``scope`` and ``key`` of the action's
+            rate limiter, overriding the broker default. False disables the default.
+        cache: Optional ``keys`` and ``ttl`` of the action's cached results, or True
+            to cache them by every param. Results are cached when the broker has a cacher.
+        coalesce: Optional ``keys`` of concurrent calls sharing one execution, or True
+            to share it between calls with the same params.
+        hedge: Optional HedgePolicy keyword arguments, or True for the default policy,
+            sending slow calls again to another node. Only for read-only actions.
+        batch: Optional ``max_size`` and ``max_wait`` of the batches of calls, or True
+            for the defaults. The method then receives a list of contexts and returns
+            one result per context.
+        executor: Optional ``"thread"`` or ``"process"`` pool of the broker running
+            the method, which may then be a plain ``def``. In a process, the method
+            receives a copy of the context without the broker, and its params and
+            result must be picklable.
 
     Returns:
         Decorator function that marks the method as an action.
@@ -18,6 +55,17 @@ def action(
         func._is_action = True
         func._name = name if name is not None else func.__name__
         func._params = params
+        func._strategy = strategy
+        func._strategy_options = strategy_options
+        func._timeout = timeout
+        func._retry = retry
+        func._bulkhead = bulkhead
+        func._rate_limit = rate_limit
+        func._cache = cache
+        func._coalesce = coalesce
+        func._hedge = hedge
+        func._batch = batch
+        func._executor = executor
         return func
 
     return decorator
@@ -1,11 +1,13 @@
 """Service discovery mechanism for the Pylecular framework.
 
 This module provides the Discoverer class which handles periodic heartbeat
-broadcasting to maintain cluster topology awareness.
+broadcasting and expires nodes whose heartbeats stopped, to maintain cluster
+topology awareness.
 """
 
 import asyncio
-from typing import TYPE_CHECKING, List
+import random
+from typing import TYPE_CHECKING, List, Optional
 
 if TYPE_CHECKING:
     from .broker import ServiceBroker
@@ -16,44 +18,86 @@ class Discoverer:
     """Handles service discovery and cluster topology maintenance.
 
     The Discoverer manages periodic heartbeat broadcasts to announce
-    node presence and maintain awareness of the cluster topology.
+    node presence and maintain awareness of the cluster topology. Remote
+    nodes that send nothing for ``heartbeat_timeout`` seconds are marked
+    unavailable and their endpoints are removed.
     """
 
     HEARTBEAT_INTERVAL = 5.0  # seconds
-
-    def __init__(self, broker: "ServiceBroker") -> None:
+    HEARTBEAT_TIMEOUT = 15.0  # seconds
+    HEARTBEAT_JITTER = 0.1  # fraction of the interval
+
+    def __init__(
+        self,
+        broker: "ServiceBroker",
+        heartbeat_interval: Optional[float] = None,
+        heartbeat_timeout: Optional[float] = None,
+        heartbeat_jitter: Optional[float] = None,
+    ) -> None:
         """Initialize the discoverer.
 
         Args:
             broker: Service broker instance
+            heartbeat_interval: Seconds between heartbeats, HEARTBEAT_INTERVAL if omitted
+            heartbeat_timeout: Seconds without packets before a node is expired,
+                HEARTBEAT_TIMEOUT if omitted
+            heartbeat_jitter: Fraction of the interval randomly added or removed from
+                each wait, HEARTBEAT_JITTER if omitted
         """
         self.broker = broker
         self.transit: Transit = broker.transit
+        self.heartbeat_interval = (
+            heartbeat_interval if heartbeat_interval is not None else self.HEARTBEAT_INTERVAL
+        )
+        self.heartbeat_timeout = (
+            heartbeat_timeout if heartbeat_timeout is not None else self.HEARTBEAT_TIMEOUT
+        )
+        self.heartbeat_jitter = (
+            heartbeat_jitter if heartbeat_jitter is not None else self.HEARTBEAT_JITTER
+        )
         self._tasks: List[asyncio.Task] = []
         self._setup_timers()
 
+    def _next_beat_delay(self) -> float:
+        """Get the wait before the next heartbeat, with jitter applied."""
+        jitter = self.heartbeat_jitter
+        return self.heartbeat_interval * random.uniform(1 - jitter, 1 + jitter)
+
     def _setup_timers(self) -> None:
         """Set up periodic tasks for service discovery."""
 
         async def periodic_beat() -> None:
             """Send periodic heartbeat broadcasts."""
-            try:
-                while True:
-                    await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            while True:
+                await asyncio.sleep(self._next_beat_delay())
+                try:
                     await self.transit.beat()
-            except asyncio.CancelledError:
-                # Task cancellation is expected during shutdown
-                pass
-            except Exception as e:
-                # Log the error but don't stop the heartbeat
-                if hasattr(self.broker, "logger"):
-                    self.broker.logger.error(f"Error in periodic beat: {e}")
+                except Exception as e:
+                    # Log the error but don't stop the heartbeat
+                    if hasattr(self.broker, "logger"):
+                        self.broker.logger.error(f"Error in periodic beat: {e}")
+
+        async def periodic_liveness_check() -> None:
+            """Expire the nodes whose heartbeats stopped."""
+            while True:
+                await asyncio.sleep(self.heartbeat_interval)
+                try:
+                    expired = self.broker.node_catalog.expire_silent_nodes(self.heartbeat_timeout)
+                    for node_id in expired:
+                        self.transit.reject_pending_requests(node_id)
+                except Exception as e:
+                    if hasattr(self.broker, "logger"):
+                        self.broker.logger.error(f"Error checking node heartbeats: {e}")
 
         # Create and track the heartbeat task
         task = asyncio.create_task(periodic_beat())
         task.set_name("discoverer-heartbeat")
         self._tasks.append(task)
 
+        task = asyncio.create_task(periodic_liveness_check())
+        task.set_name("discoverer-liveness")
+        self._tasks.append(task)
+
     async def stop(self) -> None:
         """Stop the discoverer and cancel all running tasks.
 
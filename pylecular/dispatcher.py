@@ -0,0 +1,143 @@
+"""Bounded worker pool for processing incoming packets.
+
+Transporters deliver the messages of a subscription one at a time. The
+WorkerPool lets Transit hand packets over to a fixed number of worker tasks so
+that a slow handler does not hold up the packets queued behind it.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional, Tuple
+
+from .packet import Packet
+
+if TYPE_CHECKING:
+    from .metrics import MetricRegistry
+
+
+class WorkerPool:
+    """Queue of packets processed by a bounded number of worker tasks.
+
+    Workers are started on the first submitted packet. When the queue is full
+    ``submit`` waits for a free slot, pushing back on the transporter instead
+    of buffering without limit.
+
+    A pool can give way to a higher priority pool: its workers do not pick up
+    a new packet while the other pool has packets waiting.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Packet], Awaitable[None]],
+        concurrency: int = 100,
+        queue_size: int = 1000,
+        logger: Any = None,
+        name: str = "transit",
+        metrics: Optional["MetricRegistry"] = None,
+        priority_pool: Optional["WorkerPool"] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            handler: Coroutine function processing one packet
+            concurrency: Number of packets processed at the same time
+            queue_size: Number of packets waiting for a worker before submit blocks
+            logger: Logger instance
+            name: Name of the pool, used for the worker tasks and the ``lane`` metric label
+            metrics: Metric registry receiving the queue depth, active count and
+                queue latency of the pool
+            priority_pool: Pool whose waiting packets are picked up before this pool's
+        """
+        if concurrency < 1:
+            raise ValueError("Worker pool concurrency must be at least 1")
+
+        self.handler = handler
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.logger = logger
+        self.name = name
+        self.metrics = metrics
+        self.priority_pool = priority_pool
+        self.active = 0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        if metrics is not None:
+            labels = {"lane": name}
+            metrics.register_gauge("transit.queue.depth", lambda: self.queue_depth, labels)
+            metrics.register_gauge("transit.active", lambda: self.active, labels)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of packets waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _start(self) -> asyncio.Queue:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._work(self._queue), name=f"{self.name}-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        return self._queue
+
+    async def submit(self, packet: Packet) -> None:
+        """Queue a packet for processing.
+
+        Args:
+            packet: Packet to process
+        """
+        queue = self._queue if self._queue is not None else self._start()
+        await queue.put((asyncio.get_running_loop().time(), packet))
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        latency_labels = {"lane": self.name}
+        while True:
+            # Give way once to a higher priority lane that has packets waiting
+            if self.priority_pool is not None and self.priority_pool.queue_depth:
+                await asyncio.sleep(0)
+
+            item: Tuple[float, Packet] = await queue.get()
+            queued_at, packet = item
+            if self.metrics is not None:
+                self.metrics.observe(
+                    "transit.queue.latency", loop.time() - queued_at, latency_labels
+                )
+            self.active += 1
+            try:
+                await self.handler(packet)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Error processing {packet.type.value} packet: {e}")
+            finally:
+                self.active -= 1
+                queue.task_done()
+
+    async def join(self) -> None:
+        """Wait until every queued packet has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers, giving queued packets up to ``timeout`` seconds to finish.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if self._queue is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.warning(
+                    f"Stopping {self.name} workers with {self.queue_depth} queued packets"
+                )
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self.active = 0
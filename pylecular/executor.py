@@ -0,0 +1,213 @@
+"""Thread and process pools running local action handlers in the Pylecular framework.
+
+An action declared with ``@action(executor="thread")`` runs in a thread pool,
+which suits plain ``def`` handlers doing blocking I/O. One declared with
+``@action(executor="process")`` runs in a process pool, so that CPU-bound work
+such as model inference does not hold the event loop or the GIL.
+
+A process worker receives a copy of the call's context holding only its id,
+action, params and meta, and the service the action belongs to, copied once
+when the worker starts. Params, results and the service must therefore be
+picklable, and the handler cannot make calls through ``ctx.call`` or
+``ctx.emit``. Workers are started with the ``forkserver`` method, or ``spawn``
+where it is not available, rather than forked from the broker's process,
+which already runs other threads.
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+import multiprocessing
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .context import Context
+from .metrics import MetricRegistry
+from .service import Service
+
+THREAD = "thread"
+PROCESS = "process"
+
+EXECUTORS = (THREAD, PROCESS)
+
+# Forking a process running threads, such as the thread pools, may deadlock the child
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Services of the process-mode actions, set in each process worker when it starts
+_services: Dict[str, Service] = {}
+
+
+def _init_worker(services: Dict[str, Service]) -> None:
+    _services.update(services)
+
+
+def _run_handler(handler: Callable[[Any], Any], arg: Any) -> Any:
+    result = handler(arg)
+    # A coroutine handler runs on an event loop of the worker's own
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+def _run_service_handler(service: str, method: str, arg: Any) -> Any:
+    return _run_handler(getattr(_services[service], method), arg)
+
+
+def _timed(function: Callable[..., Any], *args: Any) -> Tuple[float, bool, Any]:
+    # Wall clock time, so that it compares with the submit time of another process
+    started = time.time()
+    try:
+        return started, True, function(*args)
+    except Exception as error:
+        return started, False, error
+
+
+def _detach(arg: Any) -> Any:
+    # Copy of a context, or list of contexts when batched, that can be pickled
+    if isinstance(arg, list):
+        return [_detach(ctx) for ctx in arg]
+    return Context(
+        id=arg.id,
+        action=arg.action,
+        parent_id=arg.parent_id,
+        params=arg.params,
+        meta=arg.meta,
+        deadline=arg.deadline,
+    )
+
+
+class ActionExecutor:
+    """Pool running the handlers of the local actions declared with one executor.
+
+    The pool is created on the first call, and the wait of each call for a
+    worker is observed in the ``executor.wait_time`` histogram.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        max_workers: Optional[int] = None,
+        metrics: Optional[MetricRegistry] = None,
+    ) -> None:
+        """Initialize the executor.
+
+        Args:
+            kind: ``"thread"`` or ``"process"``
+            max_workers: Size of the pool. Defaults to the number of CPUs, plus
+                4 and up to 32 for a thread pool as in ``ThreadPoolExecutor``
+            metrics: Metric registry observing the wait times
+        """
+        if kind not in EXECUTORS:
+            raise ValueError(f"Executor must be one of {', '.join(EXECUTORS)}")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("Executor max_workers must be at least 1")
+
+        cpus = os.cpu_count() or 1
+        if max_workers is None:
+            max_workers = min(32, cpus + 4) if kind == THREAD else cpus
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.metrics = metrics
+        self.in_flight = 0
+        self._pool: Optional[concurrent.futures.Executor] = None
+        # Services of the process-mode actions, by name
+        self._services: Dict[str, Service] = {}
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting for a worker of the pool."""
+        return max(0, self.in_flight - self.max_workers)
+
+    def _get_pool(self) -> concurrent.futures.Executor:
+        if self._pool is None:
+            if self.kind == THREAD:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="pylecular-action"
+                )
+            else:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=multiprocessing.get_context(START_METHOD),
+                    initializer=_init_worker,
+                    initargs=(dict(self._services),),
+                )
+        return self._pool
+
+    def wrap(self, handler: Callable[[Any], Any]) -> Callable[[Any], Awaitable[Any]]:
+        """Wrap a handler so that it runs in the pool.
+
+        Args:
+            handler: Action handler, a method of a picklable service in process mode
+
+        Returns:
+            Coroutine function running the handler in the pool
+        """
+        if self.kind == THREAD:
+
+            async def thread_handler(ctx: Any) -> Any:
+                return await self._submit(_run_handler, handler, ctx)
+
+            return thread_handler
+
+        service: Service = handler.__self__
+        method = handler.__name__
+        if self._services.get(service.name) is not service:
+            self._services[service.name] = service
+            # Workers already started do not know the service, so a new pool is created
+            self.shutdown(wait=False)
+
+        async def process_handler(ctx: Any) -> Any:
+            return await self._submit(_run_service_handler, service.name, method, _detach(ctx))
+
+        return process_handler
+
+    async def _submit(self, function: Callable[..., Any], *args: Any) -> Any:
+        submitted = time.time()
+        self.in_flight += 1
+        try:
+            started, ok, result = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), _timed, function, *args
+            )
+        finally:
+            self.in_flight -= 1
+
+        if self.metrics is not None:
+            self.metrics.observe(
+                "executor.wait_time", max(0.0, started - submitted), labels={"executor": self.kind}
+            )
+        if not ok:
+            raise result
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut the pool down. A later call creates a new one.
+
+        Args:
+            wait: Whether to wait for the calls submitted to the pool
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+def to_coroutine_function(handler: Callable[[Any], Any]) -> Callable[[Any], Awaitable[Any]]:
+    """Wrap a plain ``def`` handler so that it can be awaited like the others.
+
+    The handler still runs on the event loop, so it should be quick.
+
+    Args:
+        handler: Handler returning its result, or an awaitable of it
+
+    Returns:
+        Coroutine function calling the handler
+    """
+
+    async def sync_handler(ctx: Any) -> Any:
+        result = handler(ctx)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    return sync_handler
@@ -0,0 +1,188 @@
+"""Hedged requests to remote actions in the Pylecular framework.
+
+A call to an action declared with ``@action(hedge=...)`` that has not been
+answered after a delay is sent again to another node hosting the action. The
+first successful response is used and the other request is cancelled, which
+cuts the latency tail caused by a slow node at the cost of some duplicate work.
+
+The delay is fixed or follows a percentile of the action's recent latency,
+and each action's hedges are capped at a fraction of its calls.
+"""
+
+import asyncio
+import copy
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Set, Union
+
+from .metrics import MetricRegistry
+
+if TYPE_CHECKING:
+    from .context import Context
+    from .registry import Action
+
+HedgeOptions = Dict[str, Any]
+
+
+class HedgePolicy:
+    """When the calls of an action are hedged.
+
+    The hedge is sent after ``delay`` seconds or, when no delay is set, after
+    the ``percentile`` of the action's latency once ``min_samples`` calls were
+    observed. Every call earns ``budget`` of a hedge, up to ``max_tokens``
+    saved, and each hedge spends one, so hedges stay under ``budget`` of calls.
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 95,
+        min_samples: int = 20,
+        budget: float = 0.1,
+        max_tokens: float = 10,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            delay: Seconds before hedging, or None to follow the observed latency
+            percentile: Latency percentile used as the delay, between 0 and 100
+            min_samples: Calls observed before the latency is used as the delay
+            budget: Fraction of calls that may be hedged, between 0 and 1
+            max_tokens: Hedges saved up while calls are fast, allowing bursts
+        """
+        if percentile <= 0:
+            raise ValueError("Hedge percentile must be positive")
+        if not 0 <= budget <= 1:
+            raise ValueError("Hedge budget must be between 0 and 1")
+
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget = budget
+        self.max_tokens = max_tokens
+
+    @classmethod
+    def from_options(cls, options: Union[bool, HedgeOptions]) -> "HedgePolicy":
+        """Build the policy declared with ``@action(hedge=...)``.
+
+        Args:
+            options: True for the default policy, or keyword arguments of the constructor
+
+        Returns:
+            The policy
+        """
+        return cls(**options) if isinstance(options, dict) else cls()
+
+
+class _HedgeState:
+    """Policy, latency and hedge tokens of one action."""
+
+    __slots__ = ("delay", "observed", "policy", "tokens")
+
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self.delay = policy.delay
+        self.tokens = 0.0
+        self.observed = 0
+
+
+class Hedger:
+    """Sends the hedges of the calls made by a broker."""
+
+    # Observed calls between two computations of an action's latency percentile
+    REFRESH_INTERVAL = 16
+
+    def __init__(self, metrics: MetricRegistry) -> None:
+        """Initialize the hedger.
+
+        Args:
+            metrics: Metric registry recording latencies and hedges
+        """
+        self.metrics = metrics
+        self._states: Dict[str, _HedgeState] = {}
+
+    def _state(self, endpoint: "Action") -> _HedgeState:
+        state = self._states.get(endpoint.name)
+        if state is None:
+            state = self._states[endpoint.name] = _HedgeState(
+                HedgePolicy.from_options(endpoint.hedge)
+            )
+        return state
+
+    async def call(
+        self,
+        endpoint: "Action",
+        context: "Context",
+        call: Callable[["Action", "Context"], Awaitable[Any]],
+        select: Callable[["Action"], Optional["Action"]],
+    ) -> Any:
+        """Call an endpoint, sending a hedge to another one if it is slow to answer.
+
+        Args:
+            endpoint: Endpoint the call is sent to first
+            context: Context of the call
+            call: Coroutine function calling an endpoint with a context
+            select: Function selecting the endpoint of the hedge, given the first one
+
+        Returns:
+            Result of the first successful request
+        """
+        labels = {"action": endpoint.name}
+        state = self._state(endpoint)
+        policy = state.policy
+        state.tokens = min(policy.max_tokens, state.tokens + policy.budget)
+        start = time.monotonic()
+
+        primary = asyncio.ensure_future(call(endpoint, context))
+        tasks: Set[asyncio.Future] = {primary}
+        try:
+            if state.delay is not None:
+                await asyncio.wait(tasks, timeout=state.delay)
+            if not primary.done() and state.delay is not None and state.tokens >= 1:
+                second = select(endpoint)
+                if second is not None and second.node_id != endpoint.node_id:
+                    state.tokens -= 1
+                    self.metrics.increment("broker.call.hedged", labels=labels)
+                    # A request of its own, so the response finds its pending future
+                    hedge_context = copy.copy(context)
+                    hedge_context.id = str(uuid.uuid4())
+                    tasks.add(asyncio.ensure_future(call(second, hedge_context)))
+
+            winner = await self._first_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        error = winner.exception()
+        if error is not None:
+            raise error
+        if winner is not primary:
+            self.metrics.increment("broker.call.hedge_won", labels=labels)
+        self._observe(state, endpoint.name, time.monotonic() - start)
+        return winner.result()
+
+    @staticmethod
+    async def _first_success(tasks: Set[asyncio.Future]) -> asyncio.Future:
+        # The first request to succeed, or the first to fail when they all fail
+        pending = set(tasks)
+        failed = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task
+                failed = failed or task
+        return failed
+
+    def _observe(self, state: _HedgeState, action: str, latency: float) -> None:
+        labels = {"action": action}
+        self.metrics.observe("broker.call.latency", latency, labels=labels)
+        if state.policy.delay is not None:
+            return
+
+        state.observed += 1
+        if state.observed % self.REFRESH_INTERVAL == 0:
+            histogram = self.metrics.get("broker.call.latency", labels)
+            if histogram.count >= state.policy.min_samples:
+                state.delay = histogram.percentile(state.policy.percentile)
@@ -4,6 +4,7 @@ This module provides lifecycle management capabilities for request contexts,
 including creation, rebuilding, and cleanup of execution contexts.
 """
 
+import time
 import uuid
 from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 
@@ -37,9 +38,13 @@ class Lifecycle:
         params: Optional[Dict[str, Any]] = None,
         meta: Optional[Dict[str, Any]] = None,
         stream: bool = False,
+        parent: Optional[Context] = None,
     ) -> Context:
         """Create a new execution context.
 
+        A context created for a nested call takes the parent's ID as its parent
+        ID and inherits the parent's deadline.
+
         Args:
             context_id: Unique identifier for the context. If None, a UUID will be generated
             event: Name of the event being handled
@@ -48,12 +53,15 @@ class Lifecycle:
             params: Parameters for the action/event
             meta: Metadata associated with the request
             stream: Whether this is a streaming context
+            parent: Context of the call this context is created for
 
         Returns:
             New Context instance
         """
         if context_id is None:
             context_id = uuid.uuid4()
+        if parent is not None and parent_id is None:
+            parent_id = parent.id
 
         return Context(
             id=str(context_id),
@@ -64,27 +72,43 @@ class Lifecycle:
             meta=meta,
             stream=stream,
             broker=self.broker,
+            deadline=parent.deadline if parent is not None else None,
         )
 
-    def rebuild_context(self, context_dict: Dict[str, Any]) -> Context:
+    def rebuild_context(
+        self, context_dict: Dict[str, Any], received_at: Optional[float] = None
+    ) -> Context:
         """Rebuild a context from a dictionary representation.
 
         This is typically used when reconstructing contexts from serialized
         data received over the network.
 
+        The ``timeout`` field holds the milliseconds the caller had left when the
+        request was sent, and is turned back into a local deadline.
+
         Args:
             context_dict: Dictionary containing context data
+            received_at: ``time.monotonic()`` time the data was received at.
+                Defaults to now
 
         Returns:
             Reconstructed Context instance
         """
+        deadline = None
+        timeout = context_dict.get("timeout")
+        if timeout:
+            if received_at is None:
+                received_at = time.monotonic()
+            deadline = received_at + timeout / 1000
+
         return Context(
             id=str(context_dict.get("id", uuid.uuid4())),
             action=context_dict.get("action"),
             event=context_dict.get("event"),
-            parent_id=context_dict.get("parent_id"),
+            parent_id=context_dict.get("parentID", context_dict.get("parent_id")),
             params=context_dict.get("params"),
             meta=context_dict.get("meta"),
             stream=context_dict.get("stream", False),
             broker=self.broker,
+            deadline=deadline,
         )
@@ -0,0 +1,189 @@
+"""In-process metrics for the Pylecular framework.
+
+This module provides a small metric registry holding counters, gauges and
+histograms. Components record their measurements on the broker's registry and
+``snapshot`` reports them all, keyed by metric name and labels.
+"""
+
+import math
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+MetricKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+def _key(name: str, labels: Optional[Dict[str, Any]]) -> MetricKey:
+    return (name, tuple(sorted(labels.items())) if labels else ())
+
+
+def _format_key(key: MetricKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+class Histogram:
+    """Distribution of observed values.
+
+    Count, sum, min and max cover every observation. Percentiles are computed
+    over the most recent ``window`` observations.
+    """
+
+    def __init__(self, window: int = 1024) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            window: Number of recent observations kept for percentiles
+        """
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        """Record a value.
+
+        Args:
+            value: The observed value
+        """
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self._recent.append(value)
+
+    @property
+    def mean(self) -> float:
+        """Mean of all observed values, 0 when empty."""
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Get a percentile of the recent observations.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            The nearest-rank percentile, or None when nothing was observed
+        """
+        if not self._recent:
+            return None
+        values = sorted(self._recent)
+        index = max(0, math.ceil(q / 100 * len(values)) - 1)
+        return values[min(index, len(values) - 1)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize the histogram."""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class MetricRegistry:
+    """Registry of counters, gauges and histograms identified by name and labels.
+
+    Gauges are either set explicitly or read from a callback registered with
+    ``register_gauge`` when the metrics are collected.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        self._collectors: Dict[MetricKey, Callable[[], float]] = {}
+        self._histograms: Dict[MetricKey, Histogram] = {}
+
+    def increment(
+        self, name: str, value: float = 1, labels: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Increment a counter.
+
+        Args:
+            name: Metric name
+            value: Amount to add
+            labels: Labels identifying the series
+        """
+        key = _key(name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Set a gauge.
+
+        Args:
+            name: Metric name
+            value: Current value
+            labels: Labels identifying the series
+        """
+        self._gauges[_key(name, labels)] = value
+
+    def register_gauge(
+        self, name: str, supplier: Callable[[], float], labels: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Register a gauge whose value is read from a callback when collected.
+
+        Args:
+            name: Metric name
+            supplier: Callback returning the current value
+            labels: Labels identifying the series
+        """
+        self._collectors[_key(name, labels)] = supplier
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Record a value in a histogram.
+
+        Args:
+            name: Metric name
+            value: Observed value
+            labels: Labels identifying the series
+        """
+        key = _key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def get(self, name: str, labels: Optional[Dict[str, Any]] = None) -> Any:
+        """Get the current value of a metric.
+
+        Args:
+            name: Metric name
+            labels: Labels identifying the series
+
+        Returns:
+            The counter or gauge value, the Histogram, or None if unknown
+        """
+        key = _key(name, labels)
+        if key in self._counters:
+            return self._counters[key]
+        if key in self._collectors:
+            return self._collectors[key]()
+        if key in self._gauges:
+            return self._gauges[key]
+        return self._histograms.get(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Collect every metric.
+
+        Returns:
+            Mapping of ``name{label="value"}`` to counter and gauge values, and
+            to summary dicts for histograms
+        """
+        result: Dict[str, Any] = {}
+        for key, value in self._counters.items():
+            result[_format_key(key)] = value
+        for key, value in self._gauges.items():
+            result[_format_key(key)] = value
+        for key, supplier in self._collectors.items():
+            result[_format_key(key)] = supplier()
+        for key, histogram in self._histograms.items():
+            result[_format_key(key)] = histogram.to_dict()
+        return result
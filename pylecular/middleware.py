@@ -6,9 +6,12 @@ modifying behavior at various stages of the Pylecular lifecycle. Middleware can
 for logging, authentication, request/response transformation, error handling, and more.
 
 Each middleware method provides a specific hook point in the broker or service lifecycle.
+The MiddlewareHandler compiles the wrapping hooks into a handler chain once per endpoint
+and caches it on the endpoint until the middleware list changes.
 """
 
-from typing import Any, Awaitable, Callable, TypeVar
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, TypeVar
 
 # Define type variables for better type annotations
 T = TypeVar("T")
@@ -143,3 +146,171 @@ class Middleware:
             service: The service instance
         """
         pass
+
+
+class MiddlewareList(list):
+    """
+    List of middlewares calling back whenever it is modified in place.
+    """
+
+    def __init__(self, middlewares: Any = (), on_change: Optional[Callable[[], None]] = None):
+        """
+        Initialize the list.
+
+        Args:
+            middlewares: Initial middlewares
+            on_change: Called after every modification of the list
+        """
+        super().__init__(middlewares)
+        self._on_change = on_change
+
+    def _changed(self) -> None:
+        if self._on_change is not None:
+            self._on_change()
+
+    def append(self, middleware: Any) -> None:
+        super().append(middleware)
+        self._changed()
+
+    def extend(self, middlewares: Any) -> None:
+        super().extend(middlewares)
+        self._changed()
+
+    def insert(self, index: Any, middleware: Any) -> None:
+        super().insert(index, middleware)
+        self._changed()
+
+    def remove(self, middleware: Any) -> None:
+        super().remove(middleware)
+        self._changed()
+
+    def pop(self, index: Any = -1) -> Any:
+        middleware = super().pop(index)
+        self._changed()
+        return middleware
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, middlewares: Any) -> "MiddlewareList":
+        super().__iadd__(middlewares)
+        self._changed()
+        return self
+
+    def __imul__(self, count: Any) -> "MiddlewareList":
+        super().__imul__(count)
+        self._changed()
+        return self
+
+
+class MiddlewareHandler:
+    """
+    Compiles and caches wrapping-hook chains for action and event endpoints.
+
+    Chains are stored on the endpoint together with the handler version they were
+    built for. Replacing, adding or otherwise modifying the middlewares bumps the
+    version, so every endpoint recompiles its chain on next use.
+    """
+
+    WRAPPING_HOOKS = ("local_action", "remote_action", "local_event")
+
+    def __init__(self, middlewares: Optional[List[Middleware]] = None) -> None:
+        """
+        Initialize the handler.
+
+        Args:
+            middlewares: Middlewares to apply, the first one being the outermost wrapper
+        """
+        self.version = 0
+        self._middlewares = MiddlewareList(middlewares or [], on_change=self._invalidate)
+
+    def _invalidate(self) -> None:
+        self.version += 1
+
+    @property
+    def middlewares(self) -> List[Middleware]:
+        """The registered middlewares, a copy of the list given to the handler.
+
+        Modifying the list in place invalidates every compiled chain.
+        """
+        return self._middlewares
+
+    @middlewares.setter
+    def middlewares(self, middlewares: List[Middleware]) -> None:
+        self._middlewares = MiddlewareList(middlewares, on_change=self._invalidate)
+        self._invalidate()
+
+    def add(self, middleware: Middleware) -> None:
+        """
+        Append a middleware, invalidating every compiled chain.
+
+        Args:
+            middleware: Middleware instance to add
+        """
+        self._middlewares.append(middleware)
+
+    def cached(self, endpoint: Any) -> Optional[HandlerType]:
+        """
+        Get the chain compiled for an endpoint if it is still current.
+
+        Args:
+            endpoint: Action or event endpoint
+
+        Returns:
+            The compiled handler, or None if it must be (re)compiled
+        """
+        if getattr(endpoint, "chain_version", None) == self.version:
+            return endpoint.chain
+        return None
+
+    async def compile(self, endpoint: Any, hook_name: str, handler: HandlerType) -> HandlerType:
+        """
+        Wrap a handler with every middleware's hook and cache the chain on the endpoint.
+
+        Hooks that a middleware inherits unchanged from Middleware only forward the call,
+        so they are skipped instead of adding a layer to the chain.
+
+        Args:
+            endpoint: Action or event endpoint passed to the hooks
+            hook_name: Wrapping hook to apply (local_action, remote_action or local_event)
+            handler: Innermost handler of the chain
+
+        Returns:
+            The compiled handler
+        """
+        version = self.version
+        current_handler = handler
+
+        # Apply middlewares in reverse order for proper wrapping
+        for middleware in reversed(self._middlewares):
+            hook = getattr(middleware, hook_name, None)
+            if not hook or not callable(hook):
+                continue
+            if getattr(type(middleware), hook_name, None) is getattr(Middleware, hook_name):
+                continue
+            result = hook(current_handler, endpoint)
+            if asyncio.iscoroutine(result):
+                current_handler = await result
+            else:
+                current_handler = result
+
+        endpoint.chain = current_handler
+        endpoint.chain_version = version
+        return current_handler
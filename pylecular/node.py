@@ -5,12 +5,15 @@ nodes in a Pylecular cluster, including their services, actions, and events.
 """
 
 import sys
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from .registry import Registry
 
 from .registry import Action, Event
+from .retry import RetryPolicy
 
 
 class Node:
@@ -86,6 +89,9 @@ class NodeCatalog:
     and maintains the registry of services, actions, and events they provide.
     """
 
+    # Heartbeat timeouts an expired node stays in the catalog before it is removed
+    REMOVE_AFTER_TIMEOUTS = 10
+
     def __init__(self, registry: "Registry", logger: Any, node_id: str) -> None:
         """Initialize a new NodeCatalog.
 
@@ -99,33 +105,138 @@ class NodeCatalog:
         self.logger = logger
         self.node_id = node_id
         self.local_node: Optional[Node] = None
+        # Monotonic time of the last packet received from each remote node
+        self.last_seen: Dict[str, float] = {}
         self.ensure_local_node()
 
     def add_node(self, node_id: str, node: Node) -> None:
-        """Add a node to the catalog.
+        """Add or update a node in the catalog.
+
+        Node info is keyed on the node's ``instanceID`` and ``seq``: re-announcing
+        a known node with both unchanged is a no-op, while a changed ``seq`` replaces
+        only the endpoints that differ from the previously announced service list.
+        A changed ``instanceID`` means the node restarted under the same ID, with a
+        ``seq`` counted from scratch, so all of its endpoints are replaced.
 
         Args:
             node_id: Unique identifier for the node
             node: Node instance to add
         """
+        previous = self.nodes.get(node_id)
+        if node_id != self.node_id:
+            self.mark_seen(node_id)
+
+        if (
+            previous is not None
+            and previous is not node
+            and previous.available
+            and previous.instanceID == node.instanceID
+            and previous.seq == node.seq
+        ):
+            return
+
+        restarted = previous is not None and previous.instanceID != node.instanceID
         self.nodes[node_id] = node
+        if restarted and self.registry and node_id != self.node_id:
+            self.registry.unregister_node(node_id)
+
+        # Local endpoints are owned by Registry.register, only sync remote ones.
+        # An unavailable node had its endpoints evicted, so they are all re-added.
+        if self.registry and node_id != self.node_id:
+            self._update_endpoints(
+                node_id,
+                previous.services if previous and previous.available and not restarted else [],
+                node.services or [],
+            )
+
+        if previous is None:
+            self.logger.info(f'Node "{node_id}" added.')
+        else:
+            self.logger.info(f'Node "{node_id}" updated.')
+
+    def _update_endpoints(
+        self,
+        node_id: str,
+        old_services: List[Dict[str, Any]],
+        new_services: List[Dict[str, Any]],
+    ) -> None:
+        """Swap a remote node's registry endpoints from one service list to another.
 
-        # Register node's services, actions, and events
-        if self.registry and hasattr(node, "services"):
-            for service in node.services:
-                # Register actions from the service
-                actions = service.get("actions", {})
-                for action_name in actions:
-                    action_obj = Action(name=action_name, node_id=node_id, is_local=False)
-                    self.registry.add_action(action_obj)
+        Args:
+            node_id: ID of the remote node
+            old_services: Service definitions previously announced by the node
+            new_services: Service definitions currently announced by the node
+        """
+        old_actions, old_events = self._collect_endpoints(old_services)
+        new_actions, new_events = self._collect_endpoints(new_services)
+
+        removed_actions = old_actions.keys() - new_actions.keys()
+        if removed_actions:
+            for action_obj in self.registry.get_node_actions(node_id):
+                if action_obj.name in removed_actions:
+                    self.registry.remove_action(action_obj)
+
+        removed_events = old_events.keys() - new_events.keys()
+        if removed_events:
+            for event_obj in self.registry.get_node_events(node_id):
+                if (event_obj.name, event_obj.service) in removed_events:
+                    self.registry.remove_event(event_obj)
+
+        for action_name, (service_name, definition) in new_actions.items():
+            if action_name not in old_actions:
+                self.registry.add_action(
+                    Action(
+                        name=action_name,
+                        node_id=node_id,
+                        is_local=False,
+                        service=service_name,
+                        strategy=definition.get("strategy"),
+                        strategy_options=definition.get("strategyOptions"),
+                        timeout=definition["timeout"] / 1000 if definition.get("timeout") else None,
+                        retry_policy=RetryPolicy.from_info(definition["retryPolicy"])
+                        if isinstance(definition.get("retryPolicy"), dict)
+                        else None,
+                        cache=definition.get("cache"),
+                        coalesce=definition.get("coalesce"),
+                        hedge=definition.get("hedge"),
+                    )
+                )
+
+        for event_name, service_name in new_events:
+            if (event_name, service_name) not in old_events:
+                self.registry.add_event_obj(
+                    Event(name=event_name, node_id=node_id, is_local=False, service=service_name)
+                )
+
+    @staticmethod
+    def _collect_endpoints(
+        services: List[Dict[str, Any]],
+    ) -> Tuple[
+        Dict[str, Tuple[Optional[str], Dict[str, Any]]], Dict[Tuple[str, Optional[str]], None]
+    ]:
+        """Extract action and event names from announced service definitions.
 
-                # Register events from the service
-                events = service.get("events", {})
-                for event_name in events:
-                    event_obj = Event(name=event_name, node_id=node_id, is_local=False)
-                    self.registry.add_event_obj(event_obj)
+        Args:
+            services: Service definitions from a node info payload
 
-        self.logger.info(f'Node "{node_id}" added.')
+        Returns:
+            Tuple of action name -> (service name, action definition), and
+            (event name, service name) keys
+        """
+        actions: Dict[str, Tuple[Optional[str], Dict[str, Any]]] = {}
+        events: Dict[Tuple[str, Optional[str]], None] = {}
+        for service in services:
+            if not isinstance(service, dict):
+                continue
+            service_name = service.get("name")
+            for action_name, definition in service.get("actions", {}).items():
+                actions[action_name] = (
+                    service_name,
+                    definition if isinstance(definition, dict) else {},
+                )
+            for event_name in service.get("events", {}):
+                events[(event_name, service_name)] = None
+        return actions, events
 
     def get_node(self, node_id: str) -> Optional[Node]:
         """Get a node by its ID.
@@ -146,6 +257,9 @@ class NodeCatalog:
         """
         if node_id in self.nodes:
             del self.nodes[node_id]
+            self.last_seen.pop(node_id, None)
+            if self.registry and node_id != self.node_id:
+                self.registry.unregister_node(node_id)
             self.logger.info(f'Node "{node_id}" removed.')
 
     def disconnect_node(self, node_id: str) -> None:
@@ -160,6 +274,62 @@ class NodeCatalog:
             self.logger.info(f'Node "{node_id}" is disconnected.')
             self.remove_node(node_id)
 
+    def mark_seen(self, node_id: str) -> None:
+        """Record that a packet was just received from a node.
+
+        Args:
+            node_id: ID of the node
+        """
+        self.last_seen[node_id] = time.monotonic()
+
+    def expire_node(self, node_id: str) -> None:
+        """Mark a node that stopped sending heartbeats as unavailable.
+
+        The node stays in the catalog so a later INFO packet brings it back, but
+        its endpoints are removed from the registry straight away.
+
+        Args:
+            node_id: ID of the silent node
+        """
+        node = self.get_node(node_id)
+        if node is None or not node.available or node_id == self.node_id:
+            return
+        node.available = False
+        if self.registry:
+            self.registry.unregister_node(node_id)
+        self.logger.warning(f'Heartbeat is not received from "{node_id}" node.')
+
+    def expire_silent_nodes(self, timeout: float) -> List[str]:
+        """Expire the remote nodes that sent nothing for longer than ``timeout``.
+
+        Nodes still silent ``REMOVE_AFTER_TIMEOUTS`` times longer are removed from
+        the catalog, so that nodes gone for good, such as workers restarted with
+        new IDs, are not kept forever.
+
+        Args:
+            timeout: Seconds without heartbeat after which a node is expired
+
+        Returns:
+            IDs of the expired nodes
+        """
+        now = time.monotonic()
+        expired = []
+        removed = []
+        for node_id, node in self.nodes.items():
+            if node_id == self.node_id:
+                continue
+            silence = now - self.last_seen.setdefault(node_id, now)
+            if node.available and silence > timeout:
+                expired.append(node_id)
+            elif not node.available and silence > timeout * self.REMOVE_AFTER_TIMEOUTS:
+                removed.append(node_id)
+
+        for node_id in expired:
+            self.expire_node(node_id)
+        for node_id in removed:
+            self.remove_node(node_id)
+        return expired
+
     def process_node_info(self, node_id: str, payload: Dict[str, Any]) -> None:
         """Process node information update.
 
@@ -173,9 +343,13 @@ class NodeCatalog:
             self.add_node(node_id, node)
 
         # Update node information
+        services = payload.get("services", [])
+        if self.registry and node_id != self.node_id:
+            self._update_endpoints(node_id, node.services if node.available else [], services)
+            self.mark_seen(node_id)
         node.available = True
         node.cpu = payload.get("cpu", 0.0)
-        node.services = payload.get("services", [])
+        node.services = services
         self.logger.info(f'Node "{node_id}" is connected.')
 
     def ensure_local_node(self) -> None:
@@ -185,8 +359,12 @@ class NodeCatalog:
             self.local_node = node
             self.add_node(self.node_id, node)
 
-        # Configure local node properties
+        # Configure local node properties, bumping seq so peers pick up the changes.
+        # The instance ID tells peers apart the restarts of a node keeping its ID
         self.local_node.local = True
+        if self.local_node.instanceID is None:
+            self.local_node.instanceID = str(uuid.uuid4())
+        self.local_node.seq += 1
         self.local_node.client = {
             "type": "python",
             "langVersion": sys.version,
@@ -207,10 +385,32 @@ class NodeCatalog:
             # Add actions
             for action in service.actions():
                 action_name = f"{service.name}.{action}"
-                service_definition["actions"][action_name] = {
+                action_definition = {
                     "rawName": action,
                     "name": action_name,
                 }
+                strategy = getattr(getattr(service, action), "_strategy", None)
+                if isinstance(strategy, str):
+                    action_definition["strategy"] = strategy
+                    strategy_options = getattr(getattr(service, action), "_strategy_options", None)
+                    if isinstance(strategy_options, dict):
+                        action_definition["strategyOptions"] = strategy_options
+                timeout = getattr(getattr(service, action), "_timeout", None)
+                if isinstance(timeout, (int, float)) and timeout > 0:
+                    action_definition["timeout"] = round(timeout * 1000)
+                retry = getattr(getattr(service, action), "_retry", None)
+                if isinstance(retry, (RetryPolicy, dict)):
+                    action_definition["retryPolicy"] = RetryPolicy.from_options(retry).to_info()
+                cache = getattr(getattr(service, action), "_cache", None)
+                if cache is True or isinstance(cache, dict):
+                    action_definition["cache"] = cache
+                coalesce = getattr(getattr(service, action), "_coalesce", None)
+                if coalesce is True or isinstance(coalesce, dict):
+                    action_definition["coalesce"] = coalesce
+                hedge = getattr(getattr(service, action), "_hedge", None)
+                if hedge is True or isinstance(hedge, dict):
+                    action_definition["hedge"] = hedge
+                service_definition["actions"][action_name] = action_definition
 
             # Add events
             for event in service.events():
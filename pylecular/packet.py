@@ -12,6 +12,7 @@ class Topic(Enum):
     INFO = "INFO"
     REQUEST = "REQ"
     RESPONSE = "RES"
+    CANCEL = "CANCEL"
 
 
 class Packet:
@@ -22,6 +23,7 @@ class Packet:
         target: The target node or service for the packet
         payload: The data payload of the packet
         sender: The sender node ID (set by transporter)
+        received_at: ``time.monotonic()`` time the packet was received (set by transit)
     """
 
     def __init__(self, topic: Topic, target: str, payload: Any) -> None:
@@ -36,6 +38,7 @@ class Packet:
         self.target = target
         self.payload = payload
         self.sender: Optional[str] = None  # Will be set by transporter
+        self.received_at: Optional[float] = None  # Will be set by transit
 
     @staticmethod
     def from_topic(topic: str) -> Optional[Topic]:
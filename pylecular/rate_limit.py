@@ -0,0 +1,149 @@
+"""Token bucket rate limiting of local actions in the Pylecular framework.
+
+A rate limiter lets calls through at a sustained ``rate`` per second, with up
+to ``burst`` calls at once after a quiet period. Calls are counted in one
+bucket for every action it guards, one bucket per action, or one bucket per
+value of a ``ctx.meta`` key such as a tenant id.
+
+Buckets are kept in least recently used order. A bucket that has been idle
+long enough to refill completely holds no state worth keeping, so a few of
+those are dropped whenever a new bucket is created. Memory thus follows the
+number of keys seen within the refill time, not all keys ever seen.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Union
+
+GLOBAL = "global"
+ACTION = "action"
+KEY = "key"
+
+SCOPES = (GLOBAL, ACTION, KEY)
+
+RateLimitOptions = Dict[str, Any]
+
+
+class RateLimitExceededError(Exception):
+    """Exception raised when a call is over its action's rate limit."""
+
+    def __init__(self, action: str) -> None:
+        super().__init__(f"Rate limit of {action} exceeded")
+        self.action = action
+
+
+class RateLimiter:
+    """Token buckets counting the calls of one or more actions.
+
+    Each bucket holds up to ``burst`` tokens and gains ``rate`` tokens per
+    second. A call takes one token, and is rejected when none is left.
+    """
+
+    # Idle buckets dropped at most when a bucket is created, bounding its cost
+    SWEEP_SIZE = 2
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[int] = None,
+        scope: str = ACTION,
+        key: Optional[str] = None,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Calls per second let through over time
+            burst: Calls let through at once after a quiet period. Defaults to
+                ``rate``, rounded up
+            scope: ``"global"`` for one bucket, ``"action"`` for one per action,
+                or ``"key"`` for one per value of ``ctx.meta[key]``
+            key: Meta key the buckets are looked up by, with the ``"key"`` scope
+        """
+        if rate <= 0:
+            raise ValueError("Rate limit rate must be positive")
+        if scope not in SCOPES:
+            raise ValueError(f"Rate limit scope must be one of {', '.join(SCOPES)}")
+        if scope == KEY and not key:
+            raise ValueError("Rate limit with the key scope needs a meta key")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else math.ceil(rate)
+        if self.burst < 1:
+            raise ValueError("Rate limit burst must be at least 1")
+        self.scope = scope
+        self.key = key
+        # Seconds an empty bucket takes to refill completely
+        self._refill_time = self.burst / rate
+        # Bucket key -> [tokens, time of last update], least recently used first
+        self._buckets: OrderedDict[Any, List[float]] = OrderedDict()
+
+    @classmethod
+    def from_options(
+        cls, options: Optional[Union[bool, "RateLimiter", RateLimitOptions]]
+    ) -> Optional["RateLimiter"]:
+        """Build a limiter from the value given to ``Settings`` or ``@action``.
+
+        Args:
+            options: A limiter, keyword arguments of the constructor, or None or
+                False for no limit
+
+        Returns:
+            The limiter, or None when calls are not limited
+        """
+        if isinstance(options, RateLimiter):
+            return options
+        if not isinstance(options, dict):
+            return None
+        return cls(**options)
+
+    def __len__(self) -> int:
+        """Number of buckets currently kept."""
+        return len(self._buckets)
+
+    def allow(self, action: str, ctx: Any) -> bool:
+        """Take a token for a call.
+
+        Rejections are reported by the return value rather than an exception,
+        so that callers can turn them away cheaply.
+
+        Args:
+            action: Name of the called action
+            ctx: Context of the call
+
+        Returns:
+            True if the call may run, False if it is over the limit
+        """
+        if self.scope == GLOBAL:
+            key = None
+        elif self.scope == ACTION:
+            key = action
+        else:
+            key = (ctx.meta or {}).get(self.key)
+
+        now = time.monotonic()
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            self._expire(now)
+            bucket = buckets[key] = [float(self.burst), now]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            buckets.move_to_end(key)
+
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def _expire(self, now: float) -> None:
+        buckets = self._buckets
+        deadline = now - self._refill_time
+        for _ in range(self.SWEEP_SIZE):
+            if not buckets:
+                return
+            key, bucket = next(iter(buckets.items()))
+            if bucket[1] > deadline:
+                return
+            del buckets[key]
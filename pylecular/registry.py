@@ -2,11 +2,38 @@
 
 This module provides the registry system that tracks services, actions, and events
 within a Pylecular node, enabling service discovery and routing capabilities.
+
+Endpoints are kept in hash indexes keyed by name, node ID and service name so that
+lookups on the call path do not depend on the total number of endpoints known to
+the cluster.
 """
 
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+import inspect
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+from .batch import Batcher
+from .bulkhead import Bulkhead, BulkheadOptions
+from .executor import EXECUTORS, ActionExecutor, to_coroutine_function
+from .rate_limit import RateLimiter, RateLimitOptions
+from .retry import RetryPolicy
+from .strategy import Strategy
+from .validator import SchemaValidator, compile_schema
 
 if TYPE_CHECKING:
+    from .breaker import CircuitBreaker
+    from .broker import ServiceBroker
+    from .context import Context
     from .service import Service
 
 
@@ -24,6 +51,18 @@ class Action:
         is_local: bool,
         handler: Optional[Callable] = None,
         params_schema: Optional[Dict[str, Any]] = None,
+        service: Optional[str] = None,
+        strategy: Optional[str] = None,
+        strategy_options: Optional[Dict[str, Any]] = None,
+        params_validator: Optional[SchemaValidator] = None,
+        timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        bulkhead: Optional[Bulkhead] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        batcher: Optional[Batcher] = None,
+        cache: Optional[Union[bool, Dict[str, Any]]] = None,
+        coalesce: Optional[Union[bool, Dict[str, Any]]] = None,
+        hedge: Optional[Union[bool, Dict[str, Any]]] = None,
     ) -> None:
         """Initialize an Action instance.
 
@@ -33,12 +72,62 @@ class Action:
             is_local: Whether this action is local to the current node
             handler: Callable handler function for the action
             params_schema: Optional parameter validation schema
+            service: Name of the owning service. Derived from the action name if omitted
+            strategy: Load balancing strategy overriding the registry default
+            strategy_options: Options for the action's load balancing strategy
+            params_validator: Validator compiled from params_schema. Compiled on first
+                use if omitted
+            timeout: Default timeout of calls to the action, in seconds
+            retry_policy: Retry policy overriding the broker's for calls to the action
+            bulkhead: Concurrency limit of a local action, already applied to handler
+            rate_limiter: Rate limiter checked before running calls to a local action
+            batcher: Batcher of a local action, already applied to handler
+            cache: Cache ``keys`` and ``ttl`` of the action's results, or True to cache
+                them by every param
+            coalesce: ``keys`` of concurrent calls sharing one execution, or True to
+                share it between calls with the same params
+            hedge: HedgePolicy keyword arguments of slow remote calls sent again to
+                another node, or True for the default policy
         """
         self.name = name
         self.handler = handler
         self.node_id = node_id
         self.is_local = is_local
         self.params_schema = params_schema
+        self.service = service if service is not None else name.rpartition(".")[0] or None
+        self.strategy = strategy
+        self.strategy_options = strategy_options
+        self.params_validator = params_validator
+        self.timeout = timeout
+        self.retry_policy = retry_policy
+        self.bulkhead = bulkhead
+        self.rate_limiter = rate_limiter
+        self.batcher = batcher
+        self.cache = cache
+        self.coalesce = coalesce
+        self.hedge = hedge
+
+        # Circuit breaker of a remote endpoint, created on its first call
+        self.breaker: Optional[CircuitBreaker] = None
+
+        # Middleware chain compiled by MiddlewareHandler and the version it was built for
+        self.chain: Optional[Callable] = None
+        self.chain_version = -1
+
+    def validate(self, params: Dict[str, Any]) -> None:
+        """Validate call parameters against the action's params schema.
+
+        Args:
+            params: Parameters of the call
+
+        Raises:
+            ValidationError: If the parameters do not match the schema
+        """
+        if self.params_validator is None:
+            if not self.params_schema:
+                return
+            self.params_validator = compile_schema(self.params_schema)
+        self.params_validator(params)
 
 
 class Event:
@@ -54,6 +143,7 @@ class Event:
         node_id: str,
         is_local: bool = False,
         handler: Optional[Callable] = None,
+        service: Optional[str] = None,
     ) -> None:
         """Initialize an Event instance.
 
@@ -62,11 +152,60 @@ class Event:
             node_id: ID of the node hosting this event handler
             is_local: Whether this event handler is local to the current node
             handler: Callable handler function for the event
+            service: Name of the service owning this handler, if known
         """
         self.name = name
         self.node_id = node_id
         self.handler = handler
         self.is_local = is_local
+        self.service = service
+
+        # Middleware chain compiled by MiddlewareHandler and the version it was built for
+        self.chain: Optional[Callable] = None
+        self.chain_version = -1
+
+
+EndpointT = TypeVar("EndpointT", Action, Event)
+
+
+class EndpointIndex(Dict[str, List[EndpointT]]):
+    """Mapping of a key to the list of endpoints registered under it.
+
+    Empty buckets are dropped on removal so the index never retains keys for
+    endpoints that are gone.
+    """
+
+    def add(self, key: Optional[str], endpoint: EndpointT) -> None:
+        """Append an endpoint to the bucket for ``key``.
+
+        Args:
+            key: Index key. Endpoints without a key are not indexed
+            endpoint: Endpoint to add
+        """
+        if key is None:
+            return
+        bucket = self.get(key)
+        if bucket is None:
+            self[key] = [endpoint]
+        else:
+            bucket.append(endpoint)
+
+    def discard(self, key: Optional[str], endpoint: EndpointT) -> None:
+        """Remove an endpoint from the bucket for ``key`` if present.
+
+        Args:
+            key: Index key
+            endpoint: Endpoint to remove
+        """
+        bucket = self.get(key) if key is not None else None
+        if not bucket:
+            return
+        try:
+            bucket.remove(endpoint)
+        except ValueError:
+            return
+        if not bucket:
+            del self[key]
 
 
 class Registry:
@@ -76,18 +215,73 @@ class Registry:
     within the Pylecular cluster, enabling service discovery and routing.
     """
 
-    def __init__(self, node_id: Optional[str] = None, logger: Optional[Any] = None) -> None:
+    def __init__(
+        self,
+        node_id: Optional[str] = None,
+        logger: Optional[Any] = None,
+        strategy: Union[str, type[Strategy]] = "RoundRobin",
+        strategy_options: Optional[Dict[str, Any]] = None,
+        prefer_local: bool = True,
+        broker: Optional["ServiceBroker"] = None,
+        bulkhead: Optional[BulkheadOptions] = None,
+        rate_limit: Optional[Union[RateLimiter, RateLimitOptions]] = None,
+        executors: Optional[Dict[str, ActionExecutor]] = None,
+    ) -> None:
         """Initialize a new Registry instance.
 
         Args:
             node_id: Unique identifier for this node
             logger: Logger instance for registry operations
+            strategy: Default load balancing strategy name or class for actions
+            strategy_options: Options passed to the default strategy
+            prefer_local: Whether a local endpoint is always chosen when one exists
+            broker: Service broker handed to strategies that need node information
+            bulkhead: Default bulkhead options of local actions
+            rate_limit: Rate limiter shared by local actions that do not set their own
+            executors: Thread and process pools running the actions declared with an
+                executor, by kind. Pools of the default size are used if omitted
         """
         self.__services__: Dict[str, Service] = {}
-        self.__actions__: List[Action] = []
-        self.__events__: List[Event] = []
         self.__node_id__ = node_id
         self.__logger__ = logger
+        self.strategy = strategy
+        self.strategy_options = strategy_options
+        self.prefer_local = prefer_local
+        self.broker = broker
+        self.bulkhead = bulkhead
+        self.rate_limiter = RateLimiter.from_options(rate_limit)
+        self.executors = (
+            executors
+            if executors is not None
+            else {kind: ActionExecutor(kind) for kind in EXECUTORS}
+        )
+
+        # Strategy instances per action name, created on first selection
+        self._strategies: Dict[str, Strategy] = {}
+
+        # Endpoints whose circuit breaker is open or half-open
+        self.open_circuits: Set[Action] = set()
+
+        # Action indexes: name, hosting node and owning service -> endpoints
+        self._actions_by_name: EndpointIndex[Action] = EndpointIndex()
+        self._actions_by_node: EndpointIndex[Action] = EndpointIndex()
+        self._actions_by_service: EndpointIndex[Action] = EndpointIndex()
+        self._local_actions_by_name: EndpointIndex[Action] = EndpointIndex()
+
+        # Event indexes: name, hosting node and owning service -> endpoints
+        self._events_by_name: EndpointIndex[Event] = EndpointIndex()
+        self._events_by_node: EndpointIndex[Event] = EndpointIndex()
+        self._events_by_service: EndpointIndex[Event] = EndpointIndex()
+
+    @property
+    def __actions__(self) -> List[Action]:
+        """All registered actions, grouped by name in registration order."""
+        return [action for bucket in self._actions_by_name.values() for action in bucket]
+
+    @property
+    def __events__(self) -> List[Event]:
+        """All registered events, grouped by name in registration order."""
+        return [event for bucket in self._events_by_name.values() for event in bucket]
 
     def register(self, service: "Service") -> None:
         """Register a service and its actions/events in the registry.
@@ -97,18 +291,61 @@ class Registry:
         """
         self.__services__[service.name] = service
 
-        # Register service actions
-        service_actions = [
-            Action(
-                name=f"{service.name}.{getattr(getattr(service, action), '_name', action)}",
-                node_id=self.__node_id__,
-                is_local=True,
-                handler=getattr(service, action),
-                params_schema=getattr(getattr(service, action), "_params", None),
+        # Register service actions, compiling their params schemas once
+        for action in service.actions():
+            handler = getattr(service, action)
+            name = f"{service.name}.{getattr(handler, '_name', action)}"
+            params_schema = getattr(handler, "_params", None)
+            retry = getattr(handler, "_retry", None)
+            bulkhead_options = getattr(handler, "_bulkhead", None)
+            bulkhead = Bulkhead.from_options(
+                name, self.bulkhead if bulkhead_options is None else bulkhead_options
+            )
+            rate_limit = getattr(handler, "_rate_limit", None)
+            cache = getattr(handler, "_cache", None)
+            coalesce = getattr(handler, "_coalesce", None)
+            hedge = getattr(handler, "_hedge", None)
+            rate_limiter = (
+                self.rate_limiter if rate_limit is None else RateLimiter.from_options(rate_limit)
+            )
+            batcher = Batcher.from_options(name, getattr(handler, "_batch", None))
+            executor = getattr(handler, "_executor", None)
+
+            # The bulkhead limits concurrent batches when the action is batched
+            call_handler = handler
+            if isinstance(executor, str):
+                if executor not in self.executors:
+                    raise ValueError(f"Unknown executor {executor} of action {name}")
+                call_handler = self.executors[executor].wrap(call_handler)
+            elif inspect.ismethod(handler) and not inspect.iscoroutinefunction(handler):
+                call_handler = to_coroutine_function(call_handler)
+            if bulkhead is not None:
+                call_handler = bulkhead.wrap(call_handler)
+            if batcher is not None:
+                call_handler = batcher.wrap(call_handler)
+            self.add_action(
+                Action(
+                    name=name,
+                    node_id=self.__node_id__,
+                    is_local=True,
+                    handler=call_handler,
+                    params_schema=params_schema,
+                    service=service.name,
+                    strategy=getattr(handler, "_strategy", None),
+                    strategy_options=getattr(handler, "_strategy_options", None),
+                    params_validator=compile_schema(params_schema) if params_schema else None,
+                    timeout=getattr(handler, "_timeout", None),
+                    retry_policy=RetryPolicy.from_options(retry)
+                    if isinstance(retry, (RetryPolicy, dict))
+                    else None,
+                    bulkhead=bulkhead,
+                    rate_limiter=rate_limiter,
+                    batcher=batcher,
+                    cache=cache if isinstance(cache, (bool, dict)) else None,
+                    coalesce=coalesce if isinstance(coalesce, (bool, dict)) else None,
+                    hedge=hedge if isinstance(hedge, (bool, dict)) else None,
+                )
             )
-            for action in service.actions()
-        ]
-        self.__actions__.extend(service_actions)
 
         # Register service events
         service_events = [
@@ -117,10 +354,12 @@ class Registry:
                 node_id=self.__node_id__,
                 is_local=True,
                 handler=getattr(service, event),
+                service=service.name,
             )
             for event in service.events()
         ]
-        self.__events__.extend(service_events)
+        for event_obj in service_events:
+            self.add_event_obj(event_obj)
 
         # Log registered events for debugging
         if self.__logger__:
@@ -146,7 +385,42 @@ class Registry:
         Args:
             action_obj: Action object to add
         """
-        self.__actions__.append(action_obj)
+        self._actions_by_name.add(action_obj.name, action_obj)
+        self._actions_by_node.add(action_obj.node_id, action_obj)
+        self._actions_by_service.add(action_obj.service, action_obj)
+        if action_obj.is_local:
+            self._local_actions_by_name.add(action_obj.name, action_obj)
+
+        strategy = self._strategies.get(action_obj.name)
+        if strategy is not None:
+            strategy.endpoint_added(action_obj)
+
+    def remove_action(self, action_obj: Action) -> None:
+        """Remove an action from every index.
+
+        Args:
+            action_obj: Action object to remove
+        """
+        self._actions_by_name.discard(action_obj.name, action_obj)
+        self._actions_by_node.discard(action_obj.node_id, action_obj)
+        self._actions_by_service.discard(action_obj.service, action_obj)
+        self._local_actions_by_name.discard(action_obj.name, action_obj)
+        self.open_circuits.discard(action_obj)
+        self._release_strategy(action_obj)
+
+    def _release_strategy(self, action_obj: Action) -> None:
+        """Tell the action's strategy an endpoint is gone, dropping it with the last one.
+
+        Args:
+            action_obj: Endpoint that was removed
+        """
+        strategy = self._strategies.get(action_obj.name)
+        if strategy is None:
+            return
+        if action_obj.name in self._actions_by_name:
+            strategy.endpoint_removed(action_obj)
+        else:
+            del self._strategies[action_obj.name]
 
     def add_event(self, name: str, node_id: str) -> None:
         """Add an event to the registry.
@@ -155,8 +429,7 @@ class Registry:
             name: Event name
             node_id: Node ID hosting the event
         """
-        event = Event(name, node_id, is_local=False)
-        self.__events__.append(event)
+        self.add_event_obj(Event(name, node_id, is_local=False))
 
     def add_event_obj(self, event_obj: Event) -> None:
         """Add an event object to the registry.
@@ -164,21 +437,126 @@ class Registry:
         Args:
             event_obj: Event object to add
         """
-        self.__events__.append(event_obj)
+        self._events_by_name.add(event_obj.name, event_obj)
+        self._events_by_node.add(event_obj.node_id, event_obj)
+        self._events_by_service.add(event_obj.service, event_obj)
+
+    def remove_event(self, event_obj: Event) -> None:
+        """Remove an event from every index.
+
+        Args:
+            event_obj: Event object to remove
+        """
+        self._events_by_name.discard(event_obj.name, event_obj)
+        self._events_by_node.discard(event_obj.node_id, event_obj)
+        self._events_by_service.discard(event_obj.service, event_obj)
+
+    def unregister_node(self, node_id: str) -> None:
+        """Remove every action and event hosted by a node.
+
+        Args:
+            node_id: ID of the node whose endpoints should be dropped
+        """
+        for action_obj in self._actions_by_node.pop(node_id, ()):
+            self._actions_by_name.discard(action_obj.name, action_obj)
+            self._actions_by_service.discard(action_obj.service, action_obj)
+            self._local_actions_by_name.discard(action_obj.name, action_obj)
+            self.open_circuits.discard(action_obj)
+            self._release_strategy(action_obj)
+
+        for event_obj in self._events_by_node.pop(node_id, ()):
+            self._events_by_name.discard(event_obj.name, event_obj)
+            self._events_by_service.discard(event_obj.service, event_obj)
+
+    def get_action(
+        self,
+        name: str,
+        ctx: Optional["Context"] = None,
+        exclude: Optional[Collection[str]] = None,
+    ) -> Optional[Action]:
+        """Get an endpoint for an action, balancing between the nodes hosting it.
+
+        A local endpoint is returned straight away when ``prefer_local`` is set,
+        otherwise the action's load balancing strategy picks among all endpoints.
+        Endpoints whose circuit breaker does not let calls through are skipped.
+
+        Args:
+            name: Fully qualified action name to look up
+            ctx: Context of the call being routed, passed on to the strategy
+            exclude: IDs of nodes to avoid, used when retrying a call. They are
+                still selected if no other node hosts the action
 
-    def get_action(self, name: str) -> Optional[Action]:
-        """Get an action by name.
+        Returns:
+            Selected Action instance, or None if not found or unavailable
+        """
+        actions = self._actions_by_name.get(name)
+        if not actions:
+            return None
+
+        if exclude:
+            actions = [action for action in actions if action.node_id not in exclude] or actions
+
+        if self.open_circuits:
+            actions = [
+                action
+                for action in actions
+                if action not in self.open_circuits or action.breaker.available
+            ]
+            if not actions:
+                return None
+
+        if self.prefer_local and not (exclude and self.__node_id__ in exclude):
+            local_actions = self._local_actions_by_name.get(name)
+            if local_actions:
+                actions = local_actions
+
+        if len(actions) == 1:
+            return actions[0]
+
+        strategy = self._strategies.get(name)
+        if strategy is None:
+            strategy = self._strategies[name] = self._create_strategy(actions[0])
+        return strategy.select(actions, ctx)
+
+    def get_local_action(self, name: str) -> Optional[Action]:
+        """Get the endpoint of an action hosted by this node.
 
         Args:
             name: Fully qualified action name to look up
 
         Returns:
-            First matching Action instance, or None if not found
+            Local Action instance, or None if the action is not hosted locally
         """
-        for action in self.__actions__:
-            if action.name == name:
-                return action
-        return None
+        actions = self._local_actions_by_name.get(name)
+        return actions[0] if actions else None
+
+    def _create_strategy(self, action_obj: Action) -> Strategy:
+        """Instantiate the load balancing strategy for an action.
+
+        Args:
+            action_obj: Endpoint whose strategy settings are used
+
+        Returns:
+            Strategy instance configured for the action
+        """
+        strategy = action_obj.strategy or self.strategy
+        options = action_obj.strategy_options
+        if options is None and not action_obj.strategy:
+            options = self.strategy_options
+
+        strategy_class = strategy if isinstance(strategy, type) else Strategy.get_by_name(strategy)
+        return strategy_class(self, self.broker, options)
+
+    def get_all_actions(self, name: str) -> List[Action]:
+        """Get all endpoints registered for an action name.
+
+        Args:
+            name: Fully qualified action name to look up
+
+        Returns:
+            List of Action instances matching the name
+        """
+        return list(self._actions_by_name.get(name, ()))
 
     def get_all_events(self, name: str) -> List[Event]:
         """Get all event handlers for a given event name.
@@ -189,7 +567,7 @@ class Registry:
         Returns:
             List of Event instances matching the name
         """
-        return [event for event in self.__events__ if event.name == name]
+        return list(self._events_by_name.get(name, ()))
 
     def get_event(self, name: str) -> Optional[Event]:
         """Get the first event handler for a given event name.
@@ -200,5 +578,49 @@ class Registry:
         Returns:
             First matching Event instance, or None if not found
         """
-        events = self.get_all_events(name)
+        events = self._events_by_name.get(name)
         return events[0] if events else None
+
+    def get_node_actions(self, node_id: str) -> List[Action]:
+        """Get all actions hosted by a node.
+
+        Args:
+            node_id: ID of the hosting node
+
+        Returns:
+            List of Action instances hosted by the node
+        """
+        return list(self._actions_by_node.get(node_id, ()))
+
+    def get_node_events(self, node_id: str) -> List[Event]:
+        """Get all event handlers hosted by a node.
+
+        Args:
+            node_id: ID of the hosting node
+
+        Returns:
+            List of Event instances hosted by the node
+        """
+        return list(self._events_by_node.get(node_id, ()))
+
+    def get_service_actions(self, service_name: str) -> List[Action]:
+        """Get all action endpoints belonging to a service, across all nodes.
+
+        Args:
+            service_name: Name of the owning service
+
+        Returns:
+            List of Action instances owned by the service
+        """
+        return list(self._actions_by_service.get(service_name, ()))
+
+    def get_service_events(self, service_name: str) -> List[Event]:
+        """Get all event endpoints belonging to a service, across all nodes.
+
+        Args:
+            service_name: Name of the owning service
+
+        Returns:
+            List of Event instances owned by the service
+        """
+        return list(self._events_by_service.get(service_name, ()))
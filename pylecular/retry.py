@@ -0,0 +1,128 @@
+"""Retry policy for action calls in the Pylecular framework.
+
+A failed call is sent again when its error is retryable, waiting an
+exponentially growing, jittered delay between attempts. The broker picks a
+different node for each attempt when the action is hosted by more than one.
+"""
+
+import random
+from typing import Any, Callable, Dict, Optional, Union
+
+RetryCheck = Callable[[BaseException], bool]
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Tell whether an error marks its call as safe to send again.
+
+    Args:
+        error: Error raised by the call
+
+    Returns:
+        True if the error has a truthy ``retryable`` attribute
+    """
+    return getattr(error, "retryable", False) is True
+
+
+class RetryPolicy:
+    """How many times, and how long apart, a failed call is retried.
+
+    The delay before retry ``n`` (counted from 0) is ``delay * factor ** n``,
+    capped at ``max_delay``, and shortened by a random fraction of up to
+    ``jitter`` so that callers failing together do not retry together.
+    """
+
+    def __init__(
+        self,
+        retries: int = 0,
+        delay: float = 0.1,
+        max_delay: float = 1.0,
+        factor: float = 2.0,
+        jitter: float = 0.5,
+        check: Optional[RetryCheck] = None,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            retries: Maximum number of retries after the first attempt
+            delay: Seconds before the first retry
+            max_delay: Upper bound of the delay between two attempts
+            factor: Multiplier applied to the delay after each retry
+            jitter: Fraction of the delay that is randomly removed, between 0 and 1
+            check: Predicate telling whether an error is retryable. Defaults to
+                :func:`is_retryable`
+        """
+        if not 0 <= jitter <= 1:
+            raise ValueError("Retry jitter must be between 0 and 1")
+
+        self.retries = retries
+        self.delay = delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.check = check or is_retryable
+
+    @classmethod
+    def from_options(
+        cls, options: Optional[Union["RetryPolicy", Dict[str, Any]]]
+    ) -> Optional["RetryPolicy"]:
+        """Build a policy from the value given to ``Settings`` or ``@action``.
+
+        Args:
+            options: A policy, keyword arguments of the constructor, or None
+
+        Returns:
+            The policy, or None when no retries are configured
+        """
+        if options is None or isinstance(options, RetryPolicy):
+            return options
+        return cls(**options)
+
+    @classmethod
+    def from_info(cls, info: Dict[str, Any]) -> "RetryPolicy":
+        """Build a policy announced by a remote node.
+
+        Args:
+            info: Policy as returned by ``to_info``
+
+        Returns:
+            The policy, checking errors with the default predicate
+        """
+        return cls(
+            retries=info.get("retries", 0),
+            delay=info.get("delay", 100) / 1000,
+            max_delay=info.get("maxDelay", 1000) / 1000,
+            factor=info.get("factor", 2.0),
+        )
+
+    def to_info(self) -> Dict[str, Any]:
+        """Describe the policy for the node's INFO packet, with delays in milliseconds."""
+        return {
+            "retries": self.retries,
+            "delay": round(self.delay * 1000),
+            "maxDelay": round(self.max_delay * 1000),
+            "factor": self.factor,
+        }
+
+    def backoff(self, attempt: int) -> float:
+        """Get the delay before a retry.
+
+        Args:
+            attempt: Number of retries already made
+
+        Returns:
+            Seconds to wait before retrying
+        """
+        delay = min(self.max_delay, self.delay * self.factor**attempt)
+        return delay * (1 - self.jitter * random.random())
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """Tell whether a failed call may be retried.
+
+        Args:
+            error: Error raised by the last attempt
+            attempt: Number of retries already made
+
+        Returns:
+            True if retries are left and the error is retryable
+        """
+        return attempt < self.retries and self.check(error)
@@ -0,0 +1,114 @@
+"""Background sampling of host resource usage for the Pylecular framework.
+
+This module provides the HealthSampler used by Transit to fill heartbeats.
+Sampling happens on a timer off the call path, so reading the current usage
+only averages a few cached values.
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Optional, Tuple
+
+import psutil
+
+if TYPE_CHECKING:
+    from .metrics import MetricRegistry
+
+
+class HealthSampler:
+    """Keeps rolling averages of CPU, memory and load.
+
+    CPU usage is read with ``psutil.cpu_percent(interval=None)``, which returns
+    the usage since the previous call without sleeping. Samples are taken every
+    ``interval`` seconds and averaged over the last ``window`` seconds.
+    """
+
+    def __init__(
+        self,
+        window: float = 5.0,
+        interval: float = 1.0,
+        metrics: Optional["MetricRegistry"] = None,
+        logger: Optional[Any] = None,
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            window: Seconds of samples averaged into the reported values
+            interval: Seconds between two samples
+            metrics: Metric registry receiving the os.* gauges
+            logger: Logger of failed samples
+        """
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+
+        self.window = window
+        self.interval = interval
+        self.logger = logger
+        self._samples: Deque[Tuple[float, float, float]] = deque(
+            maxlen=max(1, math.ceil(window / interval))
+        )
+        self._task: Optional[asyncio.Task] = None
+
+        if metrics is not None:
+            metrics.register_gauge("os.cpu.utilization", lambda: self.cpu)
+            metrics.register_gauge("os.memory.utilization", lambda: self.memory)
+            metrics.register_gauge("os.load.1", lambda: self.load)
+
+    def sample(self) -> None:
+        """Take one sample of CPU, memory and load."""
+        self._samples.append(
+            (
+                psutil.cpu_percent(interval=None),
+                psutil.virtual_memory().percent,
+                psutil.getloadavg()[0],
+            )
+        )
+
+    def _average(self, index: int) -> float:
+        if not self._samples:
+            self.sample()
+        return sum(sample[index] for sample in self._samples) / len(self._samples)
+
+    @property
+    def cpu(self) -> float:
+        """Average CPU usage percentage over the window."""
+        return self._average(0)
+
+    @property
+    def memory(self) -> float:
+        """Average memory usage percentage over the window."""
+        return self._average(1)
+
+    @property
+    def load(self) -> float:
+        """Average one minute load over the window."""
+        return self._average(2)
+
+    def start(self) -> None:
+        """Start sampling in the background."""
+        if self._task is not None and not self._task.done():
+            return
+
+        # Prime the CPU counter, the first non-blocking reading has no baseline
+        psutil.cpu_percent(interval=None)
+
+        async def run() -> None:
+            while True:
+                await asyncio.sleep(self.interval)
+                try:
+                    self.sample()
+                except Exception as e:
+                    # Log the error but keep sampling, so the averages do not go stale
+                    if self.logger is not None:
+                        self.logger.error(f"Error sampling node health: {e}")
+
+        self._task = asyncio.create_task(run(), name="health-sampler")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
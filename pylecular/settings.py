@@ -1,4 +1,8 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from .breaker import CircuitBreakerOptions
+from .cacher import Cacher
+from .retry import RetryPolicy
 
 
 class Settings:
@@ -10,6 +14,40 @@ class Settings:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_format: Log output format (PLAIN or JSON)
         middlewares: List of middleware functions to apply
+        strategy: Default load balancing strategy for remote actions
+            (RoundRobin, Random or CpuUsage)
+        strategy_options: Options passed to the load balancing strategy
+        prefer_local: Always call a local endpoint when the action is hosted locally
+        transit_concurrency: Maximum number of incoming requests and events handled
+            at the same time
+        transit_queue_size: Maximum number of incoming requests and events waiting
+            for a worker before the transporter is slowed down
+        health_sample_window: Seconds of CPU, memory and load samples averaged into
+            the values reported in heartbeats
+        health_sample_interval: Seconds between two CPU, memory and load samples
+        heartbeat_interval: Seconds between two heartbeats sent by the node
+        heartbeat_timeout: Seconds without packets from a node after which it is
+            marked unavailable and its endpoints are removed
+        heartbeat_jitter: Fraction of the heartbeat interval randomly added or removed
+            from each wait, so nodes do not beat in lockstep
+        request_timeout: Default timeout of action calls in seconds, used when neither
+            the call nor the action sets one. None or 0 disables it
+        retry_policy: Retry policy of action calls, or RetryPolicy keyword arguments.
+            Calls are not retried when None
+        circuit_breaker: Circuit breaker options of remote endpoints, or
+            CircuitBreakerOptions keyword arguments. Circuit breakers are disabled
+            when None
+        bulkhead: Default ``concurrency`` and ``max_queue_size`` limiting the calls of
+            each local action. Actions are not limited when None
+        rate_limit: Default ``rate``, ``burst``, ``scope`` and ``key`` of the rate limiter
+            shared by local actions. Calls are not rate limited when None
+        cacher: Cacher storing the results of actions declared with ``cache``, True
+            for a MemoryCacher, or MemoryCacher keyword arguments. Results are not
+            cached when None
+        thread_pool_size: Number of threads running the actions declared with
+            ``executor="thread"``. Defaults to the number of CPUs plus 4, up to 32
+        process_pool_size: Number of processes running the actions declared with
+            ``executor="process"``. Defaults to the number of CPUs
     """
 
     def __init__(
@@ -19,9 +57,45 @@ class Settings:
         log_level: str = "INFO",
         log_format: str = "PLAIN",
         middlewares: Optional[List[Any]] = None,
+        strategy: str = "RoundRobin",
+        strategy_options: Optional[Dict[str, Any]] = None,
+        prefer_local: bool = True,
+        transit_concurrency: int = 100,
+        transit_queue_size: int = 1000,
+        health_sample_window: float = 5.0,
+        health_sample_interval: float = 1.0,
+        heartbeat_interval: float = 5.0,
+        heartbeat_timeout: float = 15.0,
+        heartbeat_jitter: float = 0.1,
+        request_timeout: Optional[float] = 5.0,
+        retry_policy: Optional[Union[RetryPolicy, Dict[str, Any]]] = None,
+        circuit_breaker: Optional[Union[CircuitBreakerOptions, Dict[str, Any]]] = None,
+        bulkhead: Optional[Dict[str, int]] = None,
+        rate_limit: Optional[Dict[str, Any]] = None,
+        cacher: Optional[Union[Cacher, bool, Dict[str, Any]]] = None,
+        thread_pool_size: Optional[int] = None,
+        process_pool_size: Optional[int] = None,
     ) -> None:
         self.transporter = transporter
         self.serializer = serializer
         self.log_level = log_level
         self.log_format = log_format
         self.middlewares = middlewares or []
+        self.strategy = strategy
+        self.strategy_options = strategy_options or {}
+        self.prefer_local = prefer_local
+        self.transit_concurrency = transit_concurrency
+        self.transit_queue_size = transit_queue_size
+        self.health_sample_window = health_sample_window
+        self.health_sample_interval = health_sample_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.heartbeat_jitter = heartbeat_jitter
+        self.request_timeout = request_timeout
+        self.retry_policy = RetryPolicy.from_options(retry_policy)
+        self.circuit_breaker = CircuitBreakerOptions.from_options(circuit_breaker)
+        self.bulkhead = bulkhead
+        self.rate_limit = rate_limit
+        self.cacher = Cacher.from_options(cacher)
+        self.thread_pool_size = thread_pool_size
+        self.process_pool_size = process_pool_size
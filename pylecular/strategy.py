@@ -0,0 +1,280 @@
+"""Load balancing strategies for the Pylecular framework.
+
+This module provides the strategies used by the registry to pick one endpoint
+when an action is hosted by several nodes, mirroring Moleculer's RoundRobin,
+Random, CpuUsage and Shard strategies.
+"""
+
+import bisect
+import hashlib
+import random
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .broker import ServiceBroker
+    from .context import Context
+    from .registry import Action, Registry
+
+
+class Strategy:
+    """Base class for endpoint selection strategies.
+
+    A strategy instance is created per action name, so subclasses may keep
+    per-action state such as round-robin counters.
+    """
+
+    def __init__(
+        self,
+        registry: "Registry",
+        broker: Optional["ServiceBroker"] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the strategy.
+
+        Args:
+            registry: Registry owning the endpoints
+            broker: Service broker, used to reach node information
+            options: Strategy specific options
+        """
+        self.registry = registry
+        self.broker = broker
+        self.options = options or {}
+
+    def select(self, endpoints: Sequence["Action"], ctx: Optional["Context"] = None) -> "Action":
+        """Select one endpoint from a non-empty list of candidates.
+
+        Args:
+            endpoints: Available endpoints for the action
+            ctx: Context of the call being routed, if any
+
+        Returns:
+            The selected endpoint
+        """
+        raise NotImplementedError
+
+    def endpoint_added(self, endpoint: "Action") -> None:
+        """Notify the strategy that an endpoint was registered for its action.
+
+        Args:
+            endpoint: The new endpoint
+        """
+
+    def endpoint_removed(self, endpoint: "Action") -> None:
+        """Notify the strategy that an endpoint was removed from its action.
+
+        Args:
+            endpoint: The removed endpoint
+        """
+
+    @classmethod
+    def get_by_name(cls: type["Strategy"], name: str) -> type["Strategy"]:
+        """Get a strategy class by name.
+
+        Args:
+            name: Name of the strategy (e.g., "RoundRobin", "Random", "CpuUsage")
+
+        Returns:
+            Strategy subclass matching the name
+
+        Raises:
+            ValueError: If no strategy is found for the given name
+        """
+        for subclass in cls.__subclasses__():
+            if subclass.__name__.lower() == f"{name.lower()}strategy":
+                return subclass
+
+        raise ValueError(f"No strategy found for: {name}")
+
+
+class RoundRobinStrategy(Strategy):
+    """Cycle through the available endpoints in order."""
+
+    def __init__(
+        self,
+        registry: "Registry",
+        broker: Optional["ServiceBroker"] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(registry, broker, options)
+        self.counter = 0
+
+    def select(self, endpoints: Sequence["Action"], ctx: Optional["Context"] = None) -> "Action":
+        if self.counter >= len(endpoints):
+            self.counter = 0
+        endpoint = endpoints[self.counter]
+        self.counter += 1
+        return endpoint
+
+
+class RandomStrategy(Strategy):
+    """Pick a random endpoint for every call."""
+
+    def select(self, endpoints: Sequence["Action"], ctx: Optional["Context"] = None) -> "Action":
+        return endpoints[random.randrange(len(endpoints))]
+
+
+class CpuUsageStrategy(Strategy):
+    """Prefer the endpoint whose node reported the lowest CPU usage.
+
+    Options:
+        sample_count: Number of random endpoints compared on each call (default 3)
+        low_cpu_usage: CPU percentage below which an endpoint is chosen immediately
+            (default 10)
+    """
+
+    def __init__(
+        self,
+        registry: "Registry",
+        broker: Optional["ServiceBroker"] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(registry, broker, options)
+        self.sample_count = int(self.options.get("sample_count", 3))
+        self.low_cpu_usage = float(self.options.get("low_cpu_usage", 10))
+
+    def _node_cpu(self, node_id: str) -> float:
+        """Get the last CPU usage reported by a node's heartbeat."""
+        if self.broker is None:
+            return 0.0
+        node = self.broker.node_catalog.get_node(node_id)
+        return node.cpu if node is not None and node.cpu is not None else 0.0
+
+    def select(self, endpoints: Sequence["Action"], ctx: Optional["Context"] = None) -> "Action":
+        candidates: List[Action] = (
+            random.sample(list(endpoints), self.sample_count)
+            if len(endpoints) > self.sample_count
+            else list(endpoints)
+        )
+
+        best = candidates[0]
+        best_cpu = self._node_cpu(best.node_id)
+        for endpoint in candidates[1:]:
+            if best_cpu < self.low_cpu_usage:
+                break
+            cpu = self._node_cpu(endpoint.node_id)
+            if cpu < best_cpu:
+                best, best_cpu = endpoint, cpu
+        return best
+
+
+class ShardStrategy(Strategy):
+    """Route calls with the same key to the same node using consistent hashing.
+
+    Every node hosting the action owns ``vnodes`` points on a hash ring. The
+    shard key is read from the call context and hashed onto the ring; the
+    first node point clockwise from it serves the call. Adding or removing a
+    node only moves the keys of that node's ring segments.
+
+    Options:
+        shard_key: Dotted path of the key in ``ctx.params``, or in ``ctx.meta``
+            when prefixed with ``#`` (e.g. ``"user.id"`` or ``"#tenant"``)
+        vnodes: Number of virtual nodes placed on the ring per node (default 10)
+        cache_size: Number of key to node lookups kept in the LRU cache (default 1000)
+    """
+
+    def __init__(
+        self,
+        registry: "Registry",
+        broker: Optional["ServiceBroker"] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(registry, broker, options)
+        shard_key = self.options.get("shard_key")
+        if not shard_key:
+            raise ValueError("Shard strategy requires a 'shard_key' option")
+
+        self.from_meta = shard_key.startswith("#")
+        self.key_path = (shard_key[1:] if self.from_meta else shard_key).split(".")
+        self.vnodes = int(self.options.get("vnodes", 10))
+        self.cache_size = int(self.options.get("cache_size", 1000))
+
+        self._ring: List[Tuple[int, str]] = []
+        self._endpoints: Dict[str, Action] = {}
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        """Hash a string onto the 64-bit ring."""
+        return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+    def _get_key(self, ctx: Optional["Context"]) -> Optional[str]:
+        """Extract the shard key from the call context."""
+        if ctx is None:
+            return None
+        value: Any = ctx.meta if self.from_meta else ctx.params
+        for part in self.key_path:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return None if value is None else str(value)
+
+    def endpoint_added(self, endpoint: "Action") -> None:
+        # The ring is built lazily on the first keyed call
+        if not self._ring:
+            return
+        known = endpoint.node_id in self._endpoints
+        self._endpoints[endpoint.node_id] = endpoint
+        if known:
+            return
+        for i in range(self.vnodes):
+            bisect.insort(self._ring, (self._hash(f"{endpoint.node_id}:{i}"), endpoint.node_id))
+        self._cache.clear()
+
+    def endpoint_removed(self, endpoint: "Action") -> None:
+        if self._endpoints.get(endpoint.node_id) is not endpoint:
+            return
+        del self._endpoints[endpoint.node_id]
+        self._ring = [point for point in self._ring if point[1] != endpoint.node_id]
+        self._cache.clear()
+
+    def _rebuild(self, endpoints: Sequence["Action"]) -> None:
+        """Build the ring from scratch for the given endpoints."""
+        self._endpoints = {endpoint.node_id: endpoint for endpoint in endpoints}
+        self._ring = sorted(
+            (self._hash(f"{node_id}:{i}"), node_id)
+            for node_id in self._endpoints
+            for i in range(self.vnodes)
+        )
+        self._cache.clear()
+
+    def _lookup(self, key: str) -> str:
+        """Find the node owning a key, going through the LRU cache."""
+        node_id = self._cache.get(key)
+        if node_id is not None:
+            self._cache.move_to_end(key)
+            return node_id
+
+        index = bisect.bisect(self._ring, (self._hash(key),))
+        node_id = self._ring[index % len(self._ring)][1]
+
+        self._cache[key] = node_id
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return node_id
+
+    def _next_candidate(self, key: str, endpoints: Sequence["Action"]) -> "Action":
+        """Find the first candidate clockwise from a key, leaving the ring and cache as is."""
+        candidates = {endpoint.node_id: endpoint for endpoint in endpoints}
+        start = bisect.bisect(self._ring, (self._hash(key),))
+        for offset in range(len(self._ring)):
+            endpoint = candidates.get(self._ring[(start + offset) % len(self._ring)][1])
+            if endpoint is not None:
+                return endpoint
+        # None of the candidates is on the ring, still pick one by key
+        return endpoints[self._hash(key) % len(endpoints)]
+
+    def select(self, endpoints: Sequence["Action"], ctx: Optional["Context"] = None) -> "Action":
+        key = self._get_key(ctx)
+        if key is None:
+            return endpoints[random.randrange(len(endpoints))]
+
+        # The candidates may be filtered, by retries or open circuits, so the ring
+        # holds every endpoint of the action and is kept up to date by the registry
+        if not self._ring:
+            self._rebuild(self.registry.get_all_actions(endpoints[0].name) or endpoints)
+
+        endpoint = self._endpoints.get(self._lookup(key))
+        if endpoint is not None and endpoint in endpoints:
+            return endpoint
+        return self._next_candidate(key, endpoints)
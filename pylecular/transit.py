@@ -5,30 +5,111 @@ and inter-service communication through various transporter implementations.
 """
 
 import asyncio
+import time
 import traceback
-from typing import TYPE_CHECKING, Any, Dict, Optional
-
-import psutil
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, ClassVar, Dict, List, Optional
 
 if TYPE_CHECKING:
     from .context import Context
     from .lifecycle import Lifecycle
+    from .metrics import MetricRegistry
+    from .middleware import MiddlewareHandler
     from .node import NodeCatalog
     from .registry import Action, Event, Registry
     from .settings import Settings
 
+from .dispatcher import WorkerPool
+from .metrics import MetricRegistry
 from .node import Node
 from .packet import Packet, Topic
+from .rate_limit import RateLimitExceededError
+from .retry import is_retryable
+from .sampler import HealthSampler
 from .transporter.base import Transporter
 
 
 class RemoteCallError(Exception):
-    """Exception raised when a remote service call fails."""
+    """Exception raised when a remote service call fails.
+
+    ``retryable`` is taken from the error raised on the remote node.
+    """
 
-    def __init__(self, message: str, error_name: str = "RemoteError", stack: Optional[str] = None):
+    def __init__(
+        self,
+        message: str,
+        error_name: str = "RemoteError",
+        stack: Optional[str] = None,
+        retryable: bool = False,
+    ):
         super().__init__(message)
         self.error_name = error_name
         self.stack = stack
+        self.retryable = retryable
+
+
+class RequestRejectedError(Exception):
+    """Exception raised when a pending request is dropped because its target node left.
+
+    The request may be retried on another node.
+    """
+
+    retryable = True
+
+    def __init__(self, action: str, node_id: str) -> None:
+        super().__init__(f"Request to {action} rejected, node {node_id} is unavailable")
+        self.action = action
+        self.node_id = node_id
+
+
+class RequestTimeoutError(Exception):
+    """Exception raised when a call does not complete before its deadline.
+
+    The request may be retried on another node if time is left for it.
+    """
+
+    retryable = True
+
+    def __init__(self, action: str) -> None:
+        super().__init__(f"Request to {action} timed out")
+        self.action = action
+
+
+class RequestSkippedError(Exception):
+    """Exception raised when a call is not sent because its deadline has already passed."""
+
+    def __init__(self, action: str) -> None:
+        super().__init__(f"Request to {action} skipped, the deadline has passed")
+        self.action = action
+
+
+async def run_until_deadline(
+    handler: Callable[["Context"], Awaitable[Any]], context: "Context", action: str
+) -> Any:
+    """Run an action handler, cancelling it when the context's deadline passes.
+
+    Args:
+        handler: Action handler or middleware chain
+        context: Context of the call
+        action: Name of the called action
+
+    Returns:
+        Result of the handler
+
+    Raises:
+        RequestTimeoutError: If the deadline passes before the handler returns
+    """
+    if context.deadline is None:
+        return await handler(context)
+
+    timeout = asyncio.timeout(context.remaining())
+    try:
+        async with timeout:
+            return await handler(context)
+    except TimeoutError:
+        if timeout.expired():
+            raise RequestTimeoutError(action) from None
+        raise
 
 
 class Transit:
@@ -42,7 +123,23 @@ class Transit:
     - Processing events
     """
 
-    DEFAULT_REQUEST_TIMEOUT = 5.0  # seconds
+    # Lane handling each packet type. Control packets get their own lane so that
+    # heartbeats and discovery never wait behind a backlog of requests; packet
+    # types without a lane are handled inline.
+    PACKET_LANES: ClassVar[Dict[Topic, str]] = {
+        Topic.INFO: "control",
+        Topic.DISCOVER: "control",
+        Topic.HEARTBEAT: "control",
+        Topic.DISCONNECT: "control",
+        Topic.CANCEL: "control",
+        Topic.REQUEST: "data",
+        Topic.EVENT: "data",
+    }
+
+    # CANCEL packets kept for requests still queued, at most this many and for this
+    # many seconds, so that the request is dropped instead of run once dequeued
+    CANCELLED_REQUESTS_SIZE = 1000
+    CANCELLED_REQUESTS_TTL = 60.0
 
     def __init__(
         self,
@@ -52,6 +149,8 @@ class Transit:
         settings: "Settings",
         logger: Any,
         lifecycle: "Lifecycle",
+        middleware_handler: Optional["MiddlewareHandler"] = None,
+        metrics: Optional["MetricRegistry"] = None,
     ) -> None:
         """Initialize the Transit layer.
 
@@ -62,12 +161,16 @@ class Transit:
             settings: Configuration settings
             logger: Logger instance
             lifecycle: Context lifecycle manager
+            middleware_handler: Compiles middleware chains for incoming requests and events
+            metrics: Metric registry receiving the transit metrics
         """
         self.node_id = node_id
         self.registry = registry
         self.node_catalog = node_catalog
         self.logger = logger
         self.lifecycle = lifecycle
+        self.middleware_handler = middleware_handler
+        self.metrics = metrics or MetricRegistry()
 
         # Initialize transporter based on settings
         transporter_name = settings.transporter.split("://")[0]
@@ -79,12 +182,66 @@ class Transit:
             node_id=node_id,
         )
 
-        # Track pending requests for timeout handling
+        # Track pending requests for timeout handling, and the action name of each
+        # one by target node so they can be rejected as soon as the node leaves
         self._pending_requests: Dict[str, asyncio.Future] = {}
+        self._pending_by_node: Dict[str, Dict[str, str]] = {}
+
+        # Handler tasks of incoming requests by context ID, cancelled on CANCEL
+        self._running_requests: Dict[str, asyncio.Task] = {}
+
+        # Requests cancelled before they started: context ID -> time.monotonic() expiry,
+        # in the order they were cancelled
+        self._cancelled_requests: OrderedDict[str, float] = OrderedDict()
+
+        # Packets run on worker tasks so the transporter keeps delivering. The control
+        # lane has a single worker to keep INFO and DISCONNECT packets in order.
+        control_lane = WorkerPool(
+            self._process_packet,
+            concurrency=1,
+            queue_size=settings.transit_queue_size,
+            logger=logger,
+            name="control",
+            metrics=self.metrics,
+        )
+        data_lane = WorkerPool(
+            self._process_packet,
+            concurrency=settings.transit_concurrency,
+            queue_size=settings.transit_queue_size,
+            logger=logger,
+            name="data",
+            metrics=self.metrics,
+            priority_pool=control_lane,
+        )
+        self.lanes: Dict[str, WorkerPool] = {"control": control_lane, "data": data_lane}
+
+        # CPU usage for heartbeats is sampled in the background, never on the beat itself
+        self.sampler = HealthSampler(
+            window=settings.health_sample_window,
+            interval=settings.health_sample_interval,
+            metrics=self.metrics,
+            logger=logger,
+        )
 
     async def _message_handler(self, packet: Packet) -> None:
         """Handle incoming packets based on their type.
 
+        Packets are queued on the lane of their type; responses, which only
+        resolve a pending request, are handled before returning.
+
+        Args:
+            packet: Incoming packet to process
+        """
+        packet.received_at = time.monotonic()
+        lane = self.PACKET_LANES.get(packet.type)
+        if lane is not None:
+            await self.lanes[lane].submit(packet)
+        else:
+            await self._process_packet(packet)
+
+    async def _process_packet(self, packet: Packet) -> None:
+        """Route a packet to the handler for its type.
+
         Args:
             packet: Incoming packet to process
         """
@@ -96,6 +253,7 @@ class Transit:
             Topic.RESPONSE: self._handle_response,
             Topic.EVENT: self._handle_event,
             Topic.DISCONNECT: self._handle_disconnect,
+            Topic.CANCEL: self._handle_cancel,
         }
 
         handler = handlers.get(packet.type)
@@ -113,9 +271,11 @@ class Transit:
             (Topic.INFO.value, None),
             (Topic.INFO.value, self.node_id),
             (Topic.DISCOVER.value, None),
+            (Topic.DISCOVER.value, self.node_id),
             (Topic.HEARTBEAT.value, None),
             (Topic.REQUEST.value, self.node_id),
             (Topic.RESPONSE.value, self.node_id),
+            (Topic.CANCEL.value, self.node_id),
             (Topic.EVENT.value, self.node_id),
             (Topic.DISCONNECT.value, None),
         ]
@@ -126,6 +286,7 @@ class Transit:
     async def connect(self) -> None:
         """Establish connection and initialize the node in the cluster."""
         await self.transporter.connect()
+        self.sampler.start()
         await self.discover()
         await self.send_node_info()
         await self._make_subscriptions()
@@ -144,6 +305,13 @@ class Transit:
             if not future.done():
                 future.cancel()
         self._pending_requests.clear()
+        self._pending_by_node.clear()
+
+        # Let queued packets finish while responses can still be sent
+        for lane in self.lanes.values():
+            await lane.stop()
+
+        await self.sampler.stop()
 
         # Disconnect transporter
         await self.transporter.disconnect()
@@ -164,7 +332,7 @@ class Transit:
     async def beat(self) -> None:
         """Send a heartbeat with current node metrics."""
         heartbeat_data = {
-            "cpu": psutil.cpu_percent(interval=0.1),  # Non-blocking CPU check
+            "cpu": self.sampler.cpu,
             "timestamp": asyncio.get_event_loop().time(),
         }
         await self.publish(Packet(Topic.HEARTBEAT, None, heartbeat_data))
@@ -192,12 +360,16 @@ class Transit:
         Args:
             packet: Heartbeat packet
         """
-        # Update node's last seen timestamp
-        if packet.sender:
-            node = self.node_catalog.get_node(packet.sender)
-            if node:
-                node.cpu = packet.payload.get("cpu", 0.0)
-                # Could add timestamp tracking here for node health monitoring
+        if not packet.sender or packet.sender == self.node_id:
+            return
+
+        node = self.node_catalog.get_node(packet.sender)
+        if node and node.available:
+            node.cpu = packet.payload.get("cpu", 0.0)
+            self.node_catalog.mark_seen(packet.sender)
+        else:
+            # Unknown or expired node, ask it to announce its services again
+            await self.publish(Packet(Topic.DISCOVER, packet.sender, {}))
 
     async def _handle_info(self, packet: Packet) -> None:
         """Handle node info packets.
@@ -205,7 +377,8 @@ class Transit:
         Args:
             packet: Info packet containing node details
         """
-        if not packet.payload or not packet.sender:
+        # Our own INFO broadcast is echoed back; local endpoints are already registered
+        if not packet.payload or not packet.sender or packet.sender == self.node_id:
             return
 
         # Extract node data, excluding the ID from payload and mapping field names
@@ -246,8 +419,31 @@ class Transit:
         Args:
             packet: Disconnect packet
         """
-        if packet.sender:
+        if packet.sender and packet.sender != self.node_id:
             self.node_catalog.disconnect_node(packet.sender)
+            self.reject_pending_requests(packet.sender)
+
+    def reject_pending_requests(self, node_id: str) -> List[str]:
+        """Fail the requests waiting for a response from a node that left.
+
+        Args:
+            node_id: ID of the disconnected or expired node
+
+        Returns:
+            IDs of the rejected requests
+        """
+        pending = self._pending_by_node.pop(node_id, None)
+        if not pending:
+            return []
+
+        for req_id, action in pending.items():
+            future = self._pending_requests.pop(req_id, None)
+            if future is not None and not future.done():
+                future.set_exception(RequestRejectedError(action, node_id))
+                self.metrics.increment("transit.requests.rejected", labels={"action": action})
+
+        self.logger.warning(f"Rejected {len(pending)} pending requests to node {node_id}")
+        return list(pending)
 
     async def _handle_event(self, packet: Packet) -> None:
         """Handle event packets.
@@ -264,10 +460,28 @@ class Transit:
         if endpoint and endpoint.is_local and endpoint.handler:
             context = self.lifecycle.rebuild_context(packet.payload)
             try:
-                await endpoint.handler(context)
+                handler = await self._get_local_handler(endpoint, "local_event")
+                await handler(context)
             except Exception as e:
                 self.logger.error(f"Failed to process event {endpoint.name}: {e}")
 
+    async def _get_local_handler(self, endpoint: Any, hook_name: str) -> Any:
+        """Get a local endpoint's handler wrapped in the broker's middleware chain.
+
+        Args:
+            endpoint: Local action or event endpoint
+            hook_name: Middleware hook used to wrap the handler
+
+        Returns:
+            Compiled handler, or the bare handler when no middleware handler is set
+        """
+        if self.middleware_handler is None:
+            return endpoint.handler
+        handler = self.middleware_handler.cached(endpoint)
+        if handler is None:
+            handler = await self.middleware_handler.compile(endpoint, hook_name, endpoint.handler)
+        return handler
+
     async def _handle_request(self, packet: Packet) -> None:
         """Handle service request packets.
 
@@ -279,46 +493,138 @@ class Transit:
             self.logger.warning("Received request packet without action name")
             return
 
-        endpoint = self.registry.get_action(action_name)
-        if not endpoint or not endpoint.is_local:
+        endpoint = self.registry.get_local_action(action_name)
+        if not endpoint:
             self.logger.warning(f"No local handler for action: {action_name}")
             return
 
-        context = self.lifecycle.rebuild_context(packet.payload)
+        context = self.lifecycle.rebuild_context(packet.payload, received_at=packet.received_at)
+
+        # The caller has given up on a request that waited past its deadline
+        if context.expired:
+            self.metrics.increment("transit.requests.expired", labels={"action": action_name})
+            self.logger.debug(f"Dropped request to {action_name}, the deadline has passed")
+            return
+
+        # The caller cancelled the request while it was waiting in the queue
+        if self._cancelled_requests.pop(context.id, None) is not None:
+            self.metrics.increment("transit.requests.cancelled", labels={"action": action_name})
+            return
+
+        # Rejected without raising, so no traceback is built for calls turned away
+        limiter = endpoint.rate_limiter
+        if limiter is not None and not limiter.allow(action_name, context):
+            self.metrics.increment("action.rate_limit.rejected", labels={"action": action_name})
+            error = RateLimitExceededError(action_name)
+            await self.publish(
+                Packet(Topic.RESPONSE, packet.sender, self._error_response(context, error))
+            )
+            return
 
         try:
             # Validate parameters if schema is defined
             if endpoint.params_schema:
-                from .validator import ValidationError, validate_params
-
-                try:
-                    validate_params(context.params, endpoint.params_schema)
-                except ValidationError:
-                    raise  # Re-raise validation errors
+                endpoint.validate(context.params)
 
             # Execute the action handler
             if not endpoint.handler:
                 raise Exception(f"No handler defined for action {action_name}")
 
-            result = await endpoint.handler(context)
+            handler = await self._get_local_handler(endpoint, "local_action")
+
+            # The handler runs in its own task so a CANCEL packet can stop it
+            task = asyncio.ensure_future(run_until_deadline(handler, context, action_name))
+            self._running_requests[context.id] = task
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if current is not None and current.cancelling():
+                    raise
+                # Cancelled by the caller, who no longer waits for a response
+                self.metrics.increment("transit.requests.cancelled", labels={"action": action_name})
+                return
+            finally:
+                self._running_requests.pop(context.id, None)
+
             response = {"id": context.id, "data": result, "success": True, "meta": context.meta}
 
         except Exception as e:
             self.logger.error(f"Failed call to {endpoint.name}: {e}")
-            response = {
-                "id": context.id,
-                "error": {
-                    "name": e.__class__.__name__,
-                    "message": str(e),
-                    "stack": traceback.format_exc(),
-                },
-                "success": False,
-                "meta": context.meta,
-            }
+            response = self._error_response(context, e, traceback.format_exc())
 
         # Send response back to the caller
         await self.publish(Packet(Topic.RESPONSE, packet.sender, response))
 
+    def _error_response(
+        self, context: "Context", error: Exception, stack: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the payload of a failed request's response.
+
+        Args:
+            context: Context of the request
+            error: Error the request failed with
+            stack: Formatted stack of the error, if any
+
+        Returns:
+            Response payload
+        """
+        return {
+            "id": context.id,
+            "error": {
+                "name": error.__class__.__name__,
+                "message": str(error),
+                "stack": stack,
+                "retryable": is_retryable(error),
+            },
+            "success": False,
+            "meta": context.meta,
+        }
+
+    async def _handle_cancel(self, packet: Packet) -> None:
+        """Handle cancellation of a request the caller no longer waits for.
+
+        Cancelling the handler also cancels the calls it is waiting on, and
+        remote ones send their own CANCEL packets further down the chain. A
+        request that has not started yet is remembered and dropped when dequeued.
+
+        Args:
+            packet: Cancel packet holding the request ID
+        """
+        req_id = packet.payload.get("id")
+        task = self._running_requests.get(req_id)
+        if task is not None:
+            task.cancel()
+        elif req_id:
+            self._remember_cancelled(req_id)
+
+    def _remember_cancelled(self, req_id: str) -> None:
+        """Remember a request cancelled before it started, dropping old entries.
+
+        Args:
+            req_id: ID of the request
+        """
+        cancelled = self._cancelled_requests
+        now = time.monotonic()
+        # Entries share one TTL, so the oldest expire first
+        while cancelled and next(iter(cancelled.values())) <= now:
+            cancelled.popitem(last=False)
+        cancelled[req_id] = now + self.CANCELLED_REQUESTS_TTL
+        if len(cancelled) > self.CANCELLED_REQUESTS_SIZE:
+            cancelled.popitem(last=False)
+
+    async def _send_cancel(self, endpoint: "Action", req_id: str) -> None:
+        """Tell the node running a request that the caller gave up on it.
+
+        Args:
+            endpoint: Action endpoint the request was sent to
+            req_id: ID of the request
+        """
+        try:
+            await self.publish(Packet(Topic.CANCEL, endpoint.node_id, {"id": req_id}))
+        except Exception as e:
+            self.logger.warning(f"Error sending cancellation of {endpoint.name} request: {e}")
+
     async def _handle_response(self, packet: Packet) -> None:
         """Handle response packets for pending requests.
 
@@ -336,6 +642,11 @@ class Transit:
     async def request(self, endpoint: "Action", context: "Context") -> Any:
         """Send a request to a remote service action.
 
+        The response is awaited until the context's deadline, or without a
+        time limit if the caller disabled timeouts. When the request times
+        out or the calling task is cancelled, the target node is sent a
+        CANCEL packet so it stops handling the request.
+
         Args:
             endpoint: Action endpoint to call
             context: Request context
@@ -345,17 +656,21 @@ class Transit:
 
         Raises:
             RemoteCallError: If the remote call fails
-            asyncio.TimeoutError: If the request times out
+            RequestRejectedError: If the target node leaves before responding
+            RequestTimeoutError: If the request times out
         """
         req_id = context.id
         future = asyncio.get_running_loop().create_future()
         self._pending_requests[req_id] = future
-
-        # Send the request
-        await self.publish(Packet(Topic.REQUEST, endpoint.node_id, context.marshall()))
+        self._pending_by_node.setdefault(endpoint.node_id, {})[req_id] = endpoint.name
 
         try:
-            response = await asyncio.wait_for(future, self.DEFAULT_REQUEST_TIMEOUT)
+            # Send the request
+            await self.publish(Packet(Topic.REQUEST, endpoint.node_id, context.marshall()))
+
+            # Contexts without a deadline come from calls whose timeouts are disabled
+            timeout = None if context.deadline is None else context.remaining()
+            response = await asyncio.wait_for(future, timeout)
 
             # Check if the response indicates an error
             if not response.get("success", True):
@@ -367,14 +682,28 @@ class Transit:
                 if error_stack:
                     self.logger.error(f"Remote error stack: {error_stack}")
 
-                raise RemoteCallError(error_msg, error_name, error_stack)
+                raise RemoteCallError(
+                    error_msg, error_name, error_stack, error_data.get("retryable") is True
+                )
 
             return response.get("data")
 
         except asyncio.TimeoutError:
+            await self._send_cancel(endpoint, req_id)
+            raise RequestTimeoutError(endpoint.name) from None
+
+        except asyncio.CancelledError:
+            await self._send_cancel(endpoint, req_id)
+            raise
+
+        finally:
             # Clean up the pending request
             self._pending_requests.pop(req_id, None)
-            raise Exception(f"Request to {endpoint.name} timed out") from None
+            node_pending = self._pending_by_node.get(endpoint.node_id)
+            if node_pending is not None:
+                node_pending.pop(req_id, None)
+                if not node_pending:
+                    del self._pending_by_node[endpoint.node_id]
 
     async def send_event(self, endpoint: "Event", context: "Context") -> None:
         """Send an event to a remote service.
@@ -1,4 +1,7 @@
-from typing import Any, Dict, List, Optional, Union
+import math
+import operator
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 
 class ValidationError(Exception):
@@ -55,6 +58,102 @@ def validate_type(value: Any, expected_type: str) -> bool:
     return False
 
 
+# Arrays shorter than this are checked item by item, bulk checks only pay off on larger ones
+BULK_MIN_ITEMS = 64
+
+_BULK_ITEM_KEYS = frozenset({"type", "required", "min", "max", "gt", "gte", "lt", "lte", "enum"})
+_NUMERIC_TYPES = frozenset({int, float})
+
+
+class NumericItems:
+    """Numeric ``items`` constraints of an array rule, checked over the whole array at once.
+
+    Bulk checks only decide whether every item passes. When one does not, the
+    caller validates the items one by one from ``first_invalid`` so errors are
+    reported exactly as the per-item rule would report them.
+    """
+
+    def __init__(self, bounds: Tuple[Tuple[Callable[[Any, Any], bool], Any], ...], allowed: Any):
+        """Initialize the bulk checks.
+
+        Args:
+            bounds: Pairs of failing comparison and limit, e.g. ``(operator.lt, 0)`` for min 0
+            allowed: Allowed values from the ``enum`` rule, or None
+        """
+        self.bounds = bounds
+        self.allowed_set = None if allowed is None else frozenset(allowed)
+
+    @classmethod
+    def from_rule(cls, item_rule: Dict[str, Any]) -> Optional["NumericItems"]:
+        """Build the bulk checks for an ``items`` rule.
+
+        Args:
+            item_rule: The rule applied to every item of the array
+
+        Returns:
+            The bulk checks, or None if the rule cannot be checked in bulk
+        """
+        if item_rule.get("type") != "number" or not _BULK_ITEM_KEYS.issuperset(item_rule):
+            return None
+
+        bounds = tuple(
+            (fails, item_rule[key]) for key, fails, _, _ in _NUMBER_RULES if key in item_rule
+        )
+        if any(type(limit) not in _NUMERIC_TYPES for _, limit in bounds):
+            return None
+
+        allowed = item_rule.get("enum")
+        if allowed is not None and not (
+            isinstance(allowed, (list, tuple)) and _NUMERIC_TYPES.issuperset(map(type, allowed))
+        ):
+            return None
+
+        return cls(bounds, allowed)
+
+    def first_invalid(self, items: List[Any]) -> int:
+        """Find where item by item validation has to start.
+
+        Uses ``min``, ``max`` and set operations, which compare ints and floats
+        exactly, however large the ints are.
+
+        Args:
+            items: The array being validated
+
+        Returns:
+            ``len(items)`` if every item is valid, otherwise the index of the
+            first item that may be invalid
+        """
+        count = len(items)
+        if count < BULK_MIN_ITEMS:
+            return 0
+
+        # Rejects None, bool and str items, which the per-item rule reports
+        types = set(map(type, items))
+        if not _NUMERIC_TYPES.issuperset(types):
+            return 0
+
+        if float in types:
+            # min and max are unreliable when NaN is present
+            try:
+                total = sum(items)
+            except OverflowError:
+                return 0
+            if math.isnan(total):
+                return 0
+
+        if self.bounds:
+            # Any item fails a bound exactly when the smallest or largest one does
+            lowest, highest = min(items), max(items)
+            for fails, limit in self.bounds:
+                if fails(lowest, limit) or fails(highest, limit):
+                    return 0
+
+        if self.allowed_set is not None and not self.allowed_set.issuperset(items):
+            return 0
+
+        return count
+
+
 def validate_param_rule(name: str, value: Any, rule: Union[str, Dict[str, Any]]) -> bool:
     """Validate a parameter against its rule.
 
@@ -178,8 +277,6 @@ def validate_param_rule(name: str, value: Any, rule: Union[str, Dict[str, Any]])
 
         # Pattern
         if "pattern" in rule:
-            import re
-
             if not re.match(rule["pattern"], value):
                 raise ValidationError(
                     f"Parameter '{name}' must match the pattern '{rule['pattern']}'",
@@ -213,7 +310,9 @@ def validate_param_rule(name: str, value: Any, rule: Union[str, Dict[str, Any]])
 
         # Items validation (if items have a specific type)
         if "items" in rule and isinstance(rule["items"], dict) and "type" in rule["items"]:
-            for i, item in enumerate(value):
+            numeric_items = NumericItems.from_rule(rule["items"])
+            start = numeric_items.first_invalid(value) if numeric_items is not None else 0
+            for i, item in enumerate(value[start:] if start else value, start):
                 try:
                     validate_param_rule(f"{name}[{i}]", item, rule["items"])
                 except ValidationError as e:
@@ -279,3 +378,274 @@ def validate_params(params: Dict[str, Any], schema: Union[Dict[str, Any], List[s
                 validate_param_rule(param_name, param_value, schema[param_name])
 
     return True
+
+
+# Compiled checks receive the field name at call time so the same check can be
+# reused for every item of an array
+FieldCheck = Callable[[str, Any], None]
+SchemaValidator = Callable[[Dict[str, Any]], bool]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None,
+    "any": lambda value: True,
+}
+
+# (rule key, failing comparison, message, error type)
+_NUMBER_RULES: Tuple[Tuple[str, Callable[[Any, Any], bool], str, str], ...] = (
+    ("min", operator.lt, "must be greater than or equal to {}", "min_value"),
+    ("max", operator.gt, "must be less than or equal to {}", "max_value"),
+    ("gt", operator.le, "must be greater than {}", "greater_than"),
+    ("gte", operator.lt, "must be greater than or equal to {}", "greater_than_equal"),
+    ("lt", operator.ge, "must be less than {}", "less_than"),
+    ("lte", operator.gt, "must be less than or equal to {}", "less_than_equal"),
+)
+
+_LENGTH_RULES: Dict[str, Tuple[Tuple[str, Callable[[Any, Any], bool], str, str], ...]] = {
+    "string": (
+        ("minLength", operator.lt, "must have a minimum length of {}", "min_length"),
+        ("maxLength", operator.gt, "must have a maximum length of {}", "max_length"),
+    ),
+    "array": (
+        ("minItems", operator.lt, "must have a minimum of {} items", "min_items"),
+        ("maxItems", operator.gt, "must have a maximum of {} items", "max_items"),
+    ),
+}
+
+
+def _compile_type_check(expected_type: Any) -> FieldCheck:
+    is_valid = _TYPE_CHECKS.get(expected_type, lambda value: False)
+    message = f"must be of type '{expected_type}'"
+
+    def check_type(name: str, value: Any) -> None:
+        if not is_valid(value):
+            raise ValidationError(
+                f"Parameter '{name}' {message}",
+                field=name,
+                type="type_mismatch",
+                expected=expected_type,
+                got=type(value).__name__,
+            )
+
+    return check_type
+
+
+def _compile_bound_check(
+    limit: Any, fails: Callable[[Any, Any], bool], message: str, error_type: str
+) -> FieldCheck:
+    def check_bound(name: str, value: Any) -> None:
+        if fails(value, limit):
+            raise ValidationError(
+                f"Parameter '{name}' {message}",
+                field=name,
+                type=error_type,
+                expected=limit,
+                got=value,
+            )
+
+    return check_bound
+
+
+def _compile_length_check(
+    expected: Any, fails: Callable[[Any, Any], bool], message: str, error_type: str
+) -> FieldCheck:
+    limit = int(expected)
+
+    def check_length(name: str, value: Any) -> None:
+        if fails(len(value), limit):
+            raise ValidationError(
+                f"Parameter '{name}' {message}",
+                field=name,
+                type=error_type,
+                expected=expected,
+                got=len(value),
+            )
+
+    return check_length
+
+
+def _compile_pattern_check(pattern: Any) -> FieldCheck:
+    match = re.compile(pattern).match
+
+    def check_pattern(name: str, value: Any) -> None:
+        if not match(value):
+            raise ValidationError(
+                f"Parameter '{name}' must match the pattern '{pattern}'",
+                field=name,
+                type="pattern_mismatch",
+                expected=pattern,
+                got=value,
+            )
+
+    return check_pattern
+
+
+def _compile_items_check(item_rule: Dict[str, Any]) -> FieldCheck:
+    check_item = compile_param_rule(item_rule)
+    numeric_items = NumericItems.from_rule(item_rule)
+
+    def check_items(name: str, value: Any) -> None:
+        start = numeric_items.first_invalid(value) if numeric_items is not None else 0
+        for i, item in enumerate(value[start:] if start else value, start):
+            try:
+                check_item(name, item)
+            except ValidationError:
+                # Checks are pure, so rerun the failing item to report its indexed name
+                try:
+                    check_item(f"{name}[{i}]", item)
+                except ValidationError as e:
+                    raise ValidationError(
+                        e.message, field=e.field, type=e.type, expected=e.expected, got=e.got
+                    ) from e
+                raise
+
+    return check_items
+
+
+def _compile_enum_check(allowed: Any) -> FieldCheck:
+    message = f"must be one of: {', '.join(map(str, allowed))}"
+
+    def check_enum(name: str, value: Any) -> None:
+        if value not in allowed:
+            raise ValidationError(
+                f"Parameter '{name}' {message}",
+                field=name,
+                type="enum_mismatch",
+                expected=allowed,
+                got=value,
+            )
+
+    return check_enum
+
+
+def compile_param_rule(rule: Union[str, Dict[str, Any]]) -> FieldCheck:
+    """Compile a parameter rule into a check function.
+
+    The rule is interpreted once: the checks it declares are resolved into a
+    flat tuple of closures with their limits and regular expressions bound, so
+    calling the result does no schema lookups. The check raises exactly the
+    same errors as ``validate_param_rule``.
+
+    Args:
+        rule: The validation rule (string type or dict with validation rules)
+
+    Returns:
+        A function taking the parameter name and value
+
+    Raises:
+        re.error: If the rule has an invalid pattern
+    """
+    if isinstance(rule, str):
+        rule = {"type": rule}
+    if not isinstance(rule, dict):
+        fallback_rule = rule
+
+        def check_fallback(name: str, value: Any) -> None:
+            validate_param_rule(name, value, fallback_rule)
+
+        return check_fallback
+
+    required = bool(rule.get("required", False))
+    rule_type = rule.get("type")
+    checks: List[FieldCheck] = []
+
+    if "type" in rule:
+        checks.append(_compile_type_check(rule_type))
+
+    if rule_type == "number":
+        checks.extend(
+            _compile_bound_check(rule[key], fails, message.format(rule[key]), error_type)
+            for key, fails, message, error_type in _NUMBER_RULES
+            if key in rule
+        )
+
+    if rule_type in _LENGTH_RULES:
+        checks.extend(
+            _compile_length_check(rule[key], fails, message.format(rule[key]), error_type)
+            for key, fails, message, error_type in _LENGTH_RULES[rule_type]
+            if key in rule
+        )
+
+    if rule_type == "string" and "pattern" in rule:
+        checks.append(_compile_pattern_check(rule["pattern"]))
+
+    items = rule.get("items")
+    if rule_type == "array" and isinstance(items, dict) and "type" in items:
+        checks.append(_compile_items_check(items))
+
+    if "enum" in rule:
+        checks.append(_compile_enum_check(rule["enum"]))
+
+    compiled = tuple(checks)
+
+    if len(compiled) == 1 and not required:
+        (single_check,) = compiled
+
+        def check_single(name: str, value: Any) -> None:
+            if value is not None:
+                single_check(name, value)
+
+        return check_single
+
+    def check(name: str, value: Any) -> None:
+        if value is None:
+            if required:
+                raise ValidationError(f"Parameter '{name}' is required", field=name)
+            return
+        for field_check in compiled:
+            field_check(name, value)
+
+    return check
+
+
+def compile_schema(schema: Union[Dict[str, Any], List[str]]) -> SchemaValidator:
+    """Compile a schema into a validation function.
+
+    Compiling is done once per action when its service is registered, the
+    returned function then validates parameters without re-reading the schema.
+    It accepts and rejects the same parameters as ``validate_params``.
+
+    Args:
+        schema: The validation schema (dict of rules or list of required param names)
+
+    Returns:
+        A function validating a params dict, returning True or raising ValidationError
+    """
+    if isinstance(schema, list):
+        names = tuple(schema)
+
+        def validate_names(params: Dict[str, Any]) -> bool:
+            for param_name in names:
+                if param_name not in params:
+                    raise ValidationError(f"Parameter '{param_name}' is required", field=param_name)
+            return True
+
+        return validate_names
+
+    if not isinstance(schema, dict):
+        return lambda params: True
+
+    required = tuple(
+        name
+        for name, rule in schema.items()
+        if isinstance(rule, dict) and rule.get("required", False)
+    )
+    fields = {name: compile_param_rule(rule) for name, rule in schema.items()}
+    get_check = fields.get
+
+    def validate(params: Dict[str, Any]) -> bool:
+        for param_name in required:
+            if param_name not in params:
+                raise ValidationError(f"Parameter '{param_name}' is required", field=param_name)
+
+        for param_name, param_value in params.items():
+            check = get_check(param_name)
+            if check is not None:
+                check(param_name, param_value)
+        return True
+
+    return validate
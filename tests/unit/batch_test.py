@@ -0,0 +1,100 @@
+"""Unit tests for the batch module."""
+
+import asyncio
+
+import pytest
+
+from pylecular.batch import Batcher
+
+
+class TestBatcher:
+    """Test Batcher class."""
+
+    @pytest.fixture
+    def batches(self):
+        """Batches received by the handler."""
+        return []
+
+    @pytest.fixture
+    def handler(self, batches):
+        """Create a batch handler doubling each context."""
+
+        async def handler(contexts):
+            batches.append(list(contexts))
+            return [ctx * 2 for ctx in contexts]
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_full_batch_runs_straight_away(self, batches, handler):
+        """Test max_size calls make one batch without waiting for max_wait."""
+        call = Batcher("ml.predict", max_size=3, max_wait=10).wrap(handler)
+
+        results = await asyncio.wait_for(asyncio.gather(*(call(i) for i in range(3))), 1)
+
+        assert results == [0, 2, 4]
+        assert batches == [[0, 1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_runs_after_max_wait(self, batches, handler):
+        """Test calls short of max_size run together once max_wait has passed."""
+        batcher = Batcher("ml.predict", max_size=10, max_wait=0.01)
+        call = batcher.wrap(handler)
+
+        assert await asyncio.gather(call(1), call(2)) == [2, 4]
+        assert await call(3) == 6
+
+        assert batches == [[1, 2], [3]]
+        assert (batcher.batches, batcher.calls, batcher.pending) == (2, 3, 0)
+
+    @pytest.mark.asyncio
+    async def test_errors_map_back_to_callers(self):
+        """Test exceptions in the results fail only their own call."""
+
+        async def handler(contexts):
+            return [ValueError(ctx) if ctx < 0 else ctx for ctx in contexts]
+
+        call = Batcher("ml.predict", max_size=2).wrap(handler)
+        results = await asyncio.gather(call(1), call(-1), return_exceptions=True)
+
+        assert results[0] == 1
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_fail_the_batch(self):
+        """Test an exception raised by the handler, or a wrong result count, fails every call."""
+
+        async def failing(contexts):
+            raise RuntimeError("model unavailable")
+
+        async def short(contexts):
+            return contexts[:1]
+
+        for handler, error in ((failing, RuntimeError), (short, ValueError)):
+            call = Batcher("ml.predict", max_size=2).wrap(handler)
+            results = await asyncio.gather(call(1), call(2), return_exceptions=True)
+            assert all(isinstance(result, error) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_calls_are_left_out(self, batches, handler):
+        """Test calls cancelled while waiting are not handed to the handler."""
+        call = Batcher("ml.predict", max_size=10, max_wait=0.01).wrap(handler)
+
+        kept = asyncio.create_task(call(1))
+        dropped = asyncio.create_task(call(2))
+        await asyncio.sleep(0)
+        dropped.cancel()
+
+        assert await kept == 2
+        assert batches == [[1]]
+
+    def test_from_options(self):
+        """Test batchers are built from True or option dicts."""
+        assert Batcher.from_options("ml.predict", None) is None
+        assert Batcher.from_options("ml.predict", True).max_size == 32
+
+        batcher = Batcher.from_options("ml.predict", {"max_size": 8, "max_wait": 0.02})
+        assert (batcher.max_size, batcher.max_wait) == (8, 0.02)
+
+        with pytest.raises(ValueError):
+            Batcher("ml.predict", max_size=0)
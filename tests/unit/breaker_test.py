@@ -0,0 +1,185 @@
+"""Unit tests for the breaker module."""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from pylecular import breaker as breaker_module
+from pylecular.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerOptions,
+    CircuitBreakers,
+)
+from pylecular.context import Context
+from pylecular.metrics import MetricRegistry
+from pylecular.registry import Action, Registry
+from pylecular.transit import RemoteCallError, RequestTimeoutError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the breaker's clock with one advanced by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker class."""
+
+    def test_opens_at_failure_threshold(self, clock):
+        """Test the circuit opens once enough calls failed."""
+        breaker = CircuitBreaker(CircuitBreakerOptions(threshold=0.5, min_request_count=4))
+
+        assert breaker.record(True) is None
+        assert breaker.record(False) is None
+        assert breaker.record(True) is None
+        assert breaker.state == CLOSED
+
+        assert breaker.record(True) == OPEN
+        assert breaker.state == OPEN
+        assert breaker.available is False
+
+    def test_window_forgets_old_calls(self, clock):
+        """Test failures older than the window no longer count."""
+        breaker = CircuitBreaker(CircuitBreakerOptions(min_request_count=2, window=10))
+
+        breaker.record(True)
+        clock[0] += 11
+        assert breaker.record(True) is None
+        assert (breaker.requests, breaker.failures) == (1, 1)
+
+    def test_half_open_trial_closes(self, clock):
+        """Test a successful trial call after the cool-down closes the circuit."""
+        breaker = CircuitBreaker(CircuitBreakerOptions(min_request_count=1, half_open_time=5))
+        breaker.record(True)
+
+        clock[0] += 5
+        assert breaker.available is True
+        assert breaker.acquire() == HALF_OPEN
+        # Only one trial call at a time
+        assert breaker.available is False
+
+        assert breaker.record(False) == CLOSED
+        assert breaker.available is True
+        assert breaker.requests == 0
+
+    def test_half_open_trial_reopens(self, clock):
+        """Test a failed trial call opens the circuit for another cool-down."""
+        breaker = CircuitBreaker(CircuitBreakerOptions(min_request_count=1, half_open_time=5))
+        breaker.record(True)
+        clock[0] += 5
+        breaker.acquire()
+
+        assert breaker.record(True) == OPEN
+        assert breaker.available is False
+        clock[0] += 5
+        assert breaker.available is True
+
+    def test_release_frees_trial(self, clock):
+        """Test a trial call ending without an outcome lets another one through."""
+        breaker = CircuitBreaker(CircuitBreakerOptions(min_request_count=1, half_open_time=5))
+        breaker.record(True)
+        clock[0] += 5
+        breaker.acquire()
+
+        breaker.release()
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.available is True
+
+    def test_invalid_options(self):
+        """Test thresholds outside 0..1 and empty windows are rejected."""
+        with pytest.raises(ValueError):
+            CircuitBreakerOptions(threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreakerOptions(window=0)
+
+
+class TestCircuitBreakers:
+    """Test CircuitBreakers class."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create a registry with one action hosted by two remote nodes."""
+        registry = Registry(node_id="local-node")
+        registry.add_action(Action("math.add", "node-1", is_local=False))
+        registry.add_action(Action("math.add", "node-2", is_local=False))
+        return registry
+
+    @pytest.fixture
+    def breakers(self, registry):
+        """Create breakers opening on the first failure."""
+        return CircuitBreakers(
+            CircuitBreakerOptions(min_request_count=1, half_open_time=5),
+            registry=registry,
+            metrics=MetricRegistry(),
+            emit=AsyncMock(),
+            logger=Mock(),
+        )
+
+    @pytest.mark.asyncio
+    async def test_failure_opens_and_skips_endpoint(self, clock, registry, breakers):
+        """Test an open endpoint is skipped by selection until its trial call."""
+        failing = registry.get_all_actions("math.add")[0]
+        handler = AsyncMock(side_effect=RequestTimeoutError("math.add"))
+
+        with pytest.raises(RequestTimeoutError):
+            await breakers.call(failing, handler, Context("ctx-1"))
+
+        assert registry.open_circuits == {failing}
+        assert {registry.get_action("math.add").node_id for _ in range(4)} == {"node-2"}
+        breakers.emit.assert_awaited_once_with(
+            "$circuit-breaker.opened", {"action": "math.add", "node_id": "node-1"}
+        )
+        labels = {"action": "math.add", "node": "node-1", "state": OPEN}
+        assert breakers.metrics.get("circuit_breaker.transitions", labels) == 1
+
+        clock[0] += 5
+        assert failing in {registry.get_action("math.add") for _ in range(4)}
+        assert await breakers.call(failing, AsyncMock(return_value=3), Context("ctx-2")) == 3
+        assert registry.open_circuits == set()
+        assert breakers.emit.await_args_list[-1].args[0] == "$circuit-breaker.closed"
+
+    @pytest.mark.asyncio
+    async def test_unregistered_node_leaves_open_circuits(self, registry, breakers):
+        """Test a node that leaves while its circuit is open is no longer tracked."""
+        failing = registry.get_all_actions("math.add")[0]
+        with pytest.raises(RequestTimeoutError):
+            await breakers.call(
+                failing, AsyncMock(side_effect=RequestTimeoutError("math.add")), Context("ctx-1")
+            )
+        assert registry.open_circuits == {failing}
+
+        registry.unregister_node("node-1")
+
+        assert registry.open_circuits == set()
+
+    @pytest.mark.asyncio
+    async def test_only_endpoint_failures_count(self, registry, breakers):
+        """Test errors raised by the remote handler itself do not open the circuit."""
+        endpoint = registry.get_all_actions("math.add")[0]
+
+        with pytest.raises(RemoteCallError):
+            await breakers.call(
+                endpoint, AsyncMock(side_effect=RemoteCallError("bad input")), Context("ctx-1")
+            )
+
+        assert endpoint.breaker.state == CLOSED
+        assert registry.open_circuits == set()
+
+    @pytest.mark.asyncio
+    async def test_all_open_returns_none(self, registry, breakers):
+        """Test no endpoint is selected when every circuit is open."""
+        for endpoint in registry.get_all_actions("math.add"):
+            with pytest.raises(RequestTimeoutError):
+                await breakers.call(
+                    endpoint,
+                    AsyncMock(side_effect=RequestTimeoutError("math.add")),
+                    Context("ctx-1"),
+                )
+
+        assert registry.get_action("math.add") is None
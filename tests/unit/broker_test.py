@@ -1,16 +1,42 @@
+import asyncio
+import os
+import threading
+import time
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 import pytest_asyncio
 
+from pylecular.breaker import CircuitOpenError
 from pylecular.broker import Broker
+from pylecular.context import Context
 from pylecular.decorators import action, event
 from pylecular.lifecycle import Lifecycle
 from pylecular.node import NodeCatalog
+from pylecular.rate_limit import RateLimiter, RateLimitExceededError
 from pylecular.registry import Registry
+from pylecular.retry import RetryPolicy
 from pylecular.service import Service
 from pylecular.settings import Settings
-from pylecular.transit import Transit
+from pylecular.transit import (
+    RemoteCallError,
+    RequestRejectedError,
+    RequestSkippedError,
+    RequestTimeoutError,
+    Transit,
+)
+
+
+class SquareService(Service):
+    """Service pickled into process workers, so defined at module level."""
+
+    def __init__(self):
+        super().__init__(name="square")
+        self.offset = 1
+
+    @action(executor="process")
+    def compute(self, ctx):
+        return {"result": ctx.params["x"] ** 2 + self.offset, "pid": os.getpid()}
 
 
 class TestService(Service):
@@ -43,6 +69,7 @@ def mock_transit():
 def mock_registry():
     registry = Mock(spec=Registry)
     registry.__services__ = {}
+    registry.get_service_actions.return_value = []
     return registry
 
 
@@ -105,27 +132,34 @@ async def test_broker_register_service(broker, mock_registry, mock_node_catalog)
 
 @pytest.mark.asyncio
 async def test_broker_call_local_action(broker, mock_registry, mock_lifecycle):
-    endpoint = Mock(is_local=True)
+    endpoint = Mock(is_local=True, timeout=None, retry_policy=None, coalesce=None)
     endpoint.handler = AsyncMock(return_value="result")
     mock_registry.get_action.return_value = endpoint
 
-    context = Mock()
+    context = Context("ctx-1")
     mock_lifecycle.create_context.return_value = context
 
     result = await broker.call("test.hello", {"param": "value"})
 
     assert result == "result"
-    mock_registry.get_action.assert_called_once_with("test.hello")
+    mock_registry.get_action.assert_called_once_with("test.hello", context)
     endpoint.handler.assert_called_once_with(context)
 
 
 @pytest.mark.asyncio
 async def test_broker_call_remote_action(broker, mock_registry, mock_transit, mock_lifecycle):
-    endpoint = Mock(is_local=False, node_id="remote-node")
+    endpoint = Mock(
+        is_local=False,
+        node_id="remote-node",
+        timeout=None,
+        retry_policy=None,
+        coalesce=None,
+        hedge=None,
+    )
     mock_registry.get_action.return_value = endpoint
     mock_transit.request.return_value = "remote result"
 
-    context = Mock()
+    context = Context("ctx-1")
     mock_lifecycle.create_context.return_value = context
 
     result = await broker.call("remote.action")
@@ -212,18 +246,18 @@ async def test_wait_for_services_found_remotely(broker, mock_registry, mock_node
 @pytest.mark.asyncio
 async def test_broker_call_local_action_with_error(broker, mock_registry, mock_lifecycle):
     # Set up a mock endpoint that raises an exception
-    endpoint = Mock(is_local=True)
+    endpoint = Mock(is_local=True, timeout=None, retry_policy=None, coalesce=None)
     endpoint.handler = AsyncMock(side_effect=ValueError("Test error"))
     mock_registry.get_action.return_value = endpoint
 
-    context = Mock()
+    context = Context("ctx-1")
     mock_lifecycle.create_context.return_value = context
 
     # Verify that the error is propagated
     with pytest.raises(ValueError, match="Test error"):
         await broker.call("test.error")
 
-    mock_registry.get_action.assert_called_once_with("test.error")
+    mock_registry.get_action.assert_called_once_with("test.error", context)
     endpoint.handler.assert_called_once_with(context)
 
 
@@ -231,11 +265,19 @@ async def test_broker_call_local_action_with_error(broker, mock_registry, mock_l
 async def test_broker_call_remote_action_with_error(
     broker, mock_registry, mock_transit, mock_lifecycle
 ):
-    endpoint = Mock(is_local=False, node_id="remote-node", name="remote.action")
+    endpoint = Mock(
+        is_local=False,
+        node_id="remote-node",
+        name="remote.action",
+        timeout=None,
+        retry_policy=None,
+        coalesce=None,
+        hedge=None,
+    )
     mock_registry.get_action.return_value = endpoint
     mock_transit.request.side_effect = Exception("RemoteError: Test error")
 
-    context = Mock()
+    context = Context("ctx-1")
     mock_lifecycle.create_context.return_value = context
 
     # Verify that the remote error is propagated
@@ -243,3 +285,388 @@ async def test_broker_call_remote_action_with_error(
         await broker.call("remote.error")
 
     mock_transit.request.assert_called_once_with(endpoint, context)
+
+
+@pytest.mark.asyncio
+async def test_broker_call_local_action_timeout(broker, mock_registry, mock_lifecycle):
+    async def slow_handler(ctx):
+        await asyncio.sleep(1)
+
+    endpoint = Mock(
+        is_local=True,
+        timeout=None,
+        retry_policy=None,
+        coalesce=None,
+        params_schema=None,
+        handler=slow_handler,
+    )
+    mock_registry.get_action.return_value = endpoint
+    mock_lifecycle.create_context.return_value = Context("ctx-1")
+
+    with pytest.raises(RequestTimeoutError, match="timed out"):
+        await broker.call("test.slow", timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_broker_call_timeout_defaults(broker, mock_registry, mock_transit, mock_lifecycle):
+    endpoint = Mock(
+        is_local=False,
+        node_id="remote-node",
+        timeout=2.0,
+        retry_policy=None,
+        coalesce=None,
+        hedge=None,
+    )
+    mock_registry.get_action.return_value = endpoint
+
+    async def remaining_after_call(**kwargs):
+        context = Context("ctx-1")
+        mock_lifecycle.create_context.return_value = context
+        await broker.call("remote.action", **kwargs)
+        return context.remaining()
+
+    assert 1.9 < await remaining_after_call() <= 2.0
+    assert 0.4 < await remaining_after_call(timeout=0.5) <= 0.5
+    assert await remaining_after_call(timeout=0) is None
+
+    endpoint.timeout = None
+    assert 4.9 < await remaining_after_call() <= broker.settings.request_timeout
+
+
+@pytest.mark.asyncio
+async def test_broker_call_inherits_parent_deadline(broker, mock_registry, mock_transit):
+    endpoint = Mock(
+        is_local=False,
+        node_id="remote-node",
+        timeout=None,
+        retry_policy=None,
+        coalesce=None,
+        hedge=None,
+    )
+    mock_registry.get_action.return_value = endpoint
+    broker.lifecycle = Lifecycle(broker)
+    parent = Context("parent-1", deadline=time.monotonic() + 1)
+
+    await broker.call("remote.action", timeout=10, parent_ctx=parent)
+
+    context = mock_transit.request.call_args[0][1]
+    assert context.parent_id == "parent-1"
+    assert context.deadline == parent.deadline
+
+    parent.deadline = time.monotonic() - 1
+    with pytest.raises(RequestSkippedError):
+        await broker.call("remote.action", parent_ctx=parent)
+
+
+def remote_endpoint(node_id, retry_policy=None, coalesce=None, hedge=None):
+    endpoint = Mock(
+        is_local=False,
+        node_id=node_id,
+        timeout=None,
+        retry_policy=retry_policy,
+        coalesce=coalesce,
+        hedge=hedge,
+    )
+    endpoint.name = "remote.action"
+    return endpoint
+
+
+@pytest.mark.asyncio
+async def test_broker_call_retries_on_another_node(
+    broker, mock_registry, mock_transit, mock_lifecycle
+):
+    first, second = remote_endpoint("node-1"), remote_endpoint("node-2")
+    mock_registry.get_action.side_effect = [first, second]
+    mock_transit.request.side_effect = [RequestRejectedError("remote.action", "node-1"), "ok"]
+    mock_lifecycle.create_context.return_value = Context("ctx-1")
+    broker.settings.retry_policy = RetryPolicy(retries=2, delay=0.001)
+
+    assert await broker.call("remote.action") == "ok"
+
+    assert mock_registry.get_action.call_args.kwargs["exclude"] == {"node-1"}
+    assert mock_transit.request.call_args[0][0] is second
+    assert broker.metrics.get("broker.call.retries", {"action": "remote.action"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_broker_call_retry_limits(broker, mock_registry, mock_transit, mock_lifecycle):
+    mock_registry.get_action.return_value = remote_endpoint(
+        "node-1", RetryPolicy(retries=2, delay=0.001)
+    )
+    mock_lifecycle.create_context.side_effect = lambda **kwargs: Context("ctx-1")
+
+    # Errors without the retryable flag are raised straight away
+    mock_transit.request.side_effect = RemoteCallError("boom")
+    with pytest.raises(RemoteCallError):
+        await broker.call("remote.action")
+    assert mock_transit.request.call_count == 1
+
+    # Retryable errors are retried until the retries run out
+    mock_transit.request.reset_mock()
+    mock_transit.request.side_effect = RemoteCallError("boom", retryable=True)
+    with pytest.raises(RemoteCallError):
+        await broker.call("remote.action")
+    assert mock_transit.request.call_count == 3
+
+    # No retry is made when the backoff would outlast the deadline
+    mock_transit.request.reset_mock()
+    with pytest.raises(RemoteCallError):
+        await broker.call("remote.action", timeout=0.0005)
+    assert mock_transit.request.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_broker_call_all_circuits_open(mock_transit, mock_node_catalog, mock_lifecycle):
+    registry = Mock(spec=Registry)
+    registry.get_action.return_value = None
+    registry.get_all_actions.return_value = [remote_endpoint("node-1")]
+    broker = Broker(
+        "test-node",
+        settings=Settings(transporter="mock://localhost:4222", circuit_breaker={}),
+        transit=mock_transit,
+        registry=registry,
+        node_catalog=mock_node_catalog,
+        lifecycle=mock_lifecycle,
+    )
+
+    with pytest.raises(CircuitOpenError):
+        await broker.call("remote.action")
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_broadcast_local(broker, mock_registry, mock_transit, mock_lifecycle):
+    local_endpoint = Mock(is_local=True, handler=AsyncMock(return_value="done"))
+    remote_endpoint = Mock(is_local=False)
+    mock_registry.get_all_events.return_value = [local_endpoint, remote_endpoint]
+
+    assert await broker.broadcast_local("$circuit-breaker.opened", {"action": "a"}) == ["done"]
+
+    local_endpoint.handler.assert_called_once()
+    mock_transit.send_event.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_broker_register_exposes_bulkhead_gauges(
+    mock_transit, mock_node_catalog, mock_lifecycle
+):
+    class MLService(Service):
+        def __init__(self):
+            super().__init__(name="ml")
+
+        @action(bulkhead={"concurrency": 1, "max_queue_size": 5})
+        async def predict(self, _):
+            return "predicted"
+
+    broker = Broker(
+        "test-node",
+        settings=Settings(transporter="mock://localhost:4222"),
+        transit=mock_transit,
+        node_catalog=mock_node_catalog,
+        lifecycle=mock_lifecycle,
+    )
+    await broker.register(MLService())
+
+    labels = {"action": "ml.predict"}
+    assert broker.metrics.get("action.bulkhead.in_flight", labels) == 0
+    assert broker.metrics.get("action.bulkhead.queued", labels) == 0
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_call_local_action_rate_limited(broker, mock_registry, mock_lifecycle):
+    endpoint = Mock(
+        is_local=True,
+        timeout=None,
+        retry_policy=None,
+        coalesce=None,
+        params_schema=None,
+        handler=AsyncMock(return_value="ok"),
+        rate_limiter=RateLimiter(rate=1, burst=2),
+    )
+    endpoint.name = "test.action"
+    mock_registry.get_action.return_value = endpoint
+    mock_lifecycle.create_context.side_effect = lambda **kwargs: Context("ctx-1")
+
+    assert await broker.call("test.action") == "ok"
+    assert await broker.call("test.action") == "ok"
+    with pytest.raises(RateLimitExceededError):
+        await broker.call("test.action")
+
+    assert endpoint.handler.call_count == 2
+    assert broker.metrics.get("action.rate_limit.rejected", {"action": "test.action"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_broker_call_cached_action(mock_transit, mock_node_catalog, mock_lifecycle):
+    registry = Mock(spec=Registry)
+    registry.__services__ = {}
+    registry.get_service_actions.return_value = []
+    endpoint = remote_endpoint("node-1")
+    endpoint.cache = {"keys": ["id"], "ttl": 30}
+    registry.get_action.return_value = endpoint
+    mock_lifecycle.create_context.side_effect = lambda **kwargs: Context("ctx-1")
+    mock_transit.request.return_value = {"id": 1, "name": "Ada"}
+    broker = Broker(
+        "test-node",
+        settings=Settings(transporter="mock://localhost:4222", cacher=True),
+        transit=mock_transit,
+        registry=registry,
+        node_catalog=mock_node_catalog,
+        lifecycle=mock_lifecycle,
+    )
+
+    assert await broker.call("users.get", {"id": 1}) == {"id": 1, "name": "Ada"}
+    assert await broker.call("users.get", {"id": 1, "fields": ["name"]}) == {"id": 1, "name": "Ada"}
+    await broker.call("users.get", {"id": 2})
+
+    assert mock_transit.request.call_count == 2
+    assert broker.metrics.get("cache.hits", {"action": "users.get"}) == 1
+    assert broker.metrics.get("cache.misses", {"action": "users.get"}) == 2
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_start_listens_to_cache_clean(mock_transit, mock_node_catalog):
+    broker = Broker(
+        "test-node",
+        settings=Settings(transporter="mock://localhost:4222", cacher=True),
+        transit=mock_transit,
+        node_catalog=mock_node_catalog,
+    )
+    broker.cacher.set("users.get:1", 1)
+
+    await broker.start()
+    await broker.broadcast("cache.clean", {"pattern": "users.*"})
+
+    assert len(broker.cacher) == 0
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_call_coalesces_identical_calls(
+    broker, mock_registry, mock_transit, mock_lifecycle
+):
+    mock_registry.get_action.return_value = remote_endpoint("node-1", coalesce={"keys": ["id"]})
+    mock_lifecycle.create_context.side_effect = lambda **kwargs: Context("ctx-1")
+    released = asyncio.Event()
+
+    async def request(endpoint, context):
+        await released.wait()
+        return {"id": 42}
+
+    mock_transit.request.side_effect = request
+
+    calls = [
+        asyncio.create_task(broker.call("remote.action", {"id": 42, "page": page}))
+        for page in range(3)
+    ]
+    await asyncio.sleep(0)
+    released.set()
+
+    assert await asyncio.gather(*calls) == [{"id": 42}] * 3
+    assert mock_transit.request.call_count == 1
+    assert broker.metrics.get("broker.call.coalesced", {"action": "remote.action"}) == 2
+
+
+@pytest.mark.asyncio
+async def test_broker_call_hedges_slow_remote_calls(
+    broker, mock_registry, mock_transit, mock_lifecycle
+):
+    hedge = {"delay": 0.01, "budget": 1}
+    slow, fast = remote_endpoint("slow", hedge=hedge), remote_endpoint("fast", hedge=hedge)
+    mock_registry.get_action.side_effect = [slow, fast]
+    mock_lifecycle.create_context.return_value = Context("ctx-1")
+
+    async def request(endpoint, context):
+        await asyncio.sleep(1 if endpoint.node_id == "slow" else 0)
+        return endpoint.node_id
+
+    mock_transit.request.side_effect = request
+
+    assert await broker.call("remote.action") == "fast"
+    assert mock_registry.get_action.call_args.kwargs["exclude"] == {"slow"}
+    assert broker.metrics.get("broker.call.hedge_won", {"action": "remote.action"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_broker_call_batched_action(mock_transit, mock_node_catalog):
+    class MLService(Service):
+        def __init__(self):
+            super().__init__(name="ml")
+            self.batches = []
+
+        @action(batch={"max_size": 3, "max_wait": 0.01})
+        async def predict(self, contexts):
+            self.batches.append(len(contexts))
+            return [ctx.params["x"] * 2 for ctx in contexts]
+
+    broker = Broker(
+        "test-node",
+        settings=Settings(transporter="mock://localhost:4222"),
+        transit=mock_transit,
+        node_catalog=mock_node_catalog,
+    )
+    service = MLService()
+    await broker.register(service)
+
+    results = await asyncio.gather(*(broker.call("ml.predict", {"x": x}) for x in range(4)))
+
+    assert results == [0, 2, 4, 6]
+    assert service.batches == [3, 1]
+    assert broker.metrics.get("action.batch.size", {"action": "ml.predict"}) == 2.0
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_call_executor_actions(mock_transit, mock_node_catalog):
+    class ReportService(Service):
+        def __init__(self):
+            super().__init__(name="report")
+
+        @action()
+        def status(self, ctx):
+            return "ok"
+
+        @action(executor="thread")
+        def render(self, ctx):
+            return threading.current_thread().name
+
+    broker = Broker(
+        "test-node",
+        settings=Settings(transporter="mock://localhost:4222", thread_pool_size=2),
+        transit=mock_transit,
+        node_catalog=mock_node_catalog,
+    )
+    await broker.register(ReportService())
+
+    assert await broker.call("report.status") == "ok"
+    assert (await broker.call("report.render")).startswith("pylecular-action")
+    assert broker.executors["thread"].max_workers == 2
+    assert broker.metrics.get("executor.queued", {"executor": "thread"}) == 0
+    assert broker.metrics.get("executor.wait_time", {"executor": "thread"}).count == 1
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_broker_call_process_executor_action(mock_transit, mock_node_catalog):
+    broker = Broker(
+        "test-node",
+        settings=Settings(transporter="mock://localhost:4222", process_pool_size=1),
+        transit=mock_transit,
+        node_catalog=mock_node_catalog,
+    )
+    await broker.register(SquareService())
+
+    try:
+        result = await broker.call("square.compute", params={"x": 3})
+        assert result["result"] == 10
+        assert result["pid"] != os.getpid()
+    finally:
+        await broker.stop()
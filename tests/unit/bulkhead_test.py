@@ -0,0 +1,100 @@
+"""Unit tests for the bulkhead module."""
+
+import asyncio
+
+import pytest
+
+from pylecular.bulkhead import Bulkhead, QueueIsFullError
+
+
+class TestBulkhead:
+    """Test Bulkhead class."""
+
+    @pytest.fixture
+    def gate(self):
+        """Create an event held by the handler until released."""
+        return asyncio.Event()
+
+    @pytest.fixture
+    def handler(self, gate):
+        """Create a handler that waits for the gate and returns its argument."""
+
+        async def handler(ctx):
+            await gate.wait()
+            return ctx
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_and_queues_in_order(self, gate, handler):
+        """Test calls over the limit wait in the queue and start in arrival order."""
+        bulkhead = Bulkhead("ml.predict", concurrency=2, max_queue_size=5)
+        started = []
+
+        async def tracking_handler(ctx):
+            started.append(ctx)
+            return await handler(ctx)
+
+        tasks = [asyncio.create_task(bulkhead.run(tracking_handler, i)) for i in range(5)]
+        await asyncio.sleep(0)
+
+        assert (bulkhead.in_flight, bulkhead.queued) == (2, 3)
+        assert started == [0, 1]
+
+        gate.set()
+        assert await asyncio.gather(*tasks) == [0, 1, 2, 3, 4]
+        assert started == [0, 1, 2, 3, 4]
+        assert (bulkhead.in_flight, bulkhead.queued) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self, gate, handler):
+        """Test calls arriving while the queue is full fail straight away."""
+        bulkhead = Bulkhead("ml.predict", concurrency=1, max_queue_size=1)
+        tasks = [asyncio.create_task(bulkhead.run(handler, i)) for i in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(QueueIsFullError, match="ml") as exc_info:
+            await bulkhead.run(handler, 2)
+        assert exc_info.value.retryable is True
+
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self, gate, handler):
+        """Test a call cancelled while queued frees its place."""
+        bulkhead = Bulkhead("ml.predict", concurrency=1, max_queue_size=2)
+        running = asyncio.create_task(bulkhead.run(handler, 0))
+        waiting = asyncio.create_task(bulkhead.run(handler, 1))
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert bulkhead.queued == 0
+
+        gate.set()
+        assert await running == 0
+        assert bulkhead.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_release_the_slot(self):
+        """Test a failing call frees its slot for the next one."""
+        bulkhead = Bulkhead("ml.predict", concurrency=1)
+
+        async def failing(ctx):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await bulkhead.run(failing, None)
+        assert bulkhead.in_flight == 0
+
+    def test_from_options(self):
+        """Test bulkheads are only built from option dicts."""
+        assert Bulkhead.from_options("ml.predict", None) is None
+        assert Bulkhead.from_options("ml.predict", False) is None
+
+        bulkhead = Bulkhead.from_options("ml.predict", {"concurrency": 3, "max_queue_size": 7})
+        assert (bulkhead.concurrency, bulkhead.max_queue_size) == (3, 7)
+
+        with pytest.raises(ValueError):
+            Bulkhead("ml.predict", concurrency=0)
@@ -0,0 +1,372 @@
+"""Unit tests for the cacher module."""
+
+import asyncio
+import sqlite3
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from pylecular import cacher as cacher_module
+from pylecular.cacher import (
+    MISS,
+    Cacher,
+    CacherService,
+    MemoryCacher,
+    SQLiteCacher,
+    TieredCacher,
+)
+from pylecular.context import Context
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the cacher's clock with one advanced by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(cacher_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestCacheKey:
+    """Test cache key generation."""
+
+    def test_key_from_every_param(self):
+        """Test keys cover every param when none are selected, in any order."""
+        cacher = MemoryCacher()
+
+        first = cacher.get_cache_key("users.find", {"a": 1, "b": [2]}, {})
+        second = cacher.get_cache_key("users.find", {"b": [2], "a": 1}, {})
+
+        assert first == second == 'users.find:{"a":1,"b":[2]}'
+
+    def test_key_from_selected_params_and_meta(self):
+        """Test selected params, nested params and meta entries make the key."""
+        cacher = MemoryCacher()
+        params = {"id": 5, "filter": {"active": True}, "ignored": "x"}
+        meta = {"tenant": "acme"}
+
+        key = cacher.get_cache_key("users.get", params, meta, ["id", "filter.active", "#tenant"])
+
+        assert key == "users.get:5|True|acme"
+
+
+class TestMemoryCacher:
+    """Test MemoryCacher class."""
+
+    def test_get_and_set(self):
+        """Test cached results are returned, including None."""
+        cacher = MemoryCacher()
+        cacher.set("users.get:1", None)
+
+        assert cacher.get("users.get:1") is None
+        assert cacher.get("users.get:2") is MISS
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted over max_size."""
+        cacher = MemoryCacher(max_size=2)
+        cacher.set("a", 1)
+        cacher.set("b", 2)
+        cacher.get("a")
+        cacher.set("c", 3)
+
+        assert len(cacher) == 2
+        assert cacher.get("b") is MISS
+        assert (cacher.get("a"), cacher.get("c")) == (1, 3)
+
+    def test_evicts_over_max_memory(self):
+        """Test entries are evicted once their size exceeds max_memory."""
+        value = "x" * 1000
+        cacher = MemoryCacher(max_memory=2500)
+        for key in ("a", "b", "c"):
+            cacher.set(key, value)
+
+        assert len(cacher) == 2
+        assert cacher.get("a") is MISS
+        assert cacher.memory <= 2500
+
+        # Results larger than the whole cache are not kept
+        cacher.set("huge", "x" * 5000)
+        assert cacher.get("huge") is MISS
+        assert len(cacher) == 2
+
+    def test_entries_expire(self, clock):
+        """Test entries are not returned after their ttl."""
+        cacher = MemoryCacher(ttl=10)
+        cacher.set("a", 1)
+        cacher.set("b", 2, ttl=60)
+
+        clock[0] += 30
+
+        assert cacher.get("a") is MISS
+        assert cacher.get("b") == 2
+        assert len(cacher) == 1
+
+    def test_clean_by_pattern(self):
+        """Test clean removes the entries matching a glob pattern."""
+        cacher = MemoryCacher()
+        cacher.set("users.get:1", 1)
+        cacher.set("users.find:{}", [])
+        cacher.set("posts.get:1", 1)
+
+        assert cacher.clean("users.*") == 2
+        assert cacher.get("posts.get:1") == 1
+
+        assert cacher.clean() == 1
+        assert len(cacher) == 0
+
+    def test_from_options(self):
+        """Test cachers are built from True, option dicts or instances."""
+        assert Cacher.from_options(None) is None
+        assert Cacher.from_options(False) is None
+        assert isinstance(Cacher.from_options(True), MemoryCacher)
+
+        cacher = Cacher.from_options({"max_size": 10, "ttl": 5})
+        assert (cacher.max_size, cacher.ttl) == (10, 5)
+        assert Cacher.from_options(cacher) is cacher
+
+    def test_from_options_with_shared_tier(self, tmp_path):
+        """Test a shared option puts a SQLite tier behind the memory cache."""
+        path = str(tmp_path / "cache.db")
+
+        cacher = Cacher.from_options({"max_size": 10, "shared": path})
+        assert isinstance(cacher, TieredCacher)
+        assert cacher.first.max_size == 10
+        assert cacher.second.path == path
+
+        cacher = Cacher.from_options({"shared": {"path": path, "max_size": 50}})
+        assert cacher.second.max_size == 50
+
+
+@pytest.fixture
+def wall_clock(monkeypatch):
+    """Replace the wall clock shared by processes with one advanced by hand."""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(cacher_module.time, "time", lambda: now[0])
+    return now
+
+
+class TestSQLiteCacher:
+    """Test SQLiteCacher class."""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        """Path of the shared database."""
+        return str(tmp_path / "cache.db")
+
+    def test_shared_between_instances(self, path):
+        """Test entries written by one process are read by another."""
+        writer, reader = SQLiteCacher(path), SQLiteCacher(path)
+        writer.set("users.get:1", {"id": 1, "tags": ["a"]})
+        writer.set("users.get:2", None)
+
+        assert reader.get("users.get:1") == {"id": 1, "tags": ["a"]}
+        assert reader.get("users.get:2") is None
+        assert reader.get("users.get:3") is MISS
+        assert reader.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        writer.close()
+        reader.close()
+
+    def test_entries_expire(self, path, wall_clock):
+        """Test entries are not returned after their ttl and report the time left."""
+        cacher = SQLiteCacher(path, ttl=10)
+        cacher.set("a", 1)
+        cacher.set("b", 2, ttl=60)
+
+        wall_clock[0] += 30
+
+        assert cacher.get("a") is MISS
+        assert cacher.get_entry("b") == (2, 30)
+        cacher.close()
+
+    def test_evicts_expired_then_oldest(self, path, wall_clock, monkeypatch):
+        """Test eviction passes drop expired entries and the oldest over max_size."""
+        monkeypatch.setattr(SQLiteCacher, "EVICT_INTERVAL", 5)
+        cacher = SQLiteCacher(path, max_size=3)
+        cacher.set("expiring", 0, ttl=1)
+        for i in range(4):
+            wall_clock[0] += 2
+            cacher.set(f"key-{i}", i)
+
+        assert len(cacher) == 3
+        assert cacher.get("expiring") is MISS
+        assert cacher.get("key-0") is MISS
+        assert [cacher.get(f"key-{i}") for i in range(1, 4)] == [1, 2, 3]
+        cacher.close()
+
+    def test_skips_results_not_stored_as_json(self, path):
+        """Test results that cannot be serialized are not cached."""
+        cacher = SQLiteCacher(path)
+        cacher.set("a", object())
+
+        assert cacher.get("a") is MISS
+        cacher.close()
+
+    def test_clean_by_pattern(self, path):
+        """Test clean removes the entries matching a glob pattern."""
+        cacher = SQLiteCacher(path)
+        cacher.set("users.get:1", 1)
+        cacher.set("posts.get:1", 1)
+
+        assert cacher.clean("users.*") == 1
+        assert cacher.get("posts.get:1") == 1
+        cacher.close()
+
+    def test_reconnects_after_fork(self, path, monkeypatch):
+        """Test a forked child opens its own connection."""
+        cacher = SQLiteCacher(path)
+        parent_connection = cacher.connection
+
+        monkeypatch.setattr(cacher_module.os, "getpid", lambda: -1)
+        assert cacher.connection is not parent_connection
+        cacher.close()
+        parent_connection.close()
+
+    @pytest.mark.asyncio
+    async def test_async_access_runs_on_the_cache_thread(self, path, monkeypatch):
+        """Test async reads and writes query the database off the event loop."""
+        cacher = SQLiteCacher(path)
+        threads = []
+        get_entry = cacher.get_entry
+
+        def recording_get_entry(key):
+            threads.append(threading.current_thread().name)
+            return get_entry(key)
+
+        monkeypatch.setattr(cacher, "get_entry", recording_get_entry)
+
+        await cacher.set_async("users.get:1", {"id": 1}, ttl=60)
+        assert await cacher.get_async("users.get:1") == {"id": 1}
+        assert await cacher.get_async("users.get:2") is MISS
+        assert all(thread.startswith("pylecular-cache") for thread in threads)
+        assert len(threads) == 2
+        cacher.close()
+
+    @pytest.mark.asyncio
+    async def test_clean_async_runs_on_the_cache_thread(self, path, monkeypatch):
+        """Test async cleaning deletes the matching entries off the event loop."""
+        cacher = SQLiteCacher(path)
+        cacher.set("users.get:1", 1)
+        cacher.set("posts.get:1", 1)
+        threads = []
+        clean = cacher.clean
+
+        def recording_clean(pattern):
+            threads.append(threading.current_thread().name)
+            return clean(pattern)
+
+        monkeypatch.setattr(cacher, "clean", recording_clean)
+
+        assert await cacher.clean_async("users.*") == 1
+        assert threads[0].startswith("pylecular-cache")
+        assert cacher.get("posts.get:1") == 1
+        cacher.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_background_writes_are_logged(self, path, monkeypatch):
+        """Test errors of queued writes, such as a failed eviction, reach the logger."""
+        monkeypatch.setattr(SQLiteCacher, "EVICT_INTERVAL", 1)
+        cacher = SQLiteCacher(path)
+        cacher.init(Mock())
+
+        def evict():
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(cacher, "evict", evict)
+
+        await cacher.set_async("users.get:1", 1)
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            if cacher.logger.error.called:
+                break
+
+        assert "database is locked" in cacher.logger.error.call_args[0][0]
+        cacher.set("users.get:2", 2)
+        cacher.close()
+
+    @pytest.mark.asyncio
+    async def test_close_waits_for_queued_writes(self, path):
+        """Test writes queued by set_async are stored before the cacher closes."""
+        cacher = SQLiteCacher(path)
+        for i in range(10):
+            await cacher.set_async(f"key-{i}", i)
+        cacher.close()
+
+        reader = SQLiteCacher(path)
+        assert len(reader) == 10
+        reader.close()
+
+
+class TestTieredCacher:
+    """Test TieredCacher class."""
+
+    def test_second_tier_hits_are_copied_to_the_first(self, tmp_path, wall_clock):
+        """Test results found in the shared tier are kept in memory for the time left."""
+        path = str(tmp_path / "cache.db")
+        other_process = SQLiteCacher(path)
+        other_process.set("users.get:1", {"id": 1}, ttl=60)
+
+        cacher = TieredCacher(MemoryCacher(), SQLiteCacher(path))
+        assert cacher.get("users.get:1") == {"id": 1}
+
+        _, expires_at, _ = cacher.first._entries["users.get:1"]
+        assert expires_at - cacher_module.time.monotonic() == pytest.approx(60, abs=1)
+
+        cacher.set("users.get:2", {"id": 2})
+        assert other_process.get("users.get:2") == {"id": 2}
+
+        cacher.clean("users.*")
+        assert len(cacher.first) == 0
+        assert other_process.get("users.get:1") is MISS
+
+        other_process.close()
+        cacher.second.close()
+
+    @pytest.mark.asyncio
+    async def test_async_get_and_set(self, tmp_path):
+        """Test async access reads memory first and reaches the shared tier in the background."""
+        path = str(tmp_path / "cache.db")
+        other_process = SQLiteCacher(path)
+        other_process.set("users.get:1", {"id": 1}, ttl=60)
+
+        cacher = TieredCacher(MemoryCacher(), SQLiteCacher(path))
+        assert await cacher.get_async("users.get:1") == {"id": 1}
+        assert "users.get:1" in cacher.first._entries
+
+        await cacher.set_async("users.get:2", {"id": 2})
+        assert cacher.first.get("users.get:2") == {"id": 2}
+
+        assert await cacher.clean_async("users.get:1") == 1
+        assert len(cacher.first) == 1
+        cacher.second.close()
+        assert other_process.get("users.get:1") is MISS
+        assert other_process.get("users.get:2") == {"id": 2}
+        other_process.close()
+
+    def test_init_reaches_both_tiers(self, tmp_path):
+        """Test the broker's logger is given to both tiers."""
+        cacher = TieredCacher(MemoryCacher(), SQLiteCacher(str(tmp_path / "cache.db")))
+        logger = Mock()
+
+        cacher.init(logger)
+
+        assert cacher.first.logger is logger
+        assert cacher.second.logger is logger
+
+
+class TestCacherService:
+    """Test CacherService class."""
+
+    @pytest.mark.asyncio
+    async def test_clean_event(self):
+        """Test cache.clean events remove the matching entries."""
+        cacher = MemoryCacher()
+        cacher.set("users.get:1", 1)
+        cacher.set("posts.get:1", 1)
+        service = CacherService(cacher)
+
+        assert service.events() == ["clean"]
+        await service.clean(Context("ctx-1", params={"pattern": "users.*"}))
+
+        assert cacher.get("users.get:1") is MISS
+        assert cacher.get("posts.get:1") == 1
@@ -0,0 +1,141 @@
+"""Unit tests for the cluster module."""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from pylecular.cluster import Supervisor, resolve_instances, worker_id
+
+
+def test_resolve_instances():
+    """Test instances are a positive number or one per CPU."""
+    assert resolve_instances("3") == 3
+    assert resolve_instances("auto") == (os.cpu_count() or 1)
+    with pytest.raises(ValueError):
+        resolve_instances("0")
+    with pytest.raises(ValueError):
+        resolve_instances("many")
+
+
+def test_worker_id():
+    """Test worker node ids are derived from the broker id."""
+    assert worker_id("node-api", 2) == "node-api-2"
+
+
+class TestSupervisor:
+    """Test Supervisor class."""
+
+    @pytest.fixture
+    def starts(self, tmp_path):
+        """File each worker appends its index to when it starts."""
+        return tmp_path / "starts"
+
+    def read_starts(self, starts):
+        return sorted(int(index) for index in starts.read_text().split())
+
+    def record_start(self, starts, index):
+        with open(starts, "a") as file:
+            file.write(f"{index}\n")
+
+    def handle_sigterm(self):
+        """Exit cleanly on SIGTERM, unblocking it like a broker waiting for shutdown."""
+        signal.signal(signal.SIGTERM, lambda *args: os._exit(0))
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+
+    def stop_after(self, delay):
+        """Send SIGTERM to the supervisor, the test process, after a delay."""
+        timer = threading.Timer(delay, os.kill, (os.getpid(), signal.SIGTERM))
+        timer.start()
+        return timer
+
+    def test_invalid_instances(self):
+        """Test a cluster needs at least one worker."""
+        with pytest.raises(ValueError):
+            Supervisor(0, lambda index: 0)
+
+    def test_workers_exiting_cleanly_are_not_restarted(self, starts):
+        """Test the supervisor returns once every worker exited cleanly."""
+
+        def run_worker(index):
+            self.record_start(starts, index)
+            return 0
+
+        assert Supervisor(3, run_worker).run() == 0
+        assert self.read_starts(starts) == [0, 1, 2]
+
+    def test_crashed_worker_is_restarted(self, starts):
+        """Test a worker that crashes is started again with the same index."""
+
+        def run_worker(index):
+            first_start = not starts.exists()
+            self.record_start(starts, index)
+            if first_start:
+                raise RuntimeError("crash")
+            return 0
+
+        assert Supervisor(1, run_worker, restart_delay=0.01).run() == 0
+        assert self.read_starts(starts) == [0, 0]
+
+    def test_sigterm_stops_workers(self, starts):
+        """Test SIGTERM is forwarded to the workers, which stop gracefully."""
+
+        def run_worker(index):
+            self.record_start(starts, index)
+            self.handle_sigterm()
+            while True:
+                time.sleep(0.01)
+
+        timer = self.stop_after(0.5)
+        start = time.monotonic()
+
+        assert Supervisor(2, run_worker).run() == 0
+        assert time.monotonic() - start < 5
+        assert self.read_starts(starts) == [0, 1]
+        timer.join()
+
+    def test_sigterm_while_starting_is_deferred(self, starts):
+        """Test a worker asked to stop before its handler is installed still stops cleanly."""
+
+        def run_worker(index):
+            # Still starting when the supervisor forwards SIGTERM
+            time.sleep(0.5)
+            self.record_start(starts, index)
+            self.handle_sigterm()
+            while True:
+                time.sleep(0.01)
+
+        timer = self.stop_after(0.2)
+
+        assert Supervisor(1, run_worker).run() == 0
+        assert self.read_starts(starts) == [0]
+        timer.join()
+
+    def test_restart_delay_backs_off(self):
+        """Test the restart delay doubles with consecutive crashes, up to its bound."""
+        supervisor = Supervisor(2, lambda index: 0, restart_delay=1, max_restart_delay=8)
+
+        delays = [supervisor._restart_delay(0, uptime=0.1) for _ in range(5)]
+
+        assert delays == [1, 2, 4, 8, 8]
+        assert supervisor._restart_delay(1, uptime=0.1) == 1
+        # A crash after a long run starts the backoff over
+        assert supervisor._restart_delay(0, uptime=8) == 1
+        assert supervisor._restart_delay(0, uptime=0.1) == 2
+
+    def test_workers_ignoring_sigterm_are_killed(self):
+        """Test workers still running after the shutdown timeout are killed."""
+
+        def run_worker(index):
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            while True:
+                time.sleep(0.01)
+
+        timer = self.stop_after(0.3)
+        supervisor = Supervisor(1, run_worker, shutdown_timeout=0.2)
+
+        assert supervisor.run() == 1
+        assert supervisor.workers == {}
+        timer.join()
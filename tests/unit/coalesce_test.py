@@ -0,0 +1,130 @@
+"""Unit tests for the coalesce module."""
+
+import asyncio
+import time
+
+import pytest
+
+from pylecular.coalesce import SingleFlight
+from pylecular.context import Context
+from pylecular.metrics import MetricRegistry
+from pylecular.transit import RequestTimeoutError
+
+
+class TestSingleFlight:
+    """Test SingleFlight class."""
+
+    @pytest.fixture
+    def flights(self):
+        """Create a single-flight group with its own metrics."""
+        return SingleFlight(MetricRegistry())
+
+    @pytest.fixture
+    def gate(self):
+        """Create an event held by executions until released."""
+        return asyncio.Event()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self, flights, gate):
+        """Test calls with the same key share the result of one execution."""
+        executions = []
+
+        async def execute():
+            executions.append(1)
+            await gate.wait()
+            return {"id": 42}
+
+        calls = [
+            asyncio.create_task(flights.run("users.get:42", "users.get", Context(f"c{i}"), execute))
+            for i in range(5)
+        ]
+        await asyncio.sleep(0)
+        assert len(flights) == 1
+
+        gate.set()
+        results = await asyncio.gather(*calls)
+
+        assert results == [{"id": 42}] * 5
+        assert len(executions) == 1
+        assert len(flights) == 0
+        assert flights.metrics.get("broker.call.coalesced", {"action": "users.get"}) == 4
+
+    @pytest.mark.asyncio
+    async def test_calls_with_other_keys_run_separately(self, flights):
+        """Test calls with different keys do not share executions."""
+
+        async def execute():
+            await asyncio.sleep(0)
+            return "ok"
+
+        await asyncio.gather(
+            flights.run("users.get:1", "users.get", Context("c1"), execute),
+            flights.run("users.get:2", "users.get", Context("c2"), execute),
+        )
+
+        assert flights.metrics.get("broker.call.coalesced", {"action": "users.get"}) is None
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared(self, flights, gate):
+        """Test every waiting call receives the execution's exception."""
+
+        async def execute():
+            await gate.wait()
+            raise ValueError("backend down")
+
+        calls = [
+            asyncio.create_task(flights.run("k", "users.get", Context(f"c{i}"), execute))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_execution_outlives_callers_that_give_up(self, flights, gate):
+        """Test the execution keeps running until its last caller gives up."""
+        started = asyncio.Event()
+        cancelled = []
+
+        async def execute():
+            started.set()
+            try:
+                await gate.wait()
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+            return "ok"
+
+        first = asyncio.create_task(flights.run("k", "users.get", Context("c1"), execute))
+        second = asyncio.create_task(flights.run("k", "users.get", Context("c2"), execute))
+        await started.wait()
+
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        assert cancelled == []
+
+        second.cancel()
+        await asyncio.gather(second, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cancelled == [1]
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_callers_wait_within_their_own_deadline(self, flights, gate):
+        """Test a caller with a shorter deadline times out without stopping the others."""
+
+        async def execute():
+            await gate.wait()
+            return "ok"
+
+        patient = asyncio.create_task(flights.run("k", "users.get", Context("c1"), execute))
+        await asyncio.sleep(0)
+
+        hurried = Context("c2", deadline=time.monotonic() + 0.01)
+        with pytest.raises(RequestTimeoutError):
+            await flights.run("k", "users.get", hurried, execute)
+
+        gate.set()
+        assert await patient == "ok"
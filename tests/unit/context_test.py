@@ -1,3 +1,4 @@
+import time
 from unittest.mock import AsyncMock, Mock
 
 import pytest
@@ -105,7 +106,11 @@ async def test_call(context, mock_broker):
 
     assert result == "call_result"
     mock_broker.call.assert_called_once_with(
-        "service.action", {"param_key": "param_value"}, {"meta_key": "new_meta_value"}
+        "service.action",
+        {"param_key": "param_value"},
+        {"meta_key": "new_meta_value"},
+        timeout=None,
+        parent_ctx=context,
     )
 
 
@@ -150,3 +155,37 @@ async def test_broadcast_without_broker(context):
     context._broker = None
     with pytest.raises(AttributeError):
         await context.broadcast("service.event")
+
+
+def test_set_timeout_only_brings_deadline_forward():
+    ctx = Context(id="test-id")
+    assert ctx.remaining() is None
+    assert ctx.expired is False
+
+    ctx.set_timeout(10)
+    deadline = ctx.deadline
+    assert 9 < ctx.remaining() <= 10
+
+    ctx.set_timeout(20)
+    assert ctx.deadline == deadline
+
+    ctx.set_timeout(0)
+    assert ctx.deadline == deadline
+
+    ctx.set_timeout(1)
+    assert ctx.deadline < deadline
+
+
+def test_expired_context():
+    ctx = Context(id="test-id", deadline=time.monotonic() - 1)
+    assert ctx.expired is True
+    assert ctx.remaining() == 0
+
+
+def test_marshall_carries_remaining_timeout():
+    ctx = Context(id="test-id", deadline=time.monotonic() + 2)
+    assert 1900 < ctx.marshall()["timeout"] <= 2000
+
+    # An expired deadline is not sent as 0, which would mean no timeout
+    ctx.deadline = time.monotonic() - 1
+    assert ctx.marshall()["timeout"] == 1
@@ -65,6 +65,26 @@ class TestActionDecorator:
         assert greeting_function._params == params_schema
         assert greeting_function() == "Hello, World!"
 
+    def test_action_decorator_with_strategy(self):
+        """Test action decorator with a load balancing strategy."""
+
+        @action(strategy="CpuUsage", strategy_options={"sample_count": 2})
+        def balanced_action():
+            return "balanced"
+
+        assert balanced_action._strategy == "CpuUsage"
+        assert balanced_action._strategy_options == {"sample_count": 2}
+
+    def test_action_decorator_with_timeout(self):
+        """Test action decorator with a default timeout."""
+
+        @action(timeout=2.5)
+        def slow_action():
+            return "slow"
+
+        assert slow_action._timeout == 2.5
+        assert action()(lambda: None)._timeout is None
+
     def test_action_decorator_preserves_function_metadata(self):
         """Test that action decorator preserves function metadata."""
 
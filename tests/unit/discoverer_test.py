@@ -24,6 +24,7 @@ class TestDiscoverer:
         broker = Mock()
         broker.transit = mock_transit
         broker.logger = Mock()
+        broker.node_catalog.expire_silent_nodes.return_value = []
         return broker
 
     @pytest.mark.asyncio
@@ -34,7 +35,7 @@ class TestDiscoverer:
         assert discoverer.broker == mock_broker
         assert discoverer.transit == mock_broker.transit
         assert isinstance(discoverer._tasks, list)
-        assert len(discoverer._tasks) == 1  # Should have heartbeat task
+        assert len(discoverer._tasks) == 2  # Should have heartbeat and liveness tasks
         assert discoverer._tasks[0].get_name() == "discoverer-heartbeat"
 
     @pytest.mark.asyncio
@@ -70,9 +71,9 @@ class TestDiscoverer:
         """Test discoverer stop method."""
         discoverer = Discoverer(mock_broker)
 
-        # Verify task is running
-        assert len(discoverer._tasks) == 1
-        assert not discoverer._tasks[0].done()
+        # Verify tasks are running
+        assert len(discoverer._tasks) == 2
+        assert not any(task.done() for task in discoverer._tasks)
 
         # Stop discoverer
         await discoverer.stop()
@@ -138,6 +139,25 @@ class TestDiscoverer:
         finally:
             Discoverer.HEARTBEAT_INTERVAL = original_interval
 
+    @pytest.mark.asyncio
+    async def test_discoverer_heartbeat_continues_after_error(self, mock_broker, mock_transit):
+        """Test a failed heartbeat is logged and the next ones are still sent."""
+        errors = [RuntimeError("Publish error")]
+
+        async def beat():
+            if errors:
+                raise errors.pop()
+
+        mock_transit.beat.side_effect = beat
+        discoverer = Discoverer(mock_broker, heartbeat_interval=0.02, heartbeat_jitter=0)
+
+        await asyncio.sleep(0.1)
+        await discoverer.stop()
+
+        assert mock_transit.beat.call_count >= 3
+        mock_broker.logger.error.assert_called_once()
+        assert "Publish error" in mock_broker.logger.error.call_args[0][0]
+
     @pytest.mark.asyncio
     async def test_discoverer_heartbeat_with_broker_without_logger(self, mock_transit):
         """Test heartbeat error handling when broker has no logger."""
@@ -173,8 +193,8 @@ class TestDiscoverer:
         discoverer2 = Discoverer(mock_broker)
 
         # Each should have their own tasks
-        assert len(discoverer1._tasks) == 1
-        assert len(discoverer2._tasks) == 1
+        assert len(discoverer1._tasks) == 2
+        assert len(discoverer2._tasks) == 2
         assert discoverer1._tasks[0] != discoverer2._tasks[0]
 
         # Stop both
@@ -227,8 +247,10 @@ class TestDiscoverer:
         """Test that discoverer tasks are properly named."""
         discoverer = Discoverer(mock_broker)
 
-        assert len(discoverer._tasks) == 1
-        assert discoverer._tasks[0].get_name() == "discoverer-heartbeat"
+        assert [task.get_name() for task in discoverer._tasks] == [
+            "discoverer-heartbeat",
+            "discoverer-liveness",
+        ]
 
         await discoverer.stop()
 
@@ -259,3 +281,39 @@ class TestDiscoverer:
 
         finally:
             Discoverer.HEARTBEAT_INTERVAL = original_interval
+
+    @pytest.mark.asyncio
+    async def test_discoverer_uses_configured_intervals(self, mock_broker):
+        """Test intervals passed to the constructor override the class defaults."""
+        discoverer = Discoverer(
+            mock_broker, heartbeat_interval=2.0, heartbeat_timeout=6.0, heartbeat_jitter=0.25
+        )
+
+        assert discoverer.heartbeat_timeout == 6.0
+        delays = [discoverer._next_beat_delay() for _ in range(200)]
+        assert all(1.5 <= delay <= 2.5 for delay in delays)
+        assert len(set(delays)) > 1
+
+        await discoverer.stop()
+
+    @pytest.mark.asyncio
+    async def test_discoverer_expires_silent_nodes(self, mock_broker):
+        """Test the liveness task checks node heartbeats against the timeout."""
+        discoverer = Discoverer(mock_broker, heartbeat_interval=0.02, heartbeat_timeout=0.5)
+
+        await asyncio.sleep(0.07)
+        await discoverer.stop()
+
+        mock_broker.node_catalog.expire_silent_nodes.assert_called_with(0.5)
+
+    @pytest.mark.asyncio
+    async def test_discoverer_rejects_requests_to_expired_nodes(self, mock_broker, mock_transit):
+        """Test pending requests to expired nodes are rejected."""
+        mock_broker.node_catalog.expire_silent_nodes.return_value = ["silent-node"]
+        mock_transit.reject_pending_requests = Mock()
+        discoverer = Discoverer(mock_broker, heartbeat_interval=0.02)
+
+        await asyncio.sleep(0.03)
+        await discoverer.stop()
+
+        mock_transit.reject_pending_requests.assert_called_with("silent-node")
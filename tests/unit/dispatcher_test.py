@@ -0,0 +1,130 @@
+"""Unit tests for the dispatcher module."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pylecular.dispatcher import WorkerPool
+from pylecular.metrics import MetricRegistry
+from pylecular.packet import Packet, Topic
+
+
+class TestWorkerPool:
+    """Test WorkerPool class."""
+
+    def test_concurrency_must_be_positive(self):
+        """Test a pool without workers is rejected."""
+        with pytest.raises(ValueError):
+            WorkerPool(MagicMock(), concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        """Test no more than `concurrency` packets are processed at once."""
+        running = 0
+        peak = 0
+
+        async def handler(packet):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        pool = WorkerPool(handler, concurrency=3, queue_size=100)
+        for _ in range(10):
+            await pool.submit(Packet(Topic.REQUEST, None, {}))
+        await pool.join()
+
+        assert peak == 3
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_submit_waits_when_queue_is_full(self):
+        """Test a full queue pushes back on the submitter."""
+        release = asyncio.Event()
+
+        async def handler(packet):
+            await release.wait()
+
+        pool = WorkerPool(handler, concurrency=1, queue_size=1)
+        await pool.submit(Packet(Topic.REQUEST, None, {}))
+        await asyncio.sleep(0)
+        await pool.submit(Packet(Topic.REQUEST, None, {}))
+
+        blocked = asyncio.create_task(pool.submit(Packet(Topic.REQUEST, None, {})))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        assert pool.queue_depth == 1
+
+        release.set()
+        await blocked
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_logged(self):
+        """Test a failing handler does not stop its worker."""
+        logger = MagicMock()
+        calls = []
+
+        async def handler(packet):
+            calls.append(packet)
+            raise RuntimeError("boom")
+
+        pool = WorkerPool(handler, concurrency=1, logger=logger)
+        await pool.submit(Packet(Topic.EVENT, None, {}))
+        await pool.submit(Packet(Topic.EVENT, None, {}))
+        await pool.join()
+
+        assert len(calls) == 2
+        assert "Error processing EVENT packet: boom" in str(logger.error.call_args)
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_queue(self):
+        """Test stop lets queued packets finish before cancelling the workers."""
+        handled = []
+
+        async def handler(packet):
+            await asyncio.sleep(0)
+            handled.append(packet)
+
+        pool = WorkerPool(handler, concurrency=1)
+        for _ in range(3):
+            await pool.submit(Packet(Topic.EVENT, None, {}))
+        await pool.stop()
+
+        assert len(handled) == 3
+        assert pool.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_records_lane_metrics(self):
+        """Test queue depth, active count and queue latency are labelled by lane."""
+        metrics = MetricRegistry()
+        pool = WorkerPool(AsyncMock(), concurrency=1, name="data", metrics=metrics)
+        await pool.submit(Packet(Topic.REQUEST, None, {}))
+        await pool.join()
+
+        assert metrics.get("transit.queue.depth", {"lane": "data"}) == 0
+        assert metrics.get("transit.active", {"lane": "data"}) == 0
+        assert metrics.get("transit.queue.latency", {"lane": "data"}).count == 1
+        await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_gives_way_to_priority_pool(self):
+        """Test waiting packets of the priority pool are handled first."""
+        order = []
+
+        async def handler(packet):
+            order.append(packet.type)
+
+        control = WorkerPool(handler, concurrency=1, name="control")
+        data = WorkerPool(handler, concurrency=1, name="data", priority_pool=control)
+        await data.submit(Packet(Topic.REQUEST, None, {}))
+        await control.submit(Packet(Topic.HEARTBEAT, None, {}))
+        await data.join()
+        await control.join()
+
+        assert order == [Topic.HEARTBEAT, Topic.REQUEST]
+        await data.stop()
+        await control.stop()
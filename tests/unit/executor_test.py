@@ -0,0 +1,160 @@
+"""Unit tests for the executor module."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from pylecular.context import Context
+from pylecular.executor import (
+    PROCESS,
+    START_METHOD,
+    THREAD,
+    ActionExecutor,
+    to_coroutine_function,
+)
+from pylecular.metrics import MetricRegistry
+from pylecular.service import Service
+
+
+class MathService(Service):
+    """Service whose methods are run in the pools."""
+
+    def __init__(self):
+        super().__init__(name="math")
+
+    def square(self, ctx):
+        return {"result": ctx.params["x"] ** 2, "pid": os.getpid()}
+
+    async def total(self, contexts):
+        return [sum(ctx.params["values"]) for ctx in contexts]
+
+    def fail(self, ctx):
+        raise ValueError(ctx.params["message"])
+
+    def broker(self, ctx):
+        return ctx.broker is None
+
+
+def make_context(**params):
+    return Context(id="ctx", action="math.square", params=params, broker=object())
+
+
+class TestActionExecutor:
+    """Test ActionExecutor class."""
+
+    @pytest.fixture
+    def metrics(self):
+        return MetricRegistry()
+
+    def test_invalid_options(self):
+        """Test unknown kinds and empty pools are rejected."""
+        with pytest.raises(ValueError, match="Executor must be"):
+            ActionExecutor("fiber")
+        with pytest.raises(ValueError, match="max_workers"):
+            ActionExecutor(THREAD, max_workers=0)
+
+    def test_default_sizes(self):
+        """Test pool sizes follow the number of CPUs."""
+        cpus = os.cpu_count() or 1
+
+        assert ActionExecutor(THREAD).max_workers == min(32, cpus + 4)
+        assert ActionExecutor(PROCESS).max_workers == cpus
+
+    @pytest.mark.asyncio
+    async def test_thread_runs_plain_handler_off_the_loop(self, metrics):
+        """Test a plain def handler runs in a pool thread."""
+        executor = ActionExecutor(THREAD, max_workers=2, metrics=metrics)
+        call = executor.wrap(lambda ctx: (ctx.params["x"], threading.current_thread().name))
+
+        result, thread = await call(make_context(x=3))
+
+        assert result == 3
+        assert thread.startswith("pylecular-action")
+        assert metrics.get("executor.wait_time", {"executor": THREAD}).count == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_thread_runs_coroutine_handler(self):
+        """Test a coroutine handler runs on an event loop of the thread."""
+        executor = ActionExecutor(THREAD, max_workers=1)
+        call = executor.wrap(MathService().total)
+
+        assert await call([make_context(values=[1, 2]), make_context(values=[3])]) == [3, 3]
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queued_calls(self):
+        """Test calls beyond the pool size are counted as queued."""
+        executor = ActionExecutor(THREAD, max_workers=1)
+        release = threading.Event()
+        call = executor.wrap(lambda ctx: release.wait(1))
+
+        tasks = [asyncio.ensure_future(call(make_context())) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        assert (executor.in_flight, executor.queued) == (3, 2)
+        release.set()
+        await asyncio.gather(*tasks)
+        assert (executor.in_flight, executor.queued) == (0, 0)
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_thread_handler_error(self):
+        """Test an exception raised in the pool reaches the caller."""
+        executor = ActionExecutor(THREAD, max_workers=1)
+        call = executor.wrap(MathService().fail)
+
+        with pytest.raises(ValueError, match="boom"):
+            await call(make_context(message="boom"))
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_runs_service_handler(self, metrics):
+        """Test a service method runs in another process with a copy of the context."""
+        executor = ActionExecutor(PROCESS, max_workers=1, metrics=metrics)
+        service = MathService()
+        square = executor.wrap(service.square)
+        total = executor.wrap(service.total)
+        broker = executor.wrap(service.broker)
+
+        try:
+            result = await square(make_context(x=4))
+            assert result["result"] == 16
+            assert result["pid"] != os.getpid()
+            assert await total([make_context(values=[1, 2, 3])]) == [6]
+            assert await broker(make_context()) is True
+            assert metrics.get("executor.wait_time", {"executor": PROCESS}).count == 3
+        finally:
+            executor.shutdown()
+
+    def test_process_workers_are_not_forked(self):
+        """Test process workers do not inherit the threads of the broker's process."""
+        executor = ActionExecutor(PROCESS, max_workers=1)
+
+        try:
+            assert START_METHOD in ("forkserver", "spawn")
+            assert executor._get_pool()._mp_context.get_start_method() == START_METHOD
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_handler_error(self):
+        """Test an exception raised in a worker process reaches the caller."""
+        executor = ActionExecutor(PROCESS, max_workers=1)
+        call = executor.wrap(MathService().fail)
+
+        try:
+            with pytest.raises(ValueError, match="boom"):
+                await call(make_context(message="boom"))
+        finally:
+            executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_to_coroutine_function():
+    """Test plain handlers are awaited like coroutine functions."""
+    call = to_coroutine_function(lambda ctx: ctx * 2)
+
+    assert await call(2) == 4
@@ -0,0 +1,132 @@
+"""Unit tests for the hedge module."""
+
+import asyncio
+
+import pytest
+
+from pylecular.context import Context
+from pylecular.hedge import HedgePolicy, Hedger
+from pylecular.metrics import MetricRegistry
+from pylecular.registry import Action
+
+LABELS = {"action": "users.get"}
+
+
+def endpoint(node_id, hedge):
+    """Create a remote endpoint of the hedged action."""
+    return Action("users.get", node_id, False, hedge=hedge)
+
+
+class TestHedger:
+    """Test Hedger class."""
+
+    @pytest.fixture
+    def hedger(self):
+        """Create a hedger with its own metrics."""
+        return Hedger(MetricRegistry())
+
+    @staticmethod
+    def node_calls(delays, calls, cancelled):
+        """Create a call function answering after a delay depending on the node."""
+
+        async def call(target, context):
+            calls.append((target.node_id, context.id))
+            try:
+                await asyncio.sleep(delays[target.node_id])
+            except asyncio.CancelledError:
+                cancelled.append(target.node_id)
+                raise
+            return target.node_id
+
+        return call
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged(self, hedger):
+        """Test a call not answered within the delay is sent to another node."""
+        first, second = endpoint("slow", {"delay": 0.01, "budget": 1}), endpoint("fast", True)
+        calls, cancelled = [], []
+        call = self.node_calls({"slow": 1, "fast": 0}, calls, cancelled)
+
+        result = await hedger.call(first, Context("ctx-1"), call, lambda _: second)
+
+        assert result == "fast"
+        assert [node for node, _ in calls] == ["slow", "fast"]
+        assert calls[1][1] != "ctx-1"
+        await asyncio.sleep(0)
+        assert cancelled == ["slow"]
+        assert hedger.metrics.get("broker.call.hedged", LABELS) == 1
+        assert hedger.metrics.get("broker.call.hedge_won", LABELS) == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_call_is_not_hedged(self, hedger):
+        """Test calls answered within the delay are sent once."""
+        first = endpoint("fast", {"delay": 0.5, "budget": 1})
+        calls = []
+        call = self.node_calls({"fast": 0}, calls, [])
+
+        assert await hedger.call(first, Context("ctx-1"), call, lambda _: endpoint("b", True)) == (
+            "fast"
+        )
+        assert len(calls) == 1
+        assert hedger.metrics.get("broker.call.hedged", LABELS) is None
+
+    @pytest.mark.asyncio
+    async def test_hedges_stay_within_budget(self, hedger):
+        """Test the budget caps hedges to a fraction of calls."""
+        first, second = endpoint("slow", {"delay": 0.001, "budget": 0.5}), endpoint("fast", True)
+        call = self.node_calls({"slow": 0.02, "fast": 0}, [], [])
+
+        for i in range(6):
+            await hedger.call(first, Context(f"ctx-{i}"), call, lambda _: second)
+
+        assert hedger.metrics.get("broker.call.hedged", LABELS) == 3
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_another_node(self, hedger):
+        """Test calls are not hedged to the node already handling them."""
+        first = endpoint("slow", {"delay": 0.001, "budget": 1})
+        calls = []
+        call = self.node_calls({"slow": 0.01}, calls, [])
+
+        assert await hedger.call(first, Context("ctx-1"), call, lambda e: e) == "slow"
+        assert await hedger.call(first, Context("ctx-2"), call, lambda _: None) == "slow"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_error_of_every_request_is_raised(self, hedger):
+        """Test the first error is raised when both requests fail."""
+        first, second = endpoint("a", {"delay": 0.001, "budget": 1}), endpoint("b", True)
+
+        async def call(target, context):
+            await asyncio.sleep(0.01 if target.node_id == "a" else 0.02)
+            raise ValueError(target.node_id)
+
+        with pytest.raises(ValueError, match="a"):
+            await hedger.call(first, Context("ctx-1"), call, lambda _: second)
+
+    @pytest.mark.asyncio
+    async def test_delay_follows_observed_latency(self, hedger, monkeypatch):
+        """Test the delay is the latency percentile once enough calls were observed."""
+        monkeypatch.setattr(Hedger, "REFRESH_INTERVAL", 4)
+        first = endpoint("a", {"percentile": 50, "min_samples": 4, "budget": 1})
+        call = self.node_calls({"a": 0}, [], [])
+
+        for i in range(3):
+            await hedger.call(first, Context(f"ctx-{i}"), call, lambda _: None)
+        assert hedger._states["users.get"].delay is None
+
+        await hedger.call(first, Context("ctx-3"), call, lambda _: None)
+        delay = hedger._states["users.get"].delay
+        assert delay == hedger.metrics.get("broker.call.latency", LABELS).percentile(50)
+
+
+class TestHedgePolicy:
+    """Test HedgePolicy class."""
+
+    def test_from_options(self):
+        """Test policies are built from True or option dicts."""
+        assert HedgePolicy.from_options(True).percentile == 95
+        assert HedgePolicy.from_options({"delay": 0.05}).delay == 0.05
+
+        with pytest.raises(ValueError):
+            HedgePolicy(budget=2)
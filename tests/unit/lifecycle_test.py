@@ -1,5 +1,6 @@
 """Unit tests for the Lifecycle module."""
 
+import time
 import uuid
 from unittest.mock import Mock
 
@@ -266,3 +267,25 @@ class TestLifecycle:
         uuid.UUID(context1.id)
         uuid.UUID(context2.id)
         uuid.UUID(context3.id)
+
+    def test_create_context_inherits_parent_deadline(self, mock_broker):
+        """Test that a nested context keeps the parent's deadline and ID."""
+        lifecycle = Lifecycle(mock_broker)
+        parent = Context(id="parent-1", deadline=time.monotonic() + 1)
+
+        context = lifecycle.create_context(action="test.action", parent=parent)
+
+        assert context.parent_id == "parent-1"
+        assert context.deadline == parent.deadline
+
+    def test_rebuild_context_deadline_from_timeout(self, mock_broker):
+        """Test that the milliseconds left on the wire become a local deadline."""
+        lifecycle = Lifecycle(mock_broker)
+
+        context = lifecycle.rebuild_context(
+            {"id": "ctx-1", "timeout": 1500, "parentID": "parent-1"}, received_at=100.0
+        )
+
+        assert context.deadline == 101.5
+        assert context.parent_id == "parent-1"
+        assert lifecycle.rebuild_context({"id": "ctx-2", "timeout": 0}).deadline is None
@@ -0,0 +1,73 @@
+"""Unit tests for the metrics module."""
+
+from pylecular.metrics import Histogram, MetricRegistry
+
+
+class TestHistogram:
+    """Test Histogram class."""
+
+    def test_summary(self):
+        """Test count, sum, bounds and percentiles."""
+        histogram = Histogram()
+        for value in range(1, 101):
+            histogram.observe(value)
+
+        summary = histogram.to_dict()
+        assert summary["count"] == 100
+        assert summary["sum"] == 5050
+        assert summary["min"] == 1
+        assert summary["max"] == 100
+        assert summary["p50"] == 50
+        assert summary["p95"] == 95
+
+    def test_percentiles_use_recent_window(self):
+        """Test percentiles only look at the latest observations."""
+        histogram = Histogram(window=2)
+        for value in (100, 1, 2):
+            histogram.observe(value)
+
+        assert histogram.percentile(100) == 2
+        assert histogram.max == 100
+
+    def test_empty(self):
+        """Test an empty histogram."""
+        histogram = Histogram()
+        assert histogram.percentile(95) is None
+        assert histogram.to_dict()["min"] is None
+
+
+class TestMetricRegistry:
+    """Test MetricRegistry class."""
+
+    def test_counters_and_gauges(self):
+        """Test counters accumulate and gauges are replaced."""
+        metrics = MetricRegistry()
+        metrics.increment("calls", labels={"action": "math.add"})
+        metrics.increment("calls", 2, labels={"action": "math.add"})
+        metrics.set("connections", 3)
+        metrics.set("connections", 5)
+
+        assert metrics.get("calls", {"action": "math.add"}) == 3
+        assert metrics.get("calls", {"action": "math.sub"}) is None
+        assert metrics.get("connections") == 5
+
+    def test_registered_gauge_reads_callback(self):
+        """Test callback gauges are read when collected."""
+        metrics = MetricRegistry()
+        depth = [1]
+        metrics.register_gauge("queue.depth", lambda: depth[0])
+
+        depth[0] = 7
+        assert metrics.get("queue.depth") == 7
+        assert metrics.snapshot()["queue.depth"] == 7
+
+    def test_snapshot_keys_include_labels(self):
+        """Test the snapshot names series by labels."""
+        metrics = MetricRegistry()
+        metrics.increment("calls", labels={"node": "n1", "action": "a"})
+        metrics.observe("latency", 4.0)
+
+        snapshot = metrics.snapshot()
+        assert snapshot['calls{action="a",node="n1"}'] == 1
+        assert snapshot["latency"]["count"] == 1
+        assert isinstance(metrics.get("latency"), Histogram)
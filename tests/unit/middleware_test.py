@@ -6,7 +6,7 @@ import pytest_asyncio
 
 from pylecular.broker import Broker
 from pylecular.decorators import action, event  # Added import for event
-from pylecular.middleware import Middleware
+from pylecular.middleware import Middleware, MiddlewareList
 from pylecular.registry import Action, Event  # Changed import
 from pylecular.service import Service  # Assuming Service can be imported
 from pylecular.settings import Settings
@@ -642,6 +642,100 @@ async def test_service_created_and_started_hooks():
     await broker.stop()
 
 
+@pytest.mark.asyncio
+async def test_local_action_chain_compiled_once():
+    mw1 = TestMiddleware(name="MW_Cached")
+    broker = Broker(id="cached-chain", middlewares=[mw1])
+    await broker.register(SimpleService())
+    mw1.reset()
+
+    await broker.call("simple.greet", params={"name": "A"})
+    await broker.call("simple.greet", params={"name": "B"})
+
+    # The hook builds the chain once, the wrapper runs on every call
+    assert [h["hook"] for h in mw1.called_hooks] == ["local_action"]
+    assert mw1.call_log.count("MW_Cached: local_action_before_simple.greet") == 2
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_use_invalidates_compiled_chains():
+    mw1 = TestMiddleware(name="MW_First")
+    broker = Broker(id="use-invalidates", middlewares=[mw1])
+    await broker.register(SimpleService())
+    await broker.call("simple.greet", params={})
+
+    mw2 = TestMiddleware(name="MW_Added")
+    broker.use(mw2)
+    result = await broker.call("simple.greet", params={})
+
+    assert broker.middlewares == [mw1, mw2]
+    assert result["local_action_processed_by"] == "MW_First"
+    assert "MW_Added: local_action_before_simple.greet" in mw2.call_log
+
+    broker.middlewares = []
+    result = await broker.call("simple.greet", params={})
+    assert "local_action_processed_by" not in result
+
+    await broker.stop()
+
+
+@pytest.mark.asyncio
+async def test_modifying_middlewares_invalidates_compiled_chains():
+    mw1 = TestMiddleware(name="MW_First")
+    broker = Broker(id="append-invalidates", middlewares=[mw1])
+    await broker.register(SimpleService())
+    await broker.call("simple.greet", params={})
+
+    mw2 = TestMiddleware(name="MW_Appended")
+    broker.middlewares.append(mw2)
+    await broker.call("simple.greet", params={})
+    assert "MW_Appended: local_action_before_simple.greet" in mw2.call_log
+
+    broker.middlewares.remove(mw1)
+    mw1.reset()
+    result = await broker.call("simple.greet", params={})
+    assert mw1.call_log == []
+    assert result["local_action_processed_by"] == "MW_Appended"
+
+    await broker.stop()
+
+
+def test_middleware_list_notifies_changes():
+    changes = []
+    middlewares = MiddlewareList(on_change=lambda: changes.append(True))
+
+    middlewares.append("a")
+    middlewares.extend(["b", "c"])
+    middlewares += ["d"]
+    middlewares[0] = "e"
+    del middlewares[0]
+    middlewares.insert(0, "f")
+    middlewares.pop()
+    middlewares.clear()
+
+    assert len(changes) == 8
+    assert isinstance(middlewares, MiddlewareList)
+
+
+@pytest.mark.asyncio
+async def test_inherited_passthrough_hooks_are_skipped():
+    class LifecycleOnlyMiddleware(Middleware):
+        pass
+
+    broker = Broker(id="passthrough-skip", middlewares=[LifecycleOnlyMiddleware()])
+    await broker.register(SimpleService())
+
+    await broker.call("simple.greet", params={})
+    endpoint = broker.registry.get_action("simple.greet")
+
+    # No wrapper was added, the chain is the bare service method
+    assert endpoint.chain == endpoint.handler
+
+    await broker.stop()
+
+
 # Example of a more complex test structure for wrapping hooks (illustrative)
 # This would require a dummy service and action
 # @pytest.mark.asyncio
@@ -5,7 +5,10 @@ from unittest.mock import Mock
 
 import pytest
 
+from pylecular.decorators import action
 from pylecular.node import Node, NodeCatalog
+from pylecular.registry import Action, Registry
+from pylecular.service import Service
 
 
 class TestNode:
@@ -399,3 +402,244 @@ class TestNodeCatalog:
         assert node.instanceID == "instance-123"
         assert node.available is True
         assert node.cpu == 25.0
+
+
+class TestNodeCatalogInfoUpdates:
+    """Test seq-keyed INFO processing against a real registry."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create a real registry for the local node."""
+        return Registry(node_id="local-node")
+
+    @pytest.fixture
+    def catalog(self, registry):
+        """Create a catalog backed by the real registry."""
+        return NodeCatalog(registry, Mock(), "local-node")
+
+    @staticmethod
+    def make_node(seq, actions, events=(), instance_id="instance-1"):
+        """Build a remote node announcing one service with the given endpoints."""
+        services = [
+            {
+                "name": "math",
+                "actions": {name: {} for name in actions},
+                "events": {name: {} for name in events},
+            }
+        ]
+        return Node("remote-node", services=services, seq=seq, instance_id=instance_id)
+
+    def test_unchanged_seq_is_noop(self, catalog, registry):
+        """Re-announcing a node with the same seq does not duplicate endpoints."""
+        first = self.make_node(1, ["math.add"], ["math.done"])
+        catalog.add_node("remote-node", first)
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"], ["math.done"]))
+
+        assert catalog.get_node("remote-node") is first
+        assert len(registry.get_all_actions("math.add")) == 1
+        assert len(registry.get_all_events("math.done")) == 1
+
+    def test_silent_node_is_expired(self, catalog, registry):
+        """A node past the heartbeat timeout loses its endpoints but stays known."""
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"], ["math.done"]))
+        catalog.last_seen["remote-node"] -= 10
+
+        assert catalog.expire_silent_nodes(5) == ["remote-node"]
+
+        node = catalog.get_node("remote-node")
+        assert node.available is False
+        assert registry.get_action("math.add") is None
+        assert registry.get_all_events("math.done") == []
+        assert catalog.expire_silent_nodes(5) == []
+        assert catalog.get_node("local-node").available is True
+
+    def test_long_expired_node_is_removed(self, catalog, registry):
+        """A node still silent long after it expired is dropped from the catalog."""
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"]))
+        catalog.last_seen["remote-node"] -= 10
+        assert catalog.expire_silent_nodes(5) == ["remote-node"]
+
+        catalog.last_seen["remote-node"] -= 5 * NodeCatalog.REMOVE_AFTER_TIMEOUTS
+        assert catalog.expire_silent_nodes(5) == []
+
+        assert catalog.get_node("remote-node") is None
+        assert "remote-node" not in catalog.last_seen
+        assert catalog.get_node("local-node") is not None
+
+    def test_recent_node_is_kept(self, catalog, registry):
+        """A node seen within the timeout keeps its endpoints."""
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"]))
+        catalog.last_seen["remote-node"] -= 2
+        catalog.mark_seen("remote-node")
+
+        assert catalog.expire_silent_nodes(5) == []
+        assert registry.get_action("math.add").node_id == "remote-node"
+
+    def test_expired_node_comes_back_with_same_seq(self, catalog, registry):
+        """INFO from an expired node re-registers its endpoints even if seq is unchanged."""
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"]))
+        catalog.expire_node("remote-node")
+
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"]))
+
+        assert catalog.get_node("remote-node").available is True
+        assert len(registry.get_all_actions("math.add")) == 1
+
+    def test_changed_seq_swaps_endpoints(self, catalog, registry):
+        """A new seq diffs the service list and only replaces what changed."""
+        catalog.add_node("remote-node", self.make_node(1, ["math.add", "math.sub"], ["math.done"]))
+        kept = registry.get_action("math.add")
+
+        catalog.add_node("remote-node", self.make_node(2, ["math.add", "math.mul"]))
+
+        assert registry.get_action("math.add") is kept
+        assert registry.get_action("math.sub") is None
+        assert registry.get_action("math.mul").node_id == "remote-node"
+        assert registry.get_all_events("math.done") == []
+        assert sorted(a.name for a in registry.get_node_actions("remote-node")) == [
+            "math.add",
+            "math.mul",
+        ]
+
+    def test_restart_with_same_id_replaces_endpoints(self, catalog, registry):
+        """A node restarted under the same ID and seq announces its new services."""
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"], ["math.done"]))
+        old = registry.get_action("math.add")
+
+        restarted = self.make_node(1, ["math.add", "math.mul"], instance_id="instance-2")
+        catalog.add_node("remote-node", restarted)
+
+        assert catalog.get_node("remote-node") is restarted
+        assert registry.get_action("math.add") is not old
+        assert registry.get_all_events("math.done") == []
+        assert sorted(a.name for a in registry.get_node_actions("remote-node")) == [
+            "math.add",
+            "math.mul",
+        ]
+
+    def test_disconnect_removes_all_endpoints(self, catalog, registry):
+        """Disconnecting a node drops every endpoint it hosted."""
+        catalog.add_node("remote-node", self.make_node(1, ["math.add"], ["math.done"]))
+
+        catalog.disconnect_node("remote-node")
+
+        assert registry.get_action("math.add") is None
+        assert registry.get_event("math.done") is None
+        assert registry.get_node_actions("remote-node") == []
+
+    def test_local_node_endpoints_are_not_touched(self, catalog, registry):
+        """Local endpoints are owned by the registry, not by the catalog."""
+        local_action = Action("greeter.hello", "local-node", is_local=True)
+        registry.add_action(local_action)
+
+        catalog.remove_node("local-node")
+
+        assert registry.get_action("greeter.hello") is local_action
+
+    def test_ensure_local_node_bumps_seq(self, catalog):
+        """Every rebuild of the local node announces a new seq."""
+        seq = catalog.local_node.seq
+
+        catalog.ensure_local_node()
+
+        assert catalog.local_node.seq == seq + 1
+
+    def test_local_node_has_an_instance_id(self, catalog, registry):
+        """The local node keeps one instance ID, distinct from other catalogs'."""
+        instance_id = catalog.local_node.instanceID
+
+        catalog.ensure_local_node()
+
+        assert instance_id
+        assert catalog.local_node.instanceID == instance_id
+        assert NodeCatalog(registry, Mock(), "local-node").local_node.instanceID != instance_id
+
+    def test_remote_action_strategy_is_kept(self, catalog, registry):
+        """Strategy settings announced in INFO are applied to the remote endpoint."""
+        node = Node(
+            "remote-node",
+            seq=1,
+            services=[
+                {
+                    "name": "math",
+                    "actions": {
+                        "math.add": {"strategy": "CpuUsage", "strategyOptions": {"sample_count": 2}}
+                    },
+                    "events": {},
+                }
+            ],
+        )
+
+        catalog.add_node("remote-node", node)
+
+        action = registry.get_action("math.add")
+        assert action.strategy == "CpuUsage"
+        assert action.strategy_options == {"sample_count": 2}
+
+    def test_local_action_timeout_is_announced(self, catalog, registry):
+        """Action timeouts and retry policies are announced, delays in milliseconds."""
+
+        class MathService(Service):
+            def __init__(self):
+                super().__init__(name="math")
+
+            @action(timeout=2.5, retry={"retries": 2})
+            async def add(self, ctx):
+                return 0
+
+        registry.register(MathService())
+        catalog.ensure_local_node()
+
+        definition = catalog.local_node.services[0]["actions"]["math.add"]
+        assert definition["timeout"] == 2500
+        assert definition["retryPolicy"]["retries"] == 2
+        assert registry.get_action("math.add").timeout == 2.5
+        assert registry.get_action("math.add").retry_policy.retries == 2
+
+    def test_action_cache_is_announced(self, catalog, registry):
+        """Cache options are announced so that callers on other nodes cache results too."""
+
+        class UserService(Service):
+            def __init__(self):
+                super().__init__(name="users")
+
+            @action(cache={"keys": ["id"], "ttl": 30})
+            async def get(self, ctx):
+                return {}
+
+        registry.register(UserService())
+        catalog.ensure_local_node()
+
+        definition = catalog.local_node.services[0]["actions"]["users.get"]
+        assert definition["cache"] == {"keys": ["id"], "ttl": 30}
+
+        node = Node(
+            "remote-node",
+            seq=1,
+            services=[{"name": "users", "actions": {"users.list": {"cache": True}}, "events": {}}],
+        )
+        catalog.add_node("remote-node", node)
+        assert registry.get_action("users.list").cache is True
+
+    def test_remote_action_timeout_is_kept(self, catalog, registry):
+        """Announced action timeouts and retry policies are applied in seconds."""
+        node = Node(
+            "remote-node",
+            seq=1,
+            services=[
+                {
+                    "name": "math",
+                    "actions": {
+                        "math.add": {"timeout": 2500, "retryPolicy": {"retries": 2, "delay": 50}}
+                    },
+                    "events": {},
+                }
+            ],
+        )
+
+        catalog.add_node("remote-node", node)
+
+        action = registry.get_action("math.add")
+        assert action.timeout == 2.5
+        assert action.retry_policy.retries == 2
+        assert action.retry_policy.delay == 0.05
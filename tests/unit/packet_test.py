@@ -17,6 +17,7 @@ class TestTopic:
         assert Topic.INFO.value == "INFO"
         assert Topic.REQUEST.value == "REQ"
         assert Topic.RESPONSE.value == "RES"
+        assert Topic.CANCEL.value == "CANCEL"
 
     def test_topic_enum_membership(self):
         """Test Topic enum membership."""
@@ -28,6 +29,7 @@ class TestTopic:
             Topic.INFO,
             Topic.REQUEST,
             Topic.RESPONSE,
+            Topic.CANCEL,
         ]
 
         for topic in all_topics:
@@ -0,0 +1,90 @@
+"""Unit tests for the rate_limit module."""
+
+import pytest
+
+from pylecular import rate_limit as rate_limit_module
+from pylecular.context import Context
+from pylecular.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the rate limiter's clock with one advanced by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def tenant(name):
+    """Create a context of a call made on behalf of a tenant."""
+    return Context("ctx-1", meta={"tenant": name})
+
+
+class TestRateLimiter:
+    """Test RateLimiter class."""
+
+    def test_allows_burst_then_refills_at_rate(self, clock):
+        """Test a bucket lets a burst through, then one call per refilled token."""
+        limiter = RateLimiter(rate=2, burst=3)
+        ctx = Context("ctx-1")
+
+        assert [limiter.allow("ml.predict", ctx) for _ in range(4)] == [True, True, True, False]
+
+        clock[0] += 0.5
+        assert limiter.allow("ml.predict", ctx) is True
+        assert limiter.allow("ml.predict", ctx) is False
+
+        # Tokens never exceed the burst size
+        clock[0] += 60
+        assert [limiter.allow("ml.predict", ctx) for _ in range(4)] == [True, True, True, False]
+
+    def test_scopes(self, clock):
+        """Test which calls share a bucket in each scope."""
+        by_action = RateLimiter(rate=1, scope="action")
+        assert by_action.allow("ml.predict", tenant("a")) is True
+        assert by_action.allow("ml.train", tenant("a")) is True
+        assert by_action.allow("ml.predict", tenant("b")) is False
+
+        shared = RateLimiter(rate=1, scope="global")
+        assert shared.allow("ml.predict", tenant("a")) is True
+        assert shared.allow("ml.train", tenant("b")) is False
+
+        by_tenant = RateLimiter(rate=1, scope="key", key="tenant")
+        assert by_tenant.allow("ml.predict", tenant("a")) is True
+        assert by_tenant.allow("ml.train", tenant("b")) is True
+        assert by_tenant.allow("ml.train", tenant("a")) is False
+
+    def test_idle_buckets_expire_lazily(self, clock):
+        """Test refilled buckets are dropped as new keys arrive."""
+        limiter = RateLimiter(rate=10, burst=10, scope="key", key="tenant")
+        for i in range(100):
+            limiter.allow("ml.predict", tenant(i))
+        assert len(limiter) == 100
+
+        # Still refilling, so the buckets are kept
+        clock[0] += 0.5
+        limiter.allow("ml.predict", tenant("new"))
+        assert len(limiter) == 101
+
+        clock[0] += 0.6
+        for i in range(60):
+            limiter.allow("ml.predict", tenant(f"late-{i}"))
+        assert len(limiter) == 61
+
+    def test_from_options(self):
+        """Test limiters are built from option dicts and passed through otherwise."""
+        assert RateLimiter.from_options(None) is None
+        assert RateLimiter.from_options(False) is None
+
+        limiter = RateLimiter.from_options({"rate": 2.5})
+        assert (limiter.rate, limiter.burst, limiter.scope) == (2.5, 3, "action")
+        assert RateLimiter.from_options(limiter) is limiter
+
+    def test_invalid_options(self):
+        """Test invalid options are rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+        with pytest.raises(ValueError):
+            RateLimiter(rate=1, scope="tenant")
+        with pytest.raises(ValueError):
+            RateLimiter(rate=1, scope="key")
@@ -1,8 +1,14 @@
 """Unit tests for the Registry module."""
 
+import asyncio
 from unittest.mock import MagicMock, Mock
 
+import pytest
+
+from pylecular.decorators import action
 from pylecular.registry import Action, Event, Registry
+from pylecular.service import Service
+from pylecular.validator import ValidationError
 
 
 class TestAction:
@@ -37,6 +43,19 @@ class TestAction:
         assert action.handler is None
         assert action.params_schema is None
 
+    def test_action_validate_compiles_schema_once(self):
+        """Test validation compiles the params schema on first use."""
+        action = Action("users.get", "node-1", True, params_schema={"id": "number"})
+        assert action.params_validator is None
+
+        action.validate({"id": 1})
+        validator = action.params_validator
+        assert validator is not None
+
+        with pytest.raises(ValidationError, match="must be of type 'number'"):
+            action.validate({"id": "1"})
+        assert action.params_validator is validator
+
 
 class TestEvent:
     """Test Event class."""
@@ -139,10 +158,12 @@ class TestRegistry:
         assert registry.__actions__[0].is_local is True
         assert registry.__actions__[0].handler == action1
         assert registry.__actions__[0].params_schema == {"type": "object"}
+        assert registry.__actions__[0].params_validator is not None
 
         assert registry.__actions__[1].name == "test-service.action2"
         assert registry.__actions__[1].handler == action2
         assert registry.__actions__[1].params_schema is None
+        assert registry.__actions__[1].params_validator is None
 
         # Check events registration
         assert len(registry.__events__) == 2
@@ -246,6 +267,23 @@ class TestRegistry:
         # Should return the first one
         assert registry.get_action("service.action") == action1
 
+    def test_get_action_excludes_nodes(self):
+        """Test that excluded nodes are avoided unless no other node hosts the action."""
+        registry = Registry(node_id="node-1")
+
+        local = Action("service.action", "node-1", True)
+        remote = Action("service.action", "node-2", False)
+        registry.add_action(local)
+        registry.add_action(remote)
+
+        assert registry.get_action("service.action") is local
+        assert registry.get_action("service.action", exclude={"node-1"}) is remote
+        assert registry.get_action("service.action", exclude={"node-2"}) is local
+        assert registry.get_action("service.action", exclude={"node-1", "node-2"}) in (
+            local,
+            remote,
+        )
+
     def test_get_all_events(self):
         """Test getting all events by name."""
         registry = Registry()
@@ -352,3 +390,167 @@ class TestRegistry:
         assert registry.get_action("any.action") is None
         assert registry.get_event("any.event") is None
         assert registry.get_all_events("any.event") == []
+
+    def test_get_all_actions(self):
+        """Test getting every endpoint registered for an action name."""
+        registry = Registry()
+
+        action1 = Action("math.add", "node-1", False)
+        action2 = Action("math.add", "node-2", False)
+        action3 = Action("math.sub", "node-1", False)
+
+        registry.add_action(action1)
+        registry.add_action(action2)
+        registry.add_action(action3)
+
+        assert registry.get_all_actions("math.add") == [action1, action2]
+        assert registry.get_all_actions("math.sub") == [action3]
+        assert registry.get_all_actions("nonexistent") == []
+
+    def test_action_service_is_derived_from_name(self):
+        """Test that remote actions are indexed under the service prefix of their name."""
+        registry = Registry()
+
+        action1 = Action("v2.math.add", "node-1", False)
+        action2 = Action("v2.math.sub", "node-2", False)
+        registry.add_action(action1)
+        registry.add_action(action2)
+
+        assert action1.service == "v2.math"
+        assert registry.get_service_actions("v2.math") == [action1, action2]
+
+    def test_node_and_service_indexes(self):
+        """Test looking up endpoints by hosting node and owning service."""
+        registry = Registry(node_id="node-1")
+
+        service = MagicMock()
+        service.name = "users"
+        get_action = Mock()
+        get_action._name = "get"
+        get_action._params = None
+        created_event = Mock()
+        created_event._name = "user.created"
+        service.actions.return_value = ["get_action"]
+        service.events.return_value = ["created_event"]
+        service.get_action = get_action
+        service.created_event = created_event
+
+        registry.register(service)
+        remote_event = Event("user.created", "node-2", service="mailer")
+        registry.add_event_obj(remote_event)
+
+        assert [a.name for a in registry.get_node_actions("node-1")] == ["users.get"]
+        assert [a.name for a in registry.get_service_actions("users")] == ["users.get"]
+        assert [e.service for e in registry.get_node_events("node-1")] == ["users"]
+        assert registry.get_node_events("node-2") == [remote_event]
+        assert registry.get_service_events("mailer") == [remote_event]
+        assert registry.get_node_actions("node-2") == []
+
+    def test_remove_endpoints(self):
+        """Test that removed endpoints disappear from every index."""
+        registry = Registry()
+
+        action1 = Action("math.add", "node-1", False)
+        action2 = Action("math.add", "node-2", False)
+        event = Event("math.done", "node-1", service="math")
+        registry.add_action(action1)
+        registry.add_action(action2)
+        registry.add_event_obj(event)
+
+        registry.remove_action(action1)
+        registry.remove_event(event)
+
+        assert registry.get_action("math.add") == action2
+        assert registry.get_node_actions("node-1") == []
+        assert registry.get_service_actions("math") == [action2]
+        assert registry.get_event("math.done") is None
+        assert registry.__events__ == []
+        assert "node-1" not in registry._actions_by_node
+
+        # Removing an endpoint twice is a no-op
+        registry.remove_action(action1)
+        assert registry.__actions__ == [action2]
+
+    def test_unregister_node(self):
+        """Test dropping every endpoint hosted by a node at once."""
+        registry = Registry()
+
+        remote_add = Action("math.add", "node-1", False)
+        other_add = Action("math.add", "node-2", False)
+        remote_event = Event("math.done", "node-1", service="math")
+        registry.add_action(remote_add)
+        registry.add_action(other_add)
+        registry.add_event_obj(remote_event)
+
+        registry.unregister_node("node-1")
+
+        assert registry.get_all_actions("math.add") == [other_add]
+        assert registry.get_all_events("math.done") == []
+        assert registry.get_node_actions("node-1") == []
+        assert registry.get_service_actions("math") == [other_add]
+
+        # Unknown nodes are ignored
+        registry.unregister_node("unknown")
+
+    def test_register_wraps_handlers_with_bulkheads(self):
+        """Test bulkheads come from the decorator, else from the registry default."""
+
+        class MLService(Service):
+            def __init__(self):
+                super().__init__("ml")
+
+            @action(bulkhead={"concurrency": 2, "max_queue_size": 5})
+            async def predict(self, ctx):
+                return "predicted"
+
+            @action()
+            async def train(self, ctx):
+                return "trained"
+
+            @action(bulkhead=False)
+            async def status(self, ctx):
+                return "ok"
+
+        registry = Registry(node_id="node-1", bulkhead={"concurrency": 8})
+        registry.register(MLService())
+
+        predict = registry.get_action("ml.predict")
+        train = registry.get_action("ml.train")
+        status = registry.get_action("ml.status")
+        assert (predict.bulkhead.concurrency, predict.bulkhead.max_queue_size) == (2, 5)
+        assert train.bulkhead.concurrency == 8
+        assert status.bulkhead is None
+        assert asyncio.run(predict.handler(None)) == "predicted"
+
+    def test_register_wraps_plain_and_executor_handlers(self):
+        """Test plain handlers can be awaited and executors must be known."""
+
+        class ReportService(Service):
+            def __init__(self):
+                super().__init__("report")
+
+            @action()
+            def status(self, ctx):
+                return "ok"
+
+            @action(executor="thread")
+            def render(self, ctx):
+                return "rendered"
+
+        registry = Registry(node_id="node-1")
+        registry.register(ReportService())
+
+        assert asyncio.run(registry.get_action("report.status").handler(None)) == "ok"
+        assert asyncio.run(registry.get_action("report.render").handler(None)) == "rendered"
+        registry.executors["thread"].shutdown()
+
+        class BrokenService(Service):
+            def __init__(self):
+                super().__init__("broken")
+
+            @action(executor="fiber")
+            def run(self, ctx):
+                return None
+
+        with pytest.raises(ValueError, match="Unknown executor fiber"):
+            Registry(node_id="node-1").register(BrokenService())
@@ -0,0 +1,72 @@
+"""Unit tests for the retry module."""
+
+import pytest
+
+from pylecular.retry import RetryPolicy, is_retryable
+from pylecular.transit import RemoteCallError, RequestRejectedError
+
+
+class TestRetryPolicy:
+    """Test RetryPolicy class."""
+
+    def test_is_retryable(self):
+        """Test the default predicate reads the error's retryable flag."""
+        assert is_retryable(RequestRejectedError("math.add", "node-1")) is True
+        assert is_retryable(RemoteCallError("boom", retryable=True)) is True
+        assert is_retryable(RemoteCallError("boom")) is False
+        assert is_retryable(ValueError("boom")) is False
+
+    def test_backoff_grows_and_is_capped(self):
+        """Test delays grow by the factor up to the maximum, minus jitter."""
+        policy = RetryPolicy(retries=5, delay=0.1, max_delay=0.5, factor=2, jitter=0)
+
+        assert [policy.backoff(attempt) for attempt in range(4)] == pytest.approx(
+            [0.1, 0.2, 0.4, 0.5]
+        )
+
+    def test_backoff_jitter(self):
+        """Test jitter shortens the delay by up to the configured fraction."""
+        policy = RetryPolicy(retries=1, delay=1.0, jitter=0.5)
+
+        delays = [policy.backoff(0) for _ in range(200)]
+        assert all(0.5 <= delay <= 1.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_invalid_jitter(self):
+        """Test jitter outside 0..1 is rejected."""
+        with pytest.raises(ValueError):
+            RetryPolicy(jitter=1.5)
+
+    def test_should_retry(self):
+        """Test retries stop when the count runs out or the error is not retryable."""
+        policy = RetryPolicy(retries=2)
+        error = RequestRejectedError("math.add", "node-1")
+
+        assert policy.should_retry(error, 0) is True
+        assert policy.should_retry(error, 1) is True
+        assert policy.should_retry(error, 2) is False
+        assert policy.should_retry(ValueError("boom"), 0) is False
+
+    def test_custom_check(self):
+        """Test a custom predicate replaces the retryable flag."""
+        policy = RetryPolicy(retries=1, check=lambda error: isinstance(error, ValueError))
+
+        assert policy.should_retry(ValueError("boom"), 0) is True
+        assert policy.should_retry(RequestRejectedError("math.add", "node-1"), 0) is False
+
+    def test_from_options(self):
+        """Test policies are built from keyword dicts and passed through as is."""
+        policy = RetryPolicy(retries=3)
+
+        assert RetryPolicy.from_options(None) is None
+        assert RetryPolicy.from_options(policy) is policy
+        assert RetryPolicy.from_options({"retries": 2, "delay": 0.5}).delay == 0.5
+
+    def test_info_round_trip(self):
+        """Test the policy announced in INFO keeps its numbers, in milliseconds."""
+        info = RetryPolicy(retries=3, delay=0.2, max_delay=2, factor=3).to_info()
+
+        assert info == {"retries": 3, "delay": 200, "maxDelay": 2000, "factor": 3}
+
+        policy = RetryPolicy.from_info(info)
+        assert (policy.retries, policy.delay, policy.max_delay, policy.factor) == (3, 0.2, 2, 3)
@@ -0,0 +1,84 @@
+"""Unit tests for the sampler module."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pylecular.metrics import MetricRegistry
+from pylecular.sampler import HealthSampler
+
+
+@pytest.fixture
+def mock_psutil():
+    """Patch the psutil readings used by the sampler."""
+    with patch("psutil.cpu_percent", return_value=10.0) as cpu_percent:
+        with patch("psutil.virtual_memory", return_value=MagicMock(percent=40.0)):
+            with patch("psutil.getloadavg", return_value=(1.5, 1.0, 0.5)):
+                yield cpu_percent
+
+
+class TestHealthSampler:
+    """Test HealthSampler class."""
+
+    def test_interval_must_be_positive(self):
+        """Test a zero interval is rejected."""
+        with pytest.raises(ValueError):
+            HealthSampler(interval=0)
+
+    def test_reading_without_samples_takes_one(self, mock_psutil):
+        """Test values are available before the background task ran."""
+        sampler = HealthSampler()
+
+        assert sampler.cpu == 10.0
+        assert sampler.memory == 40.0
+        assert sampler.load == 1.5
+        mock_psutil.assert_called_once_with(interval=None)
+
+    def test_rolling_average_over_window(self, mock_psutil):
+        """Test only the samples of the last window are averaged."""
+        sampler = HealthSampler(window=2.0, interval=1.0)
+        for cpu in (90.0, 10.0, 30.0):
+            mock_psutil.return_value = cpu
+            sampler.sample()
+
+        assert sampler.cpu == 20.0
+
+    def test_exposes_gauges(self, mock_psutil):
+        """Test the averages are registered as metrics."""
+        metrics = MetricRegistry()
+        HealthSampler(metrics=metrics)
+
+        assert metrics.get("os.cpu.utilization") == 10.0
+        assert metrics.get("os.memory.utilization") == 40.0
+        assert metrics.get("os.load.1") == 1.5
+
+    @pytest.mark.asyncio
+    async def test_background_sampling(self, mock_psutil):
+        """Test the task samples on its interval without blocking."""
+        sampler = HealthSampler(window=1.0, interval=0.01)
+        sampler.start()
+        mock_psutil.return_value = 55.0
+        await asyncio.sleep(0.05)
+        await sampler.stop()
+
+        assert sampler.cpu == 55.0
+        assert all(call.kwargs == {"interval": None} for call in mock_psutil.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_failed_sample_is_logged_and_sampling_goes_on(self, mock_psutil):
+        """Test an error reading psutil does not end the background task."""
+        logger = MagicMock()
+        sampler = HealthSampler(window=1.0, interval=0.01, logger=logger)
+        sampler.start()
+        mock_psutil.side_effect = OSError("unavailable")
+        await asyncio.sleep(0.03)
+        mock_psutil.side_effect = None
+        mock_psutil.return_value = 70.0
+        await asyncio.sleep(0.03)
+
+        assert not sampler._task.done()
+        await sampler.stop()
+
+        logger.error.assert_called()
+        assert sampler.cpu == 70.0
@@ -1,5 +1,6 @@
 """Unit tests for the settings module."""
 
+from pylecular.retry import RetryPolicy
 from pylecular.settings import Settings
 
 
@@ -15,6 +16,28 @@ class TestSettings:
         assert settings.log_level == "INFO"
         assert settings.log_format == "PLAIN"
         assert settings.middlewares == []
+        assert settings.strategy == "RoundRobin"
+        assert settings.strategy_options == {}
+        assert settings.prefer_local is True
+        assert settings.retry_policy is None
+
+    def test_settings_load_balancing(self):
+        """Test Settings with custom load balancing options."""
+        settings = Settings(
+            strategy="CpuUsage", strategy_options={"sample_count": 5}, prefer_local=False
+        )
+
+        assert settings.strategy == "CpuUsage"
+        assert settings.strategy_options == {"sample_count": 5}
+        assert settings.prefer_local is False
+
+    def test_settings_retry_policy(self):
+        """Test Settings builds the retry policy from keyword arguments."""
+        settings = Settings(retry_policy={"retries": 3, "delay": 0.2})
+
+        assert isinstance(settings.retry_policy, RetryPolicy)
+        assert settings.retry_policy.retries == 3
+        assert settings.retry_policy.delay == 0.2
 
     def test_settings_custom_initialization(self):
         """Test Settings initialization with custom values."""
@@ -0,0 +1,310 @@
+"""Unit tests for the load balancing strategies."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pylecular.context import Context
+from pylecular.node import Node
+from pylecular.registry import Action, Registry
+from pylecular.strategy import (
+    CpuUsageStrategy,
+    RandomStrategy,
+    RoundRobinStrategy,
+    ShardStrategy,
+    Strategy,
+)
+
+
+@pytest.fixture
+def endpoints():
+    """Create remote endpoints for the same action on three nodes."""
+    return [Action("math.add", f"node-{i}", is_local=False) for i in range(3)]
+
+
+class TestStrategyLookup:
+    """Test resolving strategies by name."""
+
+    def test_get_by_name(self):
+        """Test that built-in strategies are found case-insensitively."""
+        assert Strategy.get_by_name("RoundRobin") is RoundRobinStrategy
+        assert Strategy.get_by_name("random") is RandomStrategy
+        assert Strategy.get_by_name("CpuUsage") is CpuUsageStrategy
+        assert Strategy.get_by_name("Shard") is ShardStrategy
+
+    def test_get_by_name_unknown(self):
+        """Test that unknown strategy names raise ValueError."""
+        with pytest.raises(ValueError, match="No strategy found for: Fastest"):
+            Strategy.get_by_name("Fastest")
+
+
+class TestRoundRobinStrategy:
+    """Test RoundRobinStrategy."""
+
+    def test_cycles_through_endpoints(self, endpoints):
+        """Test that endpoints are selected in turn."""
+        strategy = RoundRobinStrategy(Mock())
+
+        selected = [strategy.select(endpoints).node_id for _ in range(4)]
+
+        assert selected == ["node-0", "node-1", "node-2", "node-0"]
+
+    def test_handles_shrinking_endpoint_list(self, endpoints):
+        """Test that the counter wraps when endpoints disappear."""
+        strategy = RoundRobinStrategy(Mock())
+        strategy.select(endpoints)
+        strategy.select(endpoints)
+
+        assert strategy.select(endpoints[:1]) is endpoints[0]
+
+
+class TestRandomStrategy:
+    """Test RandomStrategy."""
+
+    def test_selects_random_endpoint(self, endpoints):
+        """Test that the endpoint is chosen with random.randrange."""
+        strategy = RandomStrategy(Mock())
+
+        with patch("pylecular.strategy.random.randrange", return_value=2):
+            assert strategy.select(endpoints) is endpoints[2]
+
+
+class TestCpuUsageStrategy:
+    """Test CpuUsageStrategy."""
+
+    @staticmethod
+    def make_broker(cpu_by_node):
+        """Create a broker mock whose node catalog reports the given CPU values."""
+        broker = Mock()
+        broker.node_catalog.get_node.side_effect = lambda node_id: Node(
+            node_id, cpu=cpu_by_node[node_id]
+        )
+        return broker
+
+    def test_selects_least_loaded_node(self, endpoints):
+        """Test that the node with the lowest heartbeat CPU wins."""
+        broker = self.make_broker({"node-0": 80.0, "node-1": 35.0, "node-2": 60.0})
+        strategy = CpuUsageStrategy(Mock(), broker)
+
+        assert strategy.select(endpoints) is endpoints[1]
+
+    def test_stops_at_low_cpu_endpoint(self, endpoints):
+        """Test that an endpoint under the low CPU threshold is used immediately."""
+        broker = self.make_broker({"node-0": 5.0, "node-1": 1.0, "node-2": 60.0})
+        strategy = CpuUsageStrategy(Mock(), broker)
+
+        assert strategy.select(endpoints) is endpoints[0]
+        broker.node_catalog.get_node.assert_called_once_with("node-0")
+
+    def test_samples_endpoints(self, endpoints):
+        """Test that only sample_count endpoints are compared."""
+        broker = self.make_broker({"node-0": 80.0, "node-1": 35.0, "node-2": 60.0})
+        strategy = CpuUsageStrategy(Mock(), broker, {"sample_count": 2})
+
+        with patch("pylecular.strategy.random.sample", return_value=[endpoints[0], endpoints[2]]):
+            assert strategy.select(endpoints) is endpoints[2]
+
+
+class TestShardStrategy:
+    """Test ShardStrategy."""
+
+    @staticmethod
+    def make_endpoints(count):
+        """Create remote endpoints for the same action on ``count`` nodes."""
+        return [Action("users.get", f"node-{i}", is_local=False) for i in range(count)]
+
+    @staticmethod
+    def make_registry(endpoints):
+        """Create a registry holding the given endpoints of the action."""
+        return Mock(get_all_actions=Mock(return_value=list(endpoints)))
+
+    def test_requires_shard_key(self):
+        """Test that the shard key option is mandatory."""
+        with pytest.raises(ValueError, match="shard_key"):
+            ShardStrategy(Mock())
+
+    def test_same_key_same_node(self):
+        """Test that calls with the same param key land on the same endpoint."""
+        endpoints = self.make_endpoints(5)
+        strategy = ShardStrategy(self.make_registry(endpoints), options={"shard_key": "user.id"})
+
+        selected = {
+            strategy.select(endpoints, Context("1", params={"user": {"id": 42}})).node_id
+            for _ in range(10)
+        }
+
+        assert len(selected) == 1
+
+    def test_keys_spread_over_nodes(self):
+        """Test that different keys are spread across the ring."""
+        endpoints = self.make_endpoints(5)
+        strategy = ShardStrategy(
+            self.make_registry(endpoints), options={"shard_key": "id", "vnodes": 50}
+        )
+
+        selected = {
+            strategy.select(endpoints, Context("1", params={"id": key})).node_id
+            for key in range(200)
+        }
+
+        assert len(selected) == 5
+
+    def test_meta_key(self):
+        """Test that a #-prefixed shard key is read from ctx.meta."""
+        endpoints = self.make_endpoints(3)
+        strategy = ShardStrategy(self.make_registry(endpoints), options={"shard_key": "#tenant"})
+
+        first = strategy.select(endpoints, Context("1", meta={"tenant": "acme"}))
+        second = strategy.select(endpoints, Context("2", meta={"tenant": "acme"}, params={"x": 1}))
+
+        assert first is second
+
+    def test_missing_key_falls_back_to_random(self):
+        """Test that calls without a shard key pick a random endpoint."""
+        endpoints = self.make_endpoints(3)
+        strategy = ShardStrategy(self.make_registry(endpoints), options={"shard_key": "id"})
+
+        with patch("pylecular.strategy.random.randrange", return_value=1):
+            assert strategy.select(endpoints, Context("1")) is endpoints[1]
+            assert strategy.select(endpoints) is endpoints[1]
+
+    def test_lookup_cache_is_bounded(self):
+        """Test that the LRU cache evicts the least recently used keys."""
+        endpoints = self.make_endpoints(3)
+        strategy = ShardStrategy(
+            self.make_registry(endpoints), options={"shard_key": "id", "cache_size": 2}
+        )
+
+        for key in ("a", "b", "a", "c"):
+            strategy.select(endpoints, Context("1", params={"id": key}))
+
+        assert list(strategy._cache) == ["a", "c"]
+
+    def test_filtered_candidates_keep_the_ring(self):
+        """Test that a retry avoiding a node does not move keys for later calls."""
+        registry = Registry(node_id="local", strategy="Shard", strategy_options={"shard_key": "id"})
+        for endpoint in self.make_endpoints(3):
+            registry.add_action(endpoint)
+        keys = [str(i) for i in range(30)]
+
+        def route(key, exclude=None):
+            return registry.get_action(
+                "users.get", Context("1", params={"id": key}), exclude
+            ).node_id
+
+        before = {key: route(key) for key in keys}
+        owned = [key for key in keys if before[key] == "node-1"]
+        assert owned
+
+        # The retry goes to the next node clockwise, without changing the ring
+        assert route(owned[0], exclude={"node-1"}) != "node-1"
+        strategy = registry._strategies["users.get"]
+        assert "node-1" in strategy._endpoints
+        assert {key: route(key) for key in keys} == before
+
+    def test_ring_updates_incrementally(self):
+        """Test that removing a node only moves the keys that node owned."""
+        endpoints = self.make_endpoints(4)
+        strategy = ShardStrategy(
+            self.make_registry(endpoints), options={"shard_key": "id", "vnodes": 20}
+        )
+        keys = [str(i) for i in range(100)]
+
+        before = {
+            key: strategy.select(endpoints, Context("1", params={"id": key})).node_id
+            for key in keys
+        }
+        strategy.endpoint_removed(endpoints[3])
+        after = {
+            key: strategy.select(endpoints[:3], Context("1", params={"id": key})).node_id
+            for key in keys
+        }
+
+        assert "node-3" not in strategy._endpoints
+        for key in keys:
+            if before[key] != "node-3":
+                assert after[key] == before[key]
+
+        strategy.endpoint_added(endpoints[3])
+        restored = {
+            key: strategy.select(endpoints, Context("1", params={"id": key})).node_id
+            for key in keys
+        }
+        assert restored == before
+
+    def test_registry_notifies_ring(self):
+        """Test that the catalog adding and removing nodes reaches the ring."""
+        registry = Registry(node_id="local", strategy="Shard", strategy_options={"shard_key": "id"})
+        endpoints = self.make_endpoints(2)
+        for endpoint in endpoints:
+            registry.add_action(endpoint)
+        ctx = Context("1", params={"id": "k"})
+        registry.get_action("users.get", ctx)
+        strategy = registry._strategies["users.get"]
+
+        new_endpoint = Action("users.get", "node-9", is_local=False)
+        registry.add_action(new_endpoint)
+        assert strategy._endpoints["node-9"] is new_endpoint
+
+        registry.unregister_node("node-9")
+        assert "node-9" not in strategy._endpoints
+        assert all(point[1] != "node-9" for point in strategy._ring)
+
+
+class TestRegistrySelection:
+    """Test endpoint selection through the registry."""
+
+    def test_default_round_robin(self, endpoints):
+        """Test that the registry balances remote endpoints."""
+        registry = Registry(node_id="local")
+        for endpoint in endpoints:
+            registry.add_action(endpoint)
+
+        selected = [registry.get_action("math.add").node_id for _ in range(3)]
+
+        assert selected == ["node-0", "node-1", "node-2"]
+
+    def test_prefer_local(self, endpoints):
+        """Test that a local endpoint short-circuits the strategy."""
+        registry = Registry(node_id="local")
+        for endpoint in endpoints:
+            registry.add_action(endpoint)
+        local = Action("math.add", "local", is_local=True)
+        registry.add_action(local)
+
+        assert all(registry.get_action("math.add") is local for _ in range(3))
+        assert registry.get_local_action("math.add") is local
+
+    def test_prefer_local_disabled(self, endpoints):
+        """Test that local endpoints take part in balancing when prefer_local is off."""
+        registry = Registry(node_id="local", prefer_local=False)
+        local = Action("math.add", "local", is_local=True)
+        registry.add_action(local)
+        registry.add_action(endpoints[0])
+
+        selected = {registry.get_action("math.add").node_id for _ in range(2)}
+
+        assert selected == {"local", "node-0"}
+
+    def test_per_action_strategy(self, endpoints):
+        """Test that an endpoint's strategy overrides the registry default."""
+        registry = Registry(node_id="local")
+        endpoints[0].strategy = "Random"
+        for endpoint in endpoints:
+            registry.add_action(endpoint)
+
+        registry.get_action("math.add")
+
+        assert isinstance(registry._strategies["math.add"], RandomStrategy)
+
+    def test_strategy_dropped_with_last_endpoint(self, endpoints):
+        """Test that per-action strategy state is released with the endpoints."""
+        registry = Registry(node_id="local", strategy="Random")
+        for endpoint in endpoints[:2]:
+            registry.add_action(endpoint)
+        registry.get_action("math.add")
+
+        registry.unregister_node("node-0")
+        registry.unregister_node("node-1")
+
+        assert "math.add" not in registry._strategies
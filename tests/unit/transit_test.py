@@ -1,13 +1,24 @@
 """Unit tests for the Transit module."""
 
 import asyncio
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from pylecular.context import Context
+from pylecular.middleware import Middleware, MiddlewareHandler
 from pylecular.node import Node
 from pylecular.packet import Packet, Topic
-from pylecular.transit import RemoteCallError, Transit
+from pylecular.rate_limit import RateLimiter
+from pylecular.registry import Action
+from pylecular.settings import Settings
+from pylecular.transit import (
+    RemoteCallError,
+    RequestRejectedError,
+    RequestTimeoutError,
+    Transit,
+)
 
 
 @pytest.fixture
@@ -17,7 +28,7 @@ def mock_dependencies():
         "node_id": "test-node-123",
         "registry": MagicMock(),
         "node_catalog": MagicMock(),
-        "settings": MagicMock(transporter="nats://localhost:4222"),
+        "settings": Settings(transporter="nats://localhost:4222"),
         "logger": MagicMock(),
         "lifecycle": MagicMock(),
     }
@@ -148,6 +159,21 @@ class TestTransit:
                 assert packet.payload["cpu"] == 25.5
                 assert "timestamp" in packet.payload
 
+    @pytest.mark.asyncio
+    async def test_beat_reads_sampled_cpu(self, mock_dependencies, mock_transporter):
+        """Test beat reports the background sample instead of measuring CPU itself."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+            with patch("psutil.cpu_percent", return_value=60.0) as cpu_percent:
+                transit.sampler.sample()
+                cpu_percent.reset_mock()
+
+                await transit.beat()
+
+            cpu_percent.assert_not_called()
+            packet = mock_transporter.publish.call_args[0][0]
+            assert packet.payload["cpu"] == 60.0
+
     @pytest.mark.asyncio
     async def test_send_node_info(self, mock_dependencies, mock_transporter):
         """Test Transit send_node_info method."""
@@ -184,9 +210,11 @@ class TestTransit:
                 (Topic.INFO.value, None),
                 (Topic.INFO.value, "test-node-123"),
                 (Topic.DISCOVER.value, None),
+                (Topic.DISCOVER.value, "test-node-123"),
                 (Topic.HEARTBEAT.value, None),
                 (Topic.REQUEST.value, "test-node-123"),
                 (Topic.RESPONSE.value, "test-node-123"),
+                (Topic.CANCEL.value, "test-node-123"),
                 (Topic.EVENT.value, "test-node-123"),
                 (Topic.DISCONNECT.value, None),
             ]
@@ -223,6 +251,28 @@ class TestTransit:
 
             transit.node_catalog.get_node.assert_called_once_with("other-node")
             assert mock_node.cpu == 50.0
+            transit.node_catalog.mark_seen.assert_called_once_with("other-node")
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_from_unknown_node_requests_info(
+        self, mock_dependencies, mock_transporter
+    ):
+        """Test a heartbeat from an unknown or expired node triggers a targeted DISCOVER."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            for known in (None, MagicMock(available=False)):
+                transit.node_catalog.get_node.return_value = known
+                mock_transporter.publish.reset_mock()
+
+                packet = Packet(Topic.HEARTBEAT, None, {"cpu": 50.0})
+                packet.sender = "other-node"
+                await transit._handle_heartbeat(packet)
+
+                discover = mock_transporter.publish.call_args[0][0]
+                assert discover.type == Topic.DISCOVER
+                assert discover.target == "other-node"
+            transit.node_catalog.mark_seen.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_handle_info(self, mock_dependencies, mock_transporter):
@@ -258,6 +308,96 @@ class TestTransit:
 
             transit.node_catalog.disconnect_node.assert_called_once_with("other-node")
 
+    @pytest.mark.asyncio
+    async def test_disconnect_rejects_pending_requests(self, mock_dependencies, mock_transporter):
+        """Test requests to a node that disconnects fail fast with a retryable error."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            def make_call(req_id, node_id):
+                endpoint = MagicMock(node_id=node_id)
+                endpoint.name = "test.action"
+                context = MagicMock(id=req_id, deadline=None)
+                context.marshall.return_value = {"id": req_id}
+                return asyncio.create_task(transit.request(endpoint, context))
+
+            gone = [make_call("req-1", "other-node"), make_call("req-2", "other-node")]
+            kept = make_call("req-3", "third-node")
+            await asyncio.sleep(0)
+
+            packet = Packet(Topic.DISCONNECT, None, {})
+            packet.sender = "other-node"
+            await transit._handle_disconnect(packet)
+
+            for task in gone:
+                with pytest.raises(RequestRejectedError) as exc_info:
+                    await task
+                assert exc_info.value.retryable is True
+                assert exc_info.value.node_id == "other-node"
+            assert not kept.done()
+            assert transit.metrics.get("transit.requests.rejected", {"action": "test.action"}) == 2
+            assert list(transit._pending_by_node) == ["third-node"]
+
+            await transit._handle_response(
+                Packet(Topic.RESPONSE, None, {"id": "req-3", "success": True, "data": 1})
+            )
+            assert await kept == 1
+            assert transit._pending_by_node == {}
+            assert transit._pending_requests == {}
+
+    @pytest.mark.asyncio
+    async def test_handle_request_applies_middleware_chain(
+        self, mock_dependencies, mock_transporter
+    ):
+        """Test that incoming requests run through the compiled middleware chain."""
+
+        class TaggingMiddleware(Middleware):
+            async def local_action(self, next_handler, action):
+                async def handler(ctx):
+                    return {"tagged": await next_handler(ctx)}
+
+                return handler
+
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(
+                **mock_dependencies, middleware_handler=MiddlewareHandler([TaggingMiddleware()])
+            )
+            transit.publish = AsyncMock()
+
+            endpoint = Action(
+                "test.action", "test-node-123", is_local=True, handler=AsyncMock(return_value=1)
+            )
+            transit.registry.get_local_action.return_value = endpoint
+            transit.lifecycle.rebuild_context.return_value = Context("ctx-1")
+
+            packet = Packet(Topic.REQUEST, "test-node-123", {"action": "test.action"})
+            packet.sender = "caller-node"
+            await transit._handle_request(packet)
+            await transit._handle_request(packet)
+
+            response = transit.publish.call_args[0][0].payload
+            assert response["data"] == {"tagged": 1}
+            assert endpoint.chain_version == transit.middleware_handler.version
+
+    @pytest.mark.asyncio
+    async def test_handle_own_info_and_disconnect_ignored(
+        self, mock_dependencies, mock_transporter
+    ):
+        """Test that INFO and DISCONNECT echoed back from this node are ignored."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            info = Packet(Topic.INFO, None, {"id": "test-node-123", "services": []})
+            info.sender = "test-node-123"
+            disconnect = Packet(Topic.DISCONNECT, None, {})
+            disconnect.sender = "test-node-123"
+
+            await transit._handle_info(info)
+            await transit._handle_disconnect(disconnect)
+
+            transit.node_catalog.add_node.assert_not_called()
+            transit.node_catalog.disconnect_node.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_handle_event(self, mock_dependencies, mock_transporter):
         """Test Transit _handle_event method."""
@@ -271,7 +411,7 @@ class TestTransit:
             mock_endpoint.name = "test.event"
             transit.registry.get_event.return_value = mock_endpoint
 
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             transit.lifecycle.rebuild_context.return_value = mock_context
 
             packet = Packet(Topic.EVENT, "other-node", {"event": "test.event", "data": "test"})
@@ -295,9 +435,9 @@ class TestTransit:
             mock_endpoint.handler = AsyncMock(return_value={"result": "success"})
             mock_endpoint.name = "test.action"
             mock_endpoint.params_schema = None
-            transit.registry.get_action.return_value = mock_endpoint
+            transit.registry.get_local_action.return_value = mock_endpoint
 
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-123"
             mock_context.params = {}
             transit.lifecycle.rebuild_context.return_value = mock_context
@@ -326,9 +466,9 @@ class TestTransit:
             mock_endpoint.handler = AsyncMock(side_effect=ValueError("Test error"))
             mock_endpoint.name = "test.action"
             mock_endpoint.params_schema = None
-            transit.registry.get_action.return_value = mock_endpoint
+            transit.registry.get_local_action.return_value = mock_endpoint
 
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-123"
             mock_context.params = {}
             transit.lifecycle.rebuild_context.return_value = mock_context
@@ -383,7 +523,7 @@ class TestTransit:
             mock_endpoint.node_id = "remote-node"
             mock_endpoint.name = "test.action"
 
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-123"
             mock_context.marshall.return_value = {"id": "req-123", "action": "test.action"}
 
@@ -419,7 +559,7 @@ class TestTransit:
             mock_endpoint.node_id = "remote-node"
             mock_endpoint.name = "test.action"
 
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-123"
             mock_context.marshall.return_value = {"id": "req-123", "action": "test.action"}
 
@@ -454,19 +594,21 @@ class TestTransit:
             assert str(exc_info.value) == "Remote error occurred"
             assert exc_info.value.error_name == "CustomError"
             assert exc_info.value.stack == "Stack trace here"
+            assert exc_info.value.retryable is False
 
     @pytest.mark.asyncio
     async def test_request_timeout(self, mock_dependencies, mock_transporter):
         """Test Transit request method with timeout."""
         with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
             transit = Transit(**mock_dependencies)
-            transit.DEFAULT_REQUEST_TIMEOUT = 0.1  # Short timeout for test
 
             mock_endpoint = MagicMock()
             mock_endpoint.node_id = "remote-node"
             mock_endpoint.name = "test.action"
 
-            mock_context = MagicMock()
+            # Short deadline for test
+            mock_context = MagicMock(deadline=0.0, expired=False)
+            mock_context.remaining.return_value = 0.1
             mock_context.id = "req-123"
             mock_context.marshall.return_value = {"id": "req-123", "action": "test.action"}
 
@@ -477,6 +619,215 @@ class TestTransit:
             assert "timed out" in str(exc_info.value)
             assert "req-123" not in transit._pending_requests
 
+            cancel = mock_transporter.publish.call_args[0][0]
+            assert cancel.type == Topic.CANCEL
+            assert cancel.target == "remote-node"
+            assert cancel.payload == {"id": "req-123"}
+
+    @pytest.mark.asyncio
+    async def test_request_without_deadline_has_no_timeout(
+        self, mock_dependencies, mock_transporter
+    ):
+        """Test a context whose timeouts were disabled waits for the response."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            endpoint = MagicMock(node_id="remote-node")
+            endpoint.name = "test.action"
+            with patch("pylecular.transit.asyncio.wait_for", wraps=asyncio.wait_for) as wait_for:
+                task = asyncio.create_task(transit.request(endpoint, Context("req-123")))
+                await asyncio.sleep(0)
+                transit._pending_requests["req-123"].set_result({"success": True, "data": 1})
+
+                assert await task == 1
+            assert wait_for.call_args.args[1] is None
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_sends_cancel(self, mock_dependencies, mock_transporter):
+        """Test that cancelling the calling task cancels the remote request."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            endpoint = MagicMock(node_id="remote-node")
+            endpoint.name = "test.action"
+            task = asyncio.create_task(transit.request(endpoint, Context("req-123")))
+            await asyncio.sleep(0)
+
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            cancel = mock_transporter.publish.call_args[0][0]
+            assert (cancel.type, cancel.target, cancel.payload) == (
+                Topic.CANCEL,
+                "remote-node",
+                {"id": "req-123"},
+            )
+            assert "req-123" not in transit._pending_requests
+
+    @pytest.mark.asyncio
+    async def test_handle_cancel_stops_running_request(self, mock_dependencies, mock_transporter):
+        """Test that a CANCEL packet cancels the handler and its nested remote calls."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+            nested_endpoint = MagicMock(node_id="third-node")
+            nested_endpoint.name = "nested.action"
+
+            async def handler(ctx):
+                return await transit.request(nested_endpoint, Context("nested-1"))
+
+            endpoint = MagicMock(is_local=True, params_schema=None, handler=handler)
+            transit.registry.get_local_action.return_value = endpoint
+            transit.lifecycle.rebuild_context.return_value = Context("req-123")
+
+            packet = Packet(Topic.REQUEST, "test-node-123", {"action": "test.action"})
+            packet.sender = "caller-node"
+            request_task = asyncio.create_task(transit._handle_request(packet))
+            await asyncio.sleep(0.01)
+            assert "req-123" in transit._running_requests
+
+            cancel = Packet(Topic.CANCEL, "test-node-123", {"id": "req-123"})
+            cancel.sender = "caller-node"
+            await transit._handle_cancel(cancel)
+            await request_task
+
+            sent = [call[0][0] for call in mock_transporter.publish.call_args_list]
+            assert [(p.type, p.target) for p in sent] == [
+                (Topic.REQUEST, "third-node"),
+                (Topic.CANCEL, "third-node"),
+            ]
+            assert transit._running_requests == {}
+            assert transit.metrics.get("transit.requests.cancelled", {"action": "test.action"}) == 1
+
+    @pytest.mark.asyncio
+    async def test_handle_cancel_drops_queued_request(self, mock_dependencies, mock_transporter):
+        """Test that a request cancelled while queued is not run once dequeued."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            endpoint = MagicMock(is_local=True, params_schema=None, handler=AsyncMock())
+            endpoint.rate_limiter = None
+            transit.registry.get_local_action.return_value = endpoint
+            transit.lifecycle.rebuild_context.return_value = Context("req-123")
+
+            # The CANCEL overtakes the REQ waiting in the data lane
+            cancel = Packet(Topic.CANCEL, "test-node-123", {"id": "req-123"})
+            cancel.sender = "caller-node"
+            await transit._handle_cancel(cancel)
+
+            packet = Packet(Topic.REQUEST, "test-node-123", {"action": "test.action"})
+            packet.sender = "caller-node"
+            await transit._handle_request(packet)
+
+            endpoint.handler.assert_not_called()
+            mock_transporter.publish.assert_not_called()
+            assert "req-123" not in transit._cancelled_requests
+            assert transit.metrics.get("transit.requests.cancelled", {"action": "test.action"}) == 1
+
+    def test_cancelled_requests_are_bounded(self, mock_dependencies, mock_transporter):
+        """Test that remembered cancellations are capped and expire."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+            transit.CANCELLED_REQUESTS_SIZE = 2
+
+            for req_id in ("a", "b", "c"):
+                transit._remember_cancelled(req_id)
+            assert list(transit._cancelled_requests) == ["b", "c"]
+
+            transit._cancelled_requests["b"] = transit._cancelled_requests["c"] = 0.0
+            transit._remember_cancelled("d")
+            assert list(transit._cancelled_requests) == ["d"]
+
+    @pytest.mark.asyncio
+    async def test_request_waits_until_context_deadline(self, mock_dependencies, mock_transporter):
+        """Test that a request sends its remaining budget and times out at the deadline."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            endpoint = MagicMock(node_id="remote-node")
+            endpoint.name = "test.action"
+            context = Context("req-123", action="test.action", deadline=time.monotonic() + 0.05)
+
+            with pytest.raises(RequestTimeoutError, match="timed out"):
+                await transit.request(endpoint, context)
+
+            request, cancel = [call[0][0] for call in mock_transporter.publish.call_args_list]
+            assert 0 < request.payload["timeout"] <= 50
+            assert cancel.type == Topic.CANCEL
+
+    @pytest.mark.asyncio
+    async def test_handle_request_drops_expired(self, mock_dependencies, mock_transporter):
+        """Test that requests past their deadline are dropped without a response."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            endpoint = MagicMock(is_local=True, params_schema=None, handler=AsyncMock())
+            transit.registry.get_local_action.return_value = endpoint
+            transit.lifecycle.rebuild_context.return_value = Context(
+                "req-123", deadline=time.monotonic() - 1
+            )
+
+            packet = Packet(Topic.REQUEST, "test-node-123", {"action": "test.action"})
+            packet.sender = "other-node"
+            await transit._handle_request(packet)
+
+            endpoint.handler.assert_not_called()
+            mock_transporter.publish.assert_not_called()
+            assert transit.metrics.get("transit.requests.expired", {"action": "test.action"}) == 1
+
+    @pytest.mark.asyncio
+    async def test_handle_request_times_out_handler(self, mock_dependencies, mock_transporter):
+        """Test that a handler still running at the deadline fails with a timeout."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            async def slow_handler(ctx):
+                await asyncio.sleep(1)
+
+            endpoint = MagicMock(is_local=True, params_schema=None, handler=slow_handler)
+            transit.registry.get_local_action.return_value = endpoint
+            transit.lifecycle.rebuild_context.return_value = Context(
+                "req-123", deadline=time.monotonic() + 0.01
+            )
+
+            packet = Packet(Topic.REQUEST, "test-node-123", {"action": "test.action"})
+            packet.sender = "other-node"
+            await transit._handle_request(packet)
+
+            response = mock_transporter.publish.call_args[0][0].payload
+            assert response["success"] is False
+            assert response["error"]["name"] == "RequestTimeoutError"
+            assert response["error"]["retryable"] is True
+
+    @pytest.mark.asyncio
+    async def test_handle_request_rate_limited(self, mock_dependencies, mock_transporter):
+        """Test that requests over the rate limit are answered with an error."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+
+            endpoint = MagicMock(
+                is_local=True,
+                params_schema=None,
+                handler=AsyncMock(return_value="ok"),
+                rate_limiter=RateLimiter(rate=1, burst=1),
+            )
+            transit.registry.get_local_action.return_value = endpoint
+            transit.lifecycle.rebuild_context.side_effect = lambda *args, **kwargs: Context(
+                "req-123"
+            )
+
+            packet = Packet(Topic.REQUEST, "test-node-123", {"action": "test.action"})
+            packet.sender = "other-node"
+            await transit._handle_request(packet)
+            await transit._handle_request(packet)
+
+            endpoint.handler.assert_called_once()
+            response = mock_transporter.publish.call_args[0][0].payload
+            assert response["success"] is False
+            assert response["error"]["name"] == "RateLimitExceededError"
+            assert response["error"]["stack"] is None
+            assert transit.metrics.get("action.rate_limit.rejected", {"action": "test.action"}) == 1
+
     @pytest.mark.asyncio
     async def test_send_event(self, mock_dependencies, mock_transporter):
         """Test Transit send_event method."""
@@ -487,7 +838,7 @@ class TestTransit:
             mock_endpoint.node_id = "remote-node"
             mock_endpoint.name = "test.event"
 
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.marshall.return_value = {"event": "test.event", "data": "test"}
 
             await transit.send_event(mock_endpoint, mock_context)
@@ -512,6 +863,7 @@ class TestTransit:
             transit._handle_response = AsyncMock()
             transit._handle_event = AsyncMock()
             transit._handle_disconnect = AsyncMock()
+            transit._handle_cancel = AsyncMock()
 
             # Test each packet type
             test_cases = [
@@ -522,14 +874,103 @@ class TestTransit:
                 (Topic.RESPONSE, transit._handle_response),
                 (Topic.EVENT, transit._handle_event),
                 (Topic.DISCONNECT, transit._handle_disconnect),
+                (Topic.CANCEL, transit._handle_cancel),
             ]
 
             for topic, handler in test_cases:
                 packet = Packet(topic, None, {})
                 await transit._message_handler(packet)
+                for lane in transit.lanes.values():
+                    await lane.join()
                 handler.assert_called_once_with(packet)
                 handler.reset_mock()
 
+            for lane in transit.lanes.values():
+                await lane.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_request_does_not_block_others(self, mock_dependencies, mock_transporter):
+        """Test requests are handled concurrently while the caller keeps delivering."""
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+            release = asyncio.Event()
+            handled = []
+
+            async def handle_request(packet):
+                if packet.payload["id"] == "slow":
+                    await release.wait()
+                handled.append(packet.payload["id"])
+
+            transit._handle_request = handle_request
+
+            await transit._message_handler(Packet(Topic.REQUEST, None, {"id": "slow"}))
+            await transit._message_handler(Packet(Topic.REQUEST, None, {"id": "fast"}))
+            await asyncio.sleep(0.01)
+
+            assert handled == ["fast"]
+            assert transit.metrics.get("transit.active", {"lane": "data"}) == 1
+
+            release.set()
+            await transit.lanes["data"].join()
+            assert handled == ["fast", "slow"]
+            await transit.lanes["data"].stop()
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_metric(self, mock_dependencies, mock_transporter):
+        """Test the number of queued packets is exposed as a metric."""
+        mock_dependencies["settings"] = Settings(transit_concurrency=1, transit_queue_size=10)
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+            release = asyncio.Event()
+
+            async def handle_event(packet):
+                await release.wait()
+
+            transit._handle_event = handle_event
+
+            for _ in range(4):
+                await transit._message_handler(Packet(Topic.EVENT, None, {}))
+            await asyncio.sleep(0)
+
+            assert transit.metrics.get("transit.queue.depth", {"lane": "data"}) == 3
+            assert transit.metrics.snapshot()['transit.queue.depth{lane="data"}'] == 3
+
+            release.set()
+            await transit.lanes["data"].stop()
+            assert transit.metrics.get("transit.queue.depth", {"lane": "data"}) == 0
+            assert transit.metrics.get("transit.queue.latency", {"lane": "data"}).count == 4
+
+    @pytest.mark.asyncio
+    async def test_control_packets_bypass_request_backlog(
+        self, mock_dependencies, mock_transporter
+    ):
+        """Test heartbeats are handled while the data lane is saturated."""
+        mock_dependencies["settings"] = Settings(transit_concurrency=1, transit_queue_size=10)
+        with patch("pylecular.transit.Transporter.get_by_name", return_value=mock_transporter):
+            transit = Transit(**mock_dependencies)
+            release = asyncio.Event()
+
+            async def handle_request(packet):
+                await release.wait()
+
+            transit._handle_request = handle_request
+            transit._handle_heartbeat = AsyncMock()
+
+            for _ in range(5):
+                await transit._message_handler(Packet(Topic.REQUEST, None, {}))
+            heartbeat = Packet(Topic.HEARTBEAT, None, {"cpu": 1})
+            await transit._message_handler(heartbeat)
+            await transit.lanes["control"].join()
+
+            transit._handle_heartbeat.assert_called_once_with(heartbeat)
+            assert transit.lanes["data"].queue_depth == 4
+            latency = transit.metrics.get("transit.queue.latency", {"lane": "control"})
+            assert latency.count == 1
+
+            release.set()
+            for lane in transit.lanes.values():
+                await lane.stop()
+
     @pytest.mark.asyncio
     async def test_message_handler_unknown_type(self, mock_dependencies, mock_transporter):
         """Test Transit _message_handler with unknown packet type."""
@@ -560,6 +1001,7 @@ class TestTransit:
 
             # Should log error but not raise
             await transit._message_handler(packet)
+            await transit.lanes["control"].join()
 
             transit.logger.error.assert_called_once()
             assert "Error handling INFO packet" in str(transit.logger.error.call_args)
@@ -675,10 +1117,10 @@ class TestTransit:
             mock_endpoint.handler = AsyncMock(return_value={"result": "success"})
             mock_endpoint.name = "test.action"
             mock_endpoint.params_schema = None
-            transit.registry.get_action.return_value = mock_endpoint
+            transit.registry.get_local_action.return_value = mock_endpoint
 
             # Create context with metadata
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-123"
             mock_context.params = {}
             mock_context.meta = {
@@ -724,10 +1166,10 @@ class TestTransit:
             mock_endpoint.handler = AsyncMock(side_effect=ValueError("Test error"))
             mock_endpoint.name = "test.action"
             mock_endpoint.params_schema = None
-            transit.registry.get_action.return_value = mock_endpoint
+            transit.registry.get_local_action.return_value = mock_endpoint
 
             # Create context with metadata
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-456"
             mock_context.params = {}
             mock_context.meta = {
@@ -771,10 +1213,10 @@ class TestTransit:
             mock_endpoint.handler = AsyncMock(return_value={"result": "success"})
             mock_endpoint.name = "test.action"
             mock_endpoint.params_schema = None
-            transit.registry.get_action.return_value = mock_endpoint
+            transit.registry.get_local_action.return_value = mock_endpoint
 
             # Create context with empty metadata
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-789"
             mock_context.params = {}
             mock_context.meta = {}
@@ -804,10 +1246,10 @@ class TestTransit:
             mock_endpoint.handler = AsyncMock(return_value={"result": "success"})
             mock_endpoint.name = "test.action"
             mock_endpoint.params_schema = None
-            transit.registry.get_action.return_value = mock_endpoint
+            transit.registry.get_local_action.return_value = mock_endpoint
 
             # Create context with nested metadata
-            mock_context = MagicMock()
+            mock_context = MagicMock(deadline=None, expired=False)
             mock_context.id = "req-complex"
             mock_context.params = {}
             mock_context.meta = {
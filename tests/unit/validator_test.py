@@ -1,6 +1,14 @@
 import pytest
 
-from pylecular.validator import ValidationError, validate_param_rule, validate_params, validate_type
+from pylecular.validator import (
+    BULK_MIN_ITEMS,
+    NumericItems,
+    ValidationError,
+    compile_schema,
+    validate_param_rule,
+    validate_params,
+    validate_type,
+)
 
 
 def test_validate_type():
@@ -224,3 +232,158 @@ def test_validate_params_short_syntax():
 
     with pytest.raises(ValidationError):
         validate_params({"name": "John", "age": "30"}, schema)
+
+
+COMPILE_SCHEMA = {
+    "name": {"type": "string", "required": True, "minLength": 2, "maxLength": "5"},
+    "email": {"type": "string", "pattern": r"^[^@]+@[^@]+$"},
+    "age": {"type": "number", "min": 0, "max": 150, "gt": -1, "lte": 150},
+    "score": {"type": "number", "gte": 0, "lt": 1},
+    "tags": {"type": "array", "minItems": 1, "maxItems": 3, "items": {"type": "string"}},
+    "ids": {"type": "array", "items": {"type": "number", "min": 1}},
+    "role": {"type": "string", "enum": ["admin", "user"]},
+    "active": "boolean",
+    "extra": {"type": "unknown"},
+}
+
+
+def _error_of(validator, params):
+    with pytest.raises(ValidationError) as exc_info:
+        validator(params)
+    error = exc_info.value
+    return (error.message, error.field, error.type, error.expected, error.got)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"name": None},
+        {"name": "J"},
+        {"name": "Johnny"},
+        {"name": 1},
+        {"name": "John", "email": "nope"},
+        {"name": "John", "age": -1},
+        {"name": "John", "age": 151},
+        {"name": "John", "age": True},
+        {"name": "John", "score": 1},
+        {"name": "John", "score": -0.5},
+        {"name": "John", "tags": []},
+        {"name": "John", "tags": ["a", "b", "c", "d"]},
+        {"name": "John", "tags": ["a", 2]},
+        {"name": "John", "ids": [1, 0]},
+        {"name": "John", "role": "root"},
+        {"name": "John", "active": "yes"},
+        {"name": "John", "extra": 1},
+        {"role": "root", "name": "J"},
+    ],
+)
+def test_compiled_schema_raises_same_errors(params):
+    compiled = compile_schema(COMPILE_SCHEMA)
+    assert _error_of(compiled, params) == _error_of(
+        lambda p: validate_params(p, COMPILE_SCHEMA), params
+    )
+
+
+def test_compiled_schema_accepts_valid_params():
+    compiled = compile_schema(COMPILE_SCHEMA)
+    params = {
+        "name": "John",
+        "email": "john@example.com",
+        "age": 30,
+        "score": 0.5,
+        "tags": ["a"],
+        "ids": [1, 2],
+        "role": "admin",
+        "active": None,
+        "unknown": object(),
+    }
+    assert compiled(params) is True
+
+
+def test_compiled_schema_list_and_short_syntax():
+    assert compile_schema(["name"])({"name": None}) is True
+    assert _error_of(compile_schema(["name", "email"]), {"name": "John"}) == (
+        "Parameter 'email' is required",
+        "email",
+        None,
+        None,
+        None,
+    )
+
+    compiled = compile_schema({"name": "string", "age": "number"})
+    assert compiled({"name": "John", "age": 30}) is True
+    with pytest.raises(ValidationError, match="must be of type 'number'"):
+        compiled({"name": "John", "age": "30"})
+
+
+def test_compiled_item_errors_chain_like_interpreted():
+    compiled = compile_schema({"ids": {"type": "array", "items": {"type": "number"}}})
+    with pytest.raises(ValidationError) as exc_info:
+        compiled({"ids": [1, "2"]})
+    assert exc_info.value.field == "ids[1]"
+    assert isinstance(exc_info.value.__cause__, ValidationError)
+
+
+@pytest.mark.parametrize(
+    "item_rule",
+    [
+        {"type": "number", "min": 0, "max": 100},
+        {"type": "number", "gt": -1, "lte": 100},
+        {"type": "number", "enum": [1, 2, 3, 50]},
+    ],
+)
+@pytest.mark.parametrize(
+    "bad_item",
+    [-5, 101, 7, "7", True, None, float("nan"), 2**70],
+)
+def test_bulk_numeric_items_report_first_offending_index(item_rule, bad_item):
+    schema = {"features": {"type": "array", "items": item_rule}}
+    items = [1, 2, 3, 50] * (BULK_MIN_ITEMS // 2)
+    items[70] = bad_item
+    items[90] = bad_item
+    params = {"features": items}
+
+    expected_error = None
+    try:
+        for i, item in enumerate(items):
+            validate_param_rule(f"features[{i}]", item, item_rule)
+    except ValidationError as e:
+        expected_error = (e.message, e.field, e.type, e.expected, e.got)
+
+    for validate in (compile_schema(schema), lambda p: validate_params(p, schema)):
+        if expected_error is None:
+            assert validate(params) is True
+        else:
+            error = _error_of(validate, params)
+            assert error[1] == "features[70]"
+            assert error[:3] == expected_error[:3]
+
+
+def test_bulk_numeric_items_accept_valid_arrays():
+    compiled = compile_schema(
+        {"features": {"type": "array", "items": {"type": "number", "min": 0, "lt": 1}}}
+    )
+    assert compiled({"features": [i / 10_000 for i in range(10_000)]}) is True
+    assert compiled({"features": list(range(1))}) is True
+
+
+def test_bulk_numeric_items_compare_large_ints_exactly():
+    limit = 2**53
+    compiled = compile_schema({"ids": {"type": "array", "items": {"type": "number", "max": limit}}})
+    items = [0.5] * BULK_MIN_ITEMS + [limit]
+    assert compiled({"ids": items}) is True
+
+    # Rounded to a float, limit + 1 would equal the limit and pass
+    items[40] = limit + 1
+    with pytest.raises(ValidationError) as exc_info:
+        compiled({"ids": items})
+    assert exc_info.value.field == "ids[40]"
+
+
+def test_numeric_items_only_for_bulk_checkable_rules():
+    assert NumericItems.from_rule({"type": "number", "min": 0}) is not None
+    assert NumericItems.from_rule({"type": "string"}) is None
+    assert NumericItems.from_rule({"type": "number", "min": "0"}) is None
+    assert NumericItems.from_rule({"type": "number", "enum": ["a", 1]}) is None
+    assert NumericItems.from_rule({"type": "number", "pattern": "x"}) is None